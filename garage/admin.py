@@ -0,0 +1,19 @@
+from functools import partial
+
+from garage.pagination import CountingPaginator, count_queryset
+
+
+class EstimatedCountAdminMixin:
+    """
+    ModelAdmin mixin counting the changelist like the API lists (see
+    `count_queryset`): the planner's estimate for unfiltered big tables and
+    cached exact counts for filtered ones. The count of the whole table shown
+    next to filtered results is skipped.
+    """
+    show_full_result_count = False
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        return CountingPaginator(
+            queryset, per_page, orphans=orphans, allow_empty_first_page=allow_empty_first_page,
+            count_strategy=partial(count_queryset, key_prefix=f'admin:{self.opts.label_lower}'),
+        )
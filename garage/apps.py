@@ -0,0 +1,16 @@
+from functools import partial
+
+from django.apps import AppConfig
+
+
+class GarageConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'garage'
+
+    def ready(self):
+        from garage import checks, signals  # noqa: F401
+        from garage.cache import api_cache
+        from garage.metrics import get_cache_samples, get_pool_samples, register_collector
+
+        register_collector(partial(get_cache_samples, 'api', api_cache))
+        register_collector(get_pool_samples)
@@ -12,5 +12,13 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'garage.settings')
+# Borrow the connections from a pool: the threads running the requests don't
+# outlive them, so their persistent connections would never be reused.
+os.environ.setdefault('DATABASE_POOL_SIZE', '10')
 
 application = get_asgi_application()
+
+# Render the OpenAPI schema before serving the first request.
+from garage.schema_views import prepare_schema  # noqa: E402
+
+prepare_schema()
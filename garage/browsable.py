@@ -0,0 +1,127 @@
+from functools import lru_cache
+
+from django import forms
+from django.template import loader
+from django.urls import NoReverseMatch, URLPattern, get_resolver, reverse
+from rest_framework import renderers, serializers
+
+
+@lru_cache(maxsize=None)
+def get_list_url_names():
+    """Map the models of the viewsets to the URL names of their list endpoint."""
+    names = {}
+
+    def walk(patterns, namespace):
+        for pattern in patterns:
+            if not isinstance(pattern, URLPattern):
+                walk(pattern.url_patterns, pattern.namespace or namespace)
+                continue
+            view = pattern.callback
+            queryset = getattr(getattr(view, 'cls', None), 'queryset', None)
+            actions = getattr(view, 'actions', None) or {}
+            if queryset is not None and actions.get('get') == 'list' and pattern.name:
+                name = f'{namespace}:{pattern.name}' if namespace else pattern.name
+                names.setdefault(queryset.model, name)
+
+    walk(get_resolver().url_patterns, None)
+    return names
+
+
+def get_list_url(model):
+    """Return the URL of the list endpoint of a model, or `None` when there's none."""
+    name = get_list_url_names().get(model)
+    if name is None:
+        return None
+    try:
+        return reverse(name)
+    except NoReverseMatch:
+        return None
+
+
+class TypeaheadInput(forms.TextInput):
+    """Id input suggesting the objects of the list endpoint matching the typed text."""
+    template_name = 'garage/typeahead_widget.html'
+
+    def __init__(self, list_url, attrs=None):
+        super().__init__(attrs={'autocomplete': 'off', **(attrs or {})})
+        self.list_url = list_url
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        if self.list_url is not None:
+            context['widget']['attrs'].update({
+                'list': f'{name}-typeahead', 'data-typeahead': self.list_url,
+            })
+        return context
+
+
+class TypeaheadHTMLFormRenderer(renderers.HTMLFormRenderer):
+    """
+    Render the relations as id inputs instead of a `<select>` with an option per
+    related object, searching the list endpoint of their model as you type.
+    """
+
+    def render_field(self, field, parent_style):
+        related = field._field
+        if isinstance(related, serializers.RelatedField) and related.queryset is not None:
+            # Set on the bound field only: the serializer field is left as is.
+            field.style = {
+                'template': 'garage/typeahead.html',
+                'list_url': get_list_url(related.queryset.model),
+                **related.style,
+            }
+        return super().render_field(field, parent_style)
+
+
+class LightBrowsableAPIRenderer(renderers.BrowsableAPIRenderer):
+    """
+    Browsable API whose forms don't load the related objects: relations are
+    typed as ids, with suggestions fetched from the list endpoints (see
+    `TypeaheadHTMLFormRenderer`), including in the filters form.
+    """
+    form_renderer_class = TypeaheadHTMLFormRenderer
+
+    def get_filter_form(self, data, view, request):
+        if not hasattr(view, 'get_queryset') or not hasattr(view, 'filter_backends'):
+            return
+
+        # Infer if this is a list view or not, as DRF does.
+        paginator = getattr(view, 'paginator', None)
+        if paginator is not None and not isinstance(data, list) and data is not None:
+            try:
+                paginator.get_results(data)
+            except (TypeError, KeyError):
+                return
+        elif not isinstance(data, list):
+            return
+
+        queryset = view.get_queryset()
+        elements = []
+        for backend in view.filter_backends:
+            if hasattr(backend, 'get_filterset'):
+                html = self.render_filterset(backend(), request, queryset, view)
+            elif hasattr(backend, 'to_html'):
+                html = backend().to_html(request, queryset, view)
+            else:
+                continue
+            if html:
+                elements.append(html)
+
+        if not elements:
+            return
+
+        template = loader.get_template(self.filter_template)
+        return template.render({'elements': elements})
+
+    def render_filterset(self, backend, request, queryset, view):
+        """`DjangoFilterBackend.to_html`, with typeahead inputs for the model choices."""
+        filterset = backend.get_filterset(request, queryset, view)
+        if filterset is None:
+            return None
+
+        for field in filterset.form.fields.values():
+            if isinstance(field, forms.ModelChoiceField) \
+                    and not isinstance(field, forms.ModelMultipleChoiceField):
+                field.widget = TypeaheadInput(get_list_url(field.queryset.model))
+        template = loader.get_template(backend.template)
+        return template.render({'filter': filterset}, request)
@@ -0,0 +1,156 @@
+from dataclasses import asdict
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connections, router, transaction
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ErrorDetail, ValidationError
+from rest_framework.response import Response
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from drf_standardized_errors.formatter import flatten_errors
+
+from garage.serializers import PrefetchedPrimaryKeyRelatedField
+from garage.versions import bump_version
+
+ATOMIC_QUERY_PARAM = 'atomic'
+
+
+class BulkMixin:
+    """
+    Viewset mixin adding a `bulk/` endpoint: `POST` a list of objects to create
+    them, `PATCH` a list of objects with their `id` to update those fields.
+
+    The related objects of every item are loaded with one query per relation
+    and the rows are written with `bulk_create` / `bulk_update`.
+
+    By default nothing is written when an item is invalid: the response is a
+    `400` whose error `attr` starts with the item index (e.g. `3.brand`). With
+    `?atomic=false` the valid items are written and the errors of the others
+    are returned next to them (`207`).
+    """
+    bulk_max_items = 500
+
+    @extend_schema(
+        parameters=[OpenApiParameter(
+            ATOMIC_QUERY_PARAM, bool,
+            description='Write nothing when an item is invalid (default), '
+                        'or only the valid items when false.'
+        )],
+    )
+    @action(detail=False, methods=['post', 'patch'], pagination_class=None)
+    def bulk(self, request, *args, **kwargs):
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError({'non_field_errors': ['Expected a list of items.']})
+        if len(items) > self.bulk_max_items:
+            raise ValidationError({'non_field_errors': [
+                f'Ensure this list has no more than {self.bulk_max_items} items.'
+            ]})
+
+        partial = request.method == 'PATCH'
+        instances, errors = self.get_bulk_instances(items) if partial else ([None] * len(items), {})
+        context = self.get_serializer_context()
+        context['prefetched'] = self.get_bulk_prefetched(items)
+
+        serializers = []
+        for index, (item, instance) in enumerate(zip(items, instances)):
+            if index in errors:
+                continue
+            serializer = self.get_serializer(instance, data=item, partial=partial, context=context)
+            if serializer.is_valid():
+                serializers.append(serializer)
+            else:
+                errors[index] = serializer.errors
+
+        atomic = request.query_params.get(ATOMIC_QUERY_PARAM) not in ('0', 'false')
+        if errors and atomic:
+            raise ValidationError({str(index): errors[index] for index in sorted(errors)})
+
+        if serializers:
+            with transaction.atomic(using=router.db_for_write(self.get_queryset().model)):
+                if partial:
+                    self.perform_bulk_update(serializers)
+                else:
+                    self.perform_bulk_create(serializers)
+
+        data = {
+            'results': [serializer.data for serializer in serializers],
+            'errors': [
+                asdict(error) for error in
+                flatten_errors({str(index): errors[index] for index in sorted(errors)})
+            ],
+        }
+        if errors:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_200_OK if partial else status.HTTP_201_CREATED
+        return Response(data, status=response_status)
+
+    def get_bulk_instances(self, items):
+        """Load the objects to update with one query, returning them and the errors by index."""
+        pk_field = self.get_queryset().model._meta.pk
+        pks, errors = [], {}
+        for index, item in enumerate(items):
+            try:
+                pks.append(pk_field.to_python(item['id']))
+            except (TypeError, KeyError):
+                pks.append(None)
+                errors[index] = {'id': [ErrorDetail('This field is required.', 'required')]}
+            except DjangoValidationError:
+                pks.append(None)
+                errors[index] = {'id': [ErrorDetail('A valid integer is required.', 'invalid')]}
+
+        objects = self.get_queryset().in_bulk([pk for pk in pks if pk is not None])
+        instances = []
+        for index, pk in enumerate(pks):
+            instance = objects.get(pk)
+            if instance is None and index not in errors:
+                errors[index] = {'id': [ErrorDetail('Not found.', 'not_found')]}
+            elif instance is not None:
+                self.check_object_permissions(self.request, instance)
+            instances.append(instance)
+        return instances, errors
+
+    def get_bulk_prefetched(self, items):
+        """Load the related objects referenced by the items, one query per relation."""
+        prefetched = {}
+        for name, field in self.get_serializer().fields.items():
+            if field.read_only or not isinstance(field, PrefetchedPrimaryKeyRelatedField):
+                continue
+            pk_field = field.get_queryset().model._meta.pk
+            pks = set()
+            for item in items:
+                try:
+                    pks.add(pk_field.to_python(item[name]))
+                except (TypeError, KeyError, ValueError, DjangoValidationError):
+                    pass
+            pks.discard(None)
+            prefetched[name] = field.get_queryset().in_bulk(pks)
+        return prefetched
+
+    def perform_bulk_create(self, serializers):
+        model = self.get_queryset().model
+        objects = [model(**serializer.validated_data) for serializer in serializers]
+        connection = connections[router.db_for_write(model)]
+        if connection.features.can_return_rows_from_bulk_insert:
+            model._default_manager.bulk_create(objects)
+            bump_version(model)
+        else:
+            # The primary keys of the new rows can't be read back from a bulk insert.
+            for instance in objects:
+                instance.save(force_insert=True)
+        for serializer, instance in zip(serializers, objects):
+            serializer.instance = instance
+
+    def perform_bulk_update(self, serializers):
+        model = self.get_queryset().model
+        fields = set()
+        for serializer in serializers:
+            for attr, value in serializer.validated_data.items():
+                setattr(serializer.instance, attr, value)
+                fields.add(attr)
+        if fields:
+            model._default_manager.bulk_update(
+                [serializer.instance for serializer in serializers], sorted(fields)
+            )
+            bump_version(model)
@@ -0,0 +1,224 @@
+import threading
+import time
+from collections import Counter, OrderedDict
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+from garage.conditional import get_view_models
+from garage.profiling import phase
+from garage.versions import bump_tags, get_model_tag, get_tag_versions
+
+KEY_PREFIX = 'garage:cache'
+
+
+def get_tags(tags):
+    """Normalize tags given as strings or models."""
+    return sorted({tag if isinstance(tag, str) else get_model_tag(tag) for tag in tags})
+
+
+class LRUCache:
+    """
+    Bounded, thread safe, least recently used mapping. With a `timeout`,
+    entries also expire that many seconds after being set.
+    """
+
+    def __init__(self, max_entries, timeout=None):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+            expires_at, value = self._entries[key]
+            if expires_at is not None and time.monotonic() >= expires_at:
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        """Store a value, returning how many entries were evicted to make room for it."""
+        expires_at = None if self.timeout is None else time.monotonic() + self.timeout
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            evicted = 0
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+            return evicted
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class TwoTierCache:
+    """
+    Cache with a bounded in-process L1 (`LOCAL_CACHE_MAX_ENTRIES`) in front
+    of a shared L2, the `API_CACHE_ALIAS` entry of `CACHES`.
+
+    Entries are stored with the versions of their tags (see `garage.versions`)
+    and only returned while those versions don't change. Every model is a
+    tag, bumped by its save/delete signals, and `invalidate()` bumps any tag,
+    so a write in one worker invalidates the entries of every worker, as long
+    as the versions are in a cache shared by the workers (`CACHE_URL`).
+    `local_timeout` bounds how long an entry is served from the L1 without that.
+    """
+
+    def __init__(self, alias=None, max_entries=None, timeout=None, local_timeout=None):
+        self._alias = alias
+        self._max_entries = max_entries
+        self._timeout = timeout
+        self._local_timeout = local_timeout
+        self._l1 = None
+        self._lock = threading.Lock()
+        self._stats = Counter()
+
+    @property
+    def l1(self):
+        if self._l1 is None:
+            self._l1 = LRUCache(self._max_entries or settings.LOCAL_CACHE_MAX_ENTRIES,
+                                self._local_timeout)
+        return self._l1
+
+    @property
+    def l2(self):
+        return caches[self._alias or settings.API_CACHE_ALIAS]
+
+    def _count(self, stat, value=1):
+        with self._lock:
+            self._stats[stat] += value
+
+    def _is_current(self, entry):
+        tag_versions, _ = entry
+        return not tag_versions or get_tag_versions(*tag_versions) == tag_versions
+
+    def get(self, key, default=None):
+        entry = self.l1.get(key)
+        if entry is not None and self._is_current(entry):
+            self._count('l1_hits')
+            return entry[1]
+
+        entry = self.l2.get(f'{KEY_PREFIX}:{key}')
+        if entry is not None and self._is_current(entry):
+            self._count('l2_hits')
+            self._count('evictions', self.l1.set(key, entry))
+            return entry[1]
+
+        self._count('misses')
+        return default
+
+    def set(self, key, value, tags=(), timeout=None, tag_versions=None):
+        """
+        Store a value until one of its tags changes. Pass the `tag_versions`
+        read before computing the value, so a write during the computation
+        invalidates it.
+        """
+        if tag_versions is None:
+            tag_versions = get_tag_versions(*get_tags(tags))
+        entry = (tag_versions, value)
+        self._count('sets')
+        self._count('evictions', self.l1.set(key, entry))
+        self.l2.set(f'{KEY_PREFIX}:{key}', entry, timeout or self._timeout
+                    or settings.API_CACHE_TIMEOUT)
+
+    def get_or_set(self, key, default, tags=(), timeout=None):
+        """Return the value of `key`, computing and storing `default()` when missing."""
+        value = self.get(key)
+        if value is None:
+            tag_versions = get_tag_versions(*get_tags(tags))
+            value = default()
+            self.set(key, value, timeout=timeout, tag_versions=tag_versions)
+        return value
+
+    def delete(self, key):
+        self.l1.delete(key)
+        self.l2.delete(f'{KEY_PREFIX}:{key}')
+
+    def invalidate(self, *tags):
+        """Invalidate, in every worker, the entries stored with any of these tags or models."""
+        self._count('invalidations')
+        bump_tags(*get_tags(tags))
+
+    def clear(self):
+        """Clear the L1 of this worker and the statistics."""
+        self.l1.clear()
+        with self._lock:
+            self._stats.clear()
+
+    def stats(self):
+        """Return the hits, misses, sets, evictions and invalidations of this worker."""
+        with self._lock:
+            stats = {stat: self._stats[stat] for stat in
+                     ('l1_hits', 'l2_hits', 'misses', 'sets', 'evictions', 'invalidations')}
+        stats['l1_entries'] = len(self.l1)
+        return stats
+
+
+api_cache = TwoTierCache()
+
+
+def cache_response(tags=None, timeout=None, formats=('json', 'msgpack')):
+    """
+    Viewset action decorator serving the rendered bytes of successful
+    responses from `api_cache`, keyed by absolute URL and media type.
+
+    `tags` (models or strings, or a callable taking the view) default to the
+    models the view reads (see `garage.conditional.get_view_models`). Only the
+    renderers in `formats` are cached: the browsable API renders user specific
+    content.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, request, *args, **kwargs):
+            if request.accepted_renderer.format not in formats:
+                return func(self, request, *args, **kwargs)
+
+            key = f'response:{type(self).__name__}.{self.action}:' \
+                  f'{request.build_absolute_uri()}:{request.accepted_media_type}'
+            cached = api_cache.get(key)
+            if cached is not None:
+                content, content_type = cached
+                return HttpResponse(content, content_type=content_type)
+
+            if tags is None:
+                response_tags = get_view_models(self)
+            else:
+                response_tags = tags(self) if callable(tags) else tags
+            tag_versions = get_tag_versions(*get_tags(response_tags))
+            response = self.finalize_response(request, func(self, request, *args, **kwargs),
+                                              *args, **kwargs)
+            with phase('render'):
+                response.render()
+            if response.status_code == 200:
+                api_cache.set(key, (response.content, response['Content-Type']),
+                              timeout=timeout, tag_versions=tag_versions)
+            return response
+        return wrapper
+    return decorator
+
+
+class CachedResponseMixin:
+    """Viewset mixin caching list and retrieve responses with `cache_response`."""
+
+    @cache_response()
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @cache_response()
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+
+@checks.register(checks.Tags.caches)
+def check_shared_caches(app_configs, **kwargs):
+    """
+    Warn when the caches the workers must share are in the memory of each
+    process: the change versions of the models (the `default` cache) and the
+    shared tier of the API cache (`API_CACHE_ALIAS`).
+    """
+    if settings.DEBUG:
+        return []
+    warnings = []
+    for alias, usage in (
+        ('default', 'the model versions behind the ETag and Last-Modified headers'),
+        (settings.API_CACHE_ALIAS, 'the shared tier of the API cache'),
+    ):
+        if isinstance(caches[alias], LocMemCache) \
+                and not any(warning.obj == alias for warning in warnings):
+            warnings.append(checks.Warning(
+                f'The {alias!r} cache, holding {usage}, is local to each process: '
+                f'with several workers, they miss the writes of the others.',
+                hint='Set CACHE_URL (and API_CACHE_URL) to a shared backend, '
+                     'e.g. memcache:// or filecache://.',
+                obj=alias,
+                id='garage.W001',
+            ))
+    return warnings
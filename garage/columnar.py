@@ -0,0 +1,56 @@
+from itertools import islice
+
+from garage.renderers import ColumnarRenderer, get_columns
+
+
+class ColumnarMixin:
+    """
+    Viewset mixin adding `?format=columnar` to list and export: the rows of a
+    page (of an export chunk, for exports) are rendered as
+    `{"columns": [...], "data": {column: [values...]}}`, nested fields in
+    dotted columns (e.g. `vehicle.license_plate`).
+
+    The columns are built from the `values_list()` rows by the compiled
+    serializer of the view (see `garage.compiled.CompiledReadMixin`), with no
+    intermediate dict per row.
+    """
+    columnar_actions = ('list', 'export')
+
+    def is_columnar_request(self):
+        return self.request.accepted_renderer.format == ColumnarRenderer.format
+
+    def get_renderers(self):
+        renderers = super().get_renderers()
+        if self.action in self.columnar_actions and not getattr(self, 'swagger_fake_view', False):
+            renderers.append(ColumnarRenderer())
+        return renderers
+
+    def get_renderer_context(self):
+        context = super().get_renderer_context()
+        if self.action in self.columnar_actions and self.is_columnar_request():
+            # The columns of the rows the serializer renders, for the renderer to transpose them.
+            context['columns'] = get_columns(self.get_serializer())
+        return context
+
+    def render_compiled(self, compiled, rows):
+        if self.is_columnar_request():
+            return compiled.render_columns(rows)
+        return super().render_compiled(compiled, rows)
+
+    def get_export_rows(self, queryset):
+        if not self.is_columnar_request():
+            return super().get_export_rows(queryset)
+        return self.get_export_columns(queryset)
+
+    def get_export_columns(self, queryset):
+        """Yield the columns of every chunk, or the chunks of rendered rows to transpose."""
+        compiled = self.get_compiled_serializer()
+        if compiled is None:
+            rows = super().get_export_rows(queryset)
+        else:
+            rows = compiled.get_queryset(queryset).iterator(chunk_size=self.export_chunk_size)
+        while True:
+            chunk = list(islice(rows, self.export_chunk_size))
+            if not chunk:
+                return
+            yield chunk if compiled is None else compiled.render_columns(chunk)
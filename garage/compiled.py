@@ -0,0 +1,266 @@
+import copy
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.fields import get_attribute
+from rest_framework.generics import get_object_or_404
+from rest_framework.permissions import BasePermission
+from rest_framework.relations import ManyRelatedField, PrimaryKeyRelatedField, RelatedField
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.response import Response
+
+from garage.cache import LRUCache
+from garage.querysets import get_attribute_fields
+from garage.serializers import IncludedRelatedField
+
+# Fields whose `to_representation` returns the database value unchanged.
+IDENTITY_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.EmailField,
+    serializers.IntegerField,
+    serializers.ReadOnlyField,
+)
+
+
+class NotCompilable(Exception):
+    pass
+
+
+class CompiledSerializer:
+    """
+    Read serializer compiled to a function building the representation of a
+    `values_list()` row, without model instances nor per field dispatch, and
+    to one building the columns of many rows (see `render_columns`).
+    """
+
+    def __init__(self, paths, render, render_columns, source):
+        self.paths = paths
+        self.render = render
+        self.render_columns = render_columns
+        self.source = source
+
+    def get_queryset(self, queryset):
+        return queryset.prefetch_related(None).values_list(*self.paths)
+
+    def render_many(self, rows):
+        return list(map(self.render, rows))
+
+
+class SerializerCompiler:
+    """
+    Generate the source of a function returning the representation of a row,
+    as a single dict display with the nested serializers inlined, e.g.
+    `{'id': row[0], 'vehicle': None if row[1] is None else {'id': row[1], ...}}`.
+
+    The values of the fields that aren't serializers are also collected as
+    columns, named by dotted path (e.g. `vehicle.license_plate`), for the
+    function transposing many rows.
+    """
+
+    def __init__(self):
+        self.paths = []
+        self.namespace = {}
+        self.columns = []
+
+    def column(self, path):
+        if path not in self.paths:
+            self.paths.append(path)
+        return self.paths.index(path)
+
+    def unbound(self, field):
+        """
+        A copy of a field not bound to its serializer, for the compiled functions:
+        the serializer holds the context, e.g. the request and view of the first
+        request, which the cache of compiled serializers would keep alive.
+        """
+        return copy.deepcopy(field)
+
+    def constant(self, value):
+        name = f'_c{len(self.namespace)}'
+        self.namespace[name] = value
+        return name
+
+    def compile(self, serializer, model):
+        expression = self.compile_serializer(serializer, model, '', '')
+        names = [name for name, _ in self.columns]
+        columns = ', '.join(f'{name!r}: {column}' for name, column in self.columns)
+        source = (
+            f'def render(row):\n'
+            f'    return {expression}\n'
+            f'\n'
+            f'def render_columns(rows):\n'
+            f'    rows = list(rows)\n'
+            f'    values = list(zip(*rows)) if rows else [()] * {len(self.paths)}\n'
+            f'    return {{\'columns\': {names!r}, \'data\': {{{columns}}}}}\n'
+        )
+        exec(compile(source, f'<compiled {type(serializer).__name__}>', 'exec'), self.namespace)
+        return CompiledSerializer(self.paths, self.namespace['render'],
+                                  self.namespace['render_columns'], source)
+
+    def compile_serializer(self, serializer, model, prefix, label, relation=None):
+        items = ', '.join(
+            f'{field.field_name!r}: {self.compile_field(field, model, prefix, label, relation)}'
+            for field in serializer._readable_fields
+        )
+        return f'{{{items}}}'
+
+    def add_column(self, label, index, to_representation=None):
+        if to_representation is None:
+            column = f'list(values[{index}])'
+        else:
+            column = f'[None if value is None else {to_representation}(value) ' \
+                     f'for value in values[{index}]]'
+        self.columns.append((label, column))
+
+    def compile_field(self, field, model, prefix, label, relation):
+        label = f'{label}{field.field_name}'
+        if isinstance(field, (serializers.ListSerializer, ManyRelatedField, IncludedRelatedField,
+                              serializers.SerializerMethodField)):
+            raise NotCompilable(field.field_name)
+        if field.source == '*' or len(field.source_attrs) != 1:
+            raise NotCompilable(field.field_name)
+
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            return self.compile_attribute(field, model, prefix, label, relation)
+
+        name = f'{prefix}{model_field.name}'
+        if model_field.is_relation:
+            if not model_field.concrete or model_field.many_to_many:
+                raise NotCompilable(field.field_name)
+            index = self.column(name)
+            if isinstance(field, serializers.BaseSerializer):
+                nested = self.compile_serializer(field, model_field.related_model, f'{name}__',
+                                                 f'{label}.', index)
+                return f'(None if row[{index}] is None else {nested})'
+            if isinstance(field, PrimaryKeyRelatedField) and field.pk_field is None:
+                self.add_column(label, index)
+                return f'row[{index}]'
+            raise NotCompilable(field.field_name)
+
+        index = self.column(name)
+        if type(field) in IDENTITY_FIELDS:
+            self.add_column(label, index)
+            return f'row[{index}]'
+        # Decimals, dates, datetimes...: formatted by the field itself.
+        to_representation = self.constant(self.unbound(field).to_representation)
+        self.add_column(label, index, to_representation)
+        return f'(None if row[{index}] is None else {to_representation}(row[{index}]))'
+
+    def compile_attribute(self, field, model, prefix, label, relation):
+        """
+        Read an attribute that isn't a model field (e.g. a property) from an
+        instance with the columns it reads (see `garage.querysets.reads_fields`).
+        In columns, it is `None` when the `relation` column is.
+        """
+        if isinstance(field, (serializers.BaseSerializer, RelatedField)):
+            raise NotCompilable(field.field_name)
+
+        model_fields = get_attribute_fields(model, field.source)
+        indexes = [self.column(f'{prefix}{model_field.name}') for model_field in model_fields]
+        attnames = [model_field.attname for model_field in model_fields]
+        source_attrs = field.source_attrs
+        to_representation = self.unbound(field).to_representation
+
+        def get_value(row):
+            instance = model.from_db(None, attnames, [row[index] for index in indexes])
+            attribute = get_attribute(instance, source_attrs)
+            return None if attribute is None else to_representation(attribute)
+
+        get_value = self.constant(get_value)
+        if relation is None:
+            self.columns.append((label, f'[{get_value}(row) for row in rows]'))
+        else:
+            self.columns.append((label, f'[None if row[{relation}] is None else {get_value}(row) '
+                                        f'for row in rows]'))
+        return f'{get_value}(row)'
+
+
+def get_signature(serializer):
+    """
+    Return what a compiled serializer depends on: its class and its (sparse)
+    fields. Nested serializers are identified by name and model, as those
+    built for `Meta.depth` are new classes every time.
+    """
+    serializer_class = type(serializer)
+    return (
+        serializer_class.__module__, serializer_class.__qualname__, serializer.Meta.model,
+        tuple(
+            (name, field.source, get_signature(field)
+             if isinstance(field, serializers.BaseSerializer) else type(field))
+            for name, field in serializer.fields.items()
+        )
+    )
+
+
+_compiled = LRUCache(max_entries=128)
+
+
+def compile_serializer(serializer):
+    """
+    Return the `CompiledSerializer` of a read serializer, or `None` when one of
+    its fields can't be read from a row (many relations, method fields, ...).
+    Compiled once per serializer class and set of fields.
+    """
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    signature = get_signature(serializer)
+    compiled = _compiled.get(signature, False)
+    if compiled is False:
+        try:
+            compiled = SerializerCompiler().compile(serializer, serializer.Meta.model)
+        except NotCompilable:
+            compiled = None
+        _compiled.set(signature, compiled)
+    return compiled
+
+
+class CompiledReadMixin:
+    """
+    Viewset mixin rendering list and retrieve responses with the compiled
+    serializer of the action (see `compile_serializer`), from `values_list()`
+    rows instead of model instances. The output is the same as the serializer's.
+
+    Retrieve keeps loading the instance when a permission checks objects, and
+    the browsable API the serializers, which its forms are bound to.
+    """
+    compile_read_serializers = True
+
+    def get_compiled_serializer(self):
+        if not self.compile_read_serializers:
+            return None
+        if isinstance(getattr(self.request, 'accepted_renderer', None), BrowsableAPIRenderer):
+            return None
+        return compile_serializer(self.get_serializer())
+
+    def render_compiled(self, compiled, rows):
+        return compiled.render_many(rows)
+
+    def has_object_permissions(self):
+        return any(
+            type(permission).has_object_permission is not BasePermission.has_object_permission
+            for permission in self.get_permissions()
+        )
+
+    def list(self, request, *args, **kwargs):
+        compiled = self.get_compiled_serializer()
+        if compiled is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = compiled.get_queryset(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.render_compiled(compiled, page))
+        return Response(self.render_compiled(compiled, queryset))
+
+    def retrieve(self, request, *args, **kwargs):
+        compiled = self.get_compiled_serializer()
+        if compiled is None or self.has_object_permissions():
+            return super().retrieve(request, *args, **kwargs)
+
+        queryset = compiled.get_queryset(self.filter_queryset(self.get_queryset()))
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(queryset, **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        return Response(compiled.render(row))
@@ -0,0 +1,103 @@
+import hashlib
+import time
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from garage.versions import get_versions
+
+
+def get_path_models(model, path):
+    """Return the models a lookup path (e.g. `vehicle__client__last_name`) goes through."""
+    models = []
+    for name in path.split('__'):
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            break
+        if not field.is_relation or field.related_model is None:
+            break
+        model = field.related_model
+        models.append(model)
+    return models
+
+
+def get_select_related_models(model, select_related):
+    models = []
+    if isinstance(select_related, dict):
+        for name, nested in select_related.items():
+            related_model = model._meta.get_field(name).related_model
+            models.append(related_model)
+            models += get_select_related_models(related_model, nested)
+    return models
+
+
+def get_queryset_related_models(queryset):
+    """Return the models a queryset reads, with its `select_related` and prefetches."""
+    models = [queryset.model]
+    models += get_select_related_models(queryset.model, queryset.query.select_related)
+    for lookup in queryset._prefetch_related_lookups:
+        if isinstance(lookup, Prefetch):
+            models += get_path_models(queryset.model, lookup.prefetch_through)
+            if lookup.queryset is not None:
+                models += get_queryset_related_models(lookup.queryset)
+        else:
+            models += get_path_models(queryset.model, lookup)
+    return models
+
+
+def get_view_models(view):
+    """Return the models a list or retrieve response of a viewset depends on."""
+    queryset = view.get_queryset()
+    models = get_queryset_related_models(queryset)
+    for attr in ('filterset_fields', 'search_fields', 'ordering_fields'):
+        for path in getattr(view, attr, None) or ():
+            models += get_path_models(queryset.model, path.lstrip('^=@$-'))
+    return set(models)
+
+
+class ConditionalGetMixin:
+    """
+    Viewset mixin answering `If-None-Match` / `If-Modified-Since` on list and
+    retrieve with a `304`, before any query runs.
+
+    The `ETag` and `Last-Modified` come from the change versions (see
+    `garage.versions`) of every model the response reads or filters on, so
+    any save, delete or bulk write on them changes both.
+    """
+
+    def get_conditional_validators(self, request):
+        """
+        Return the `ETag` and the `Last-Modified` timestamp of the response,
+        `None` while the last change is in the current second: HTTP dates have
+        no fractions, so a later write in that second wouldn't change it.
+        """
+        versions = get_versions(*get_view_models(self))
+        state = sorted((model._meta.label_lower, version) for model, version in versions.items())
+        key = f'{request.get_full_path()}|{request.accepted_media_type}|{request.user.pk}|{state}'
+        etag = quote_etag(hashlib.md5(key.encode()).hexdigest())
+        last_modified = max(versions.values()) // 1000
+        if last_modified >= int(time.time()):
+            return etag, None
+        return etag, last_modified
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        etag, last_modified = self.get_conditional_validators(request)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+            # Clients may keep the response but must revalidate it before reusing it.
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,77 @@
+from functools import partial
+
+from garage.db.pool import get_pool
+
+
+class HealthCheckMixin:
+    """
+    `CONN_HEALTH_CHECKS` of Django 4.1 for the database wrappers of Django 3.2:
+    a persistent connection is checked (`is_usable()`) before the first query of
+    each request, and reopened if the server closed it meanwhile, instead of
+    failing that request.
+    """
+    health_check_done = False
+
+    def connect(self):
+        super().connect()
+        self.health_check_done = True
+
+    def close_if_health_check_failed(self):
+        if self.connection is None or self.health_check_done or self.in_atomic_block \
+                or not self.settings_dict.get('CONN_HEALTH_CHECKS'):
+            return
+        if not self.is_usable():
+            self.close()
+        self.health_check_done = True
+
+    def _cursor(self, name=None):
+        self.close_if_health_check_failed()
+        return super()._cursor(name)
+
+    def close_if_unusable_or_obsolete(self):
+        if self.connection is not None:
+            self.health_check_done = False
+        super().close_if_unusable_or_obsolete()
+
+
+class PooledConnectionMixin:
+    """
+    Borrow the connections from the in-process pool of the database alias
+    (`garage.db.pool`) when its `POOL_SIZE` is set, and give them back when
+    Django closes them: at the end of each request, whatever `CONN_MAX_AGE`.
+
+    Connections closed with a broken or open transaction, or with autocommit
+    left changed, are discarded instead.
+    """
+
+    @staticmethod
+    def check_pooled_connection(connection):
+        """Return whether an idle connection of the pool can be handed out."""
+        return True
+
+    @property
+    def pool(self):
+        if not self.settings_dict.get('POOL_SIZE'):
+            return None
+        return get_pool(self.alias, self.settings_dict['POOL_SIZE'],
+                        self.settings_dict.get('POOL_TIMEOUT', 10),
+                        check=self.check_pooled_connection)
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        if pool is None:
+            return super().get_new_connection(conn_params)
+        return pool.acquire(partial(super().get_new_connection, conn_params))
+
+    def _close(self):
+        pool = self.pool
+        if pool is None or self.connection is None:
+            return super()._close()
+        discard = (self.errors_occurred or self.in_atomic_block
+                   or self.autocommit != self.settings_dict['AUTOCOMMIT'])
+        pool.release(self.connection, discard=discard)
+
+    def close_if_unusable_or_obsolete(self):
+        super().close_if_unusable_or_obsolete()
+        if self.connection is not None and self.pool is not None and not self.in_atomic_block:
+            self.close()
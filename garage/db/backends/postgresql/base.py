@@ -0,0 +1,15 @@
+from django.db.backends.postgresql import base
+from psycopg2 import extensions
+
+from garage.db.backends.mixins import HealthCheckMixin, PooledConnectionMixin
+
+
+class DatabaseWrapper(HealthCheckMixin, PooledConnectionMixin, base.DatabaseWrapper):
+    """PostgreSQL backend with connection health checks and an optional pool."""
+
+    @staticmethod
+    def check_pooled_connection(connection):
+        # Without a round trip: `closed` is set once psycopg2 noticed the server
+        # went away, and a connection given back is idle outside a transaction.
+        return not connection.closed \
+            and connection.get_transaction_status() == extensions.TRANSACTION_STATUS_IDLE
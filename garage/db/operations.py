@@ -0,0 +1,78 @@
+from django.db import router
+from django.db.migrations.operations.base import Operation
+
+
+class PostgreSQLOperation(Operation):
+    """Migration operation that only runs on PostgreSQL and doesn't change the model state."""
+    reversible = True
+    reduces_to_sql = True
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def allow_migrate(self, schema_editor, app_label, model_name=None):
+        return schema_editor.connection.vendor == 'postgresql' and router.allow_migrate(
+            schema_editor.connection.alias, app_label, model_name=model_name
+        )
+
+
+class CreateTrigramExtension(PostgreSQLOperation):
+    """Install `pg_trgm`, needed by trigram indexes and similarity ranking."""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if self.allow_migrate(schema_editor, app_label):
+            schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        # Other apps may rely on the extension, so it is never dropped.
+        pass
+
+    def describe(self):
+        return 'Creates extension pg_trgm'
+
+
+class AddTrigramIndex(PostgreSQLOperation):
+    """
+    Add a GIN trigram index on `UPPER(column::text)`, the expression Django
+    filters on for `icontains`/`istartswith`, so those lookups stop scanning
+    the table.
+    """
+
+    def __init__(self, model_name, field_name):
+        self.model_name = model_name
+        self.field_name = field_name
+
+    def deconstruct(self):
+        return self.__class__.__name__, [], {
+            'model_name': self.model_name,
+            'field_name': self.field_name,
+        }
+
+    def get_index_name(self, model):
+        return f'{model._meta.db_table}_{self.field_name}_trgm'[:63]
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if not self.allow_migrate(schema_editor, app_label, self.model_name):
+            return
+        model = to_state.apps.get_model(app_label, self.model_name)
+        column = model._meta.get_field(self.field_name).column
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {schema_editor.quote_name(self.get_index_name(model))} '
+            f'ON {schema_editor.quote_name(model._meta.db_table)} '
+            f'USING gin (UPPER({schema_editor.quote_name(column)}::text) gin_trgm_ops)'
+        )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if not self.allow_migrate(schema_editor, app_label, self.model_name):
+            return
+        model = from_state.apps.get_model(app_label, self.model_name)
+        schema_editor.execute(
+            f'DROP INDEX IF EXISTS {schema_editor.quote_name(self.get_index_name(model))}'
+        )
+
+    def describe(self):
+        return f'Add trigram index on {self.model_name}.{self.field_name}'
+
+    @property
+    def migration_name_fragment(self):
+        return f'{self.model_name.lower()}_{self.field_name}_trgm'
@@ -0,0 +1,153 @@
+import threading
+import time
+from collections import Counter, deque
+
+from django.db import OperationalError
+
+
+class PoolTimeout(OperationalError):
+    pass
+
+
+class ConnectionPool:
+    """
+    Bounded, thread safe pool of DB-API connections.
+
+    `acquire(connect)` returns an idle connection, the most recently used first
+    so the others can be closed by the server, opens a new one with `connect()`
+    while there are less than `max_size`, or waits up to `timeout` seconds for
+    one to be released.
+    Idle connections failing `check` are discarded on their way out.
+    """
+
+    def __init__(self, max_size, timeout, check=None):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.check = check
+        self._idle = deque()
+        self._size = 0
+        self._condition = threading.Condition()
+        self._stats = Counter()
+        self._max_wait = 0.0
+
+    def acquire(self, connect):
+        start = time.monotonic()
+        while True:
+            connection = self._take(start)
+            if connection is None:
+                break
+            if self.check is None or self.check(connection):
+                self._record_wait(start)
+                return connection
+            self.release(connection, discard=True)
+
+        try:
+            connection = connect()
+        except BaseException:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+        self._record_wait(start, opened=True)
+        return connection
+
+    def _take(self, start):
+        """Return an idle connection, or `None` after reserving room for a new one."""
+        deadline = start + self.timeout
+        with self._condition:
+            waited = False
+            while not self._idle and self._size >= self.max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    raise PoolTimeout(
+                        f'No database connection was released within {self.timeout}s '
+                        f'({self.max_size} in use).'
+                    )
+                if not waited:
+                    self._stats['waits'] += 1
+                    waited = True
+                self._condition.wait(remaining)
+
+            if self._idle:
+                return self._idle.pop()
+            self._size += 1
+            return None
+
+    def _record_wait(self, start, opened=False):
+        wait = time.monotonic() - start
+        with self._condition:
+            self._stats['acquired'] += 1
+            self._stats['opened'] += opened
+            self._stats['wait_time'] += wait
+            self._max_wait = max(self._max_wait, wait)
+
+    def release(self, connection, discard=False):
+        """Give a connection back to the pool, or close it when `discard`."""
+        if discard:
+            with self._condition:
+                self._size -= 1
+                self._stats['discarded'] += 1
+                self._condition.notify()
+            try:
+                connection.close()
+            except Exception:
+                pass
+            return
+
+        with self._condition:
+            self._idle.append(connection)
+            self._condition.notify()
+
+    def close(self):
+        """Close the idle connections."""
+        with self._condition:
+            idle, self._idle = list(self._idle), deque()
+            self._size -= len(idle)
+        for connection in idle:
+            connection.close()
+
+    def stats(self):
+        """Return the size, usage and wait times of the pool in this process."""
+        with self._condition:
+            return {
+                'max_size': self.max_size,
+                'size': self._size,
+                'in_use': self._size - len(self._idle),
+                'idle': len(self._idle),
+                'acquired': self._stats['acquired'],
+                'opened': self._stats['opened'],
+                'discarded': self._stats['discarded'],
+                'waits': self._stats['waits'],
+                'timeouts': self._stats['timeouts'],
+                'wait_time_ms': round(self._stats['wait_time'] * 1000, 3),
+                'max_wait_ms': round(self._max_wait * 1000, 3),
+            }
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias, max_size, timeout, check=None):
+    """Return the pool of a database alias, created on first use."""
+    with _pools_lock:
+        if alias not in _pools:
+            _pools[alias] = ConnectionPool(max_size, timeout, check)
+        return _pools[alias]
+
+
+def get_pool_stats():
+    """Return the `stats()` of every pool of this process, keyed by database alias."""
+    with _pools_lock:
+        pools = dict(_pools)
+    return {alias: pool.stats() for alias, pool in pools.items()}
+
+
+def close_pools():
+    """Close the idle connections of every pool, e.g. when settings change."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
@@ -0,0 +1,170 @@
+import contextvars
+import hashlib
+import logging
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+from rest_framework.permissions import SAFE_METHODS
+
+logger = logging.getLogger('garage.db')
+
+STICKY_KEY_PREFIX = 'garage:replicas:sticky'
+# Statements writing rows, after which a request reads from the primary.
+WRITE_STATEMENTS = ('INSERT', 'UPDATE', 'DELETE')
+# Seconds a worker reuses the lag measured on a replica.
+LAG_CHECK_INTERVAL = 5
+
+
+class RequestState:
+    """Database routing of the current request."""
+
+    def __init__(self):
+        self.read_alias = None
+        self.wrote = False
+
+
+_state = contextvars.ContextVar('garage_replicas', default=None)
+
+
+def get_read_alias():
+    """Return the replica the reads of the current request go to, if any."""
+    state = _state.get()
+    return None if state is None else state.read_alias
+
+
+def record_write():
+    """Send the next reads of the current request to the primary, and its client's next reads."""
+    state = _state.get()
+    if state is not None:
+        state.read_alias = None
+        state.wrote = True
+
+
+def record_writes(execute, sql, params, many, context):
+    """Execute wrapper calling `record_write` after the statements writing rows."""
+    result = execute(sql, params, many, context)
+    if sql.lstrip()[:6].upper() in WRITE_STATEMENTS:
+        record_write()
+    return result
+
+
+def install(connection):
+    """Instrument a database connection with `record_writes`, once."""
+    if record_writes not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_writes)
+
+
+def get_replica_lag(alias):
+    """
+    Return how many seconds a replica is behind its primary: 0 when it has
+    replayed everything it received, `None` when unknown (not a PostgreSQL
+    standby).
+    """
+    connection = connections[alias]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT CASE WHEN NOT pg_is_in_recovery() THEN NULL '
+            'WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 '
+            'ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END'
+        )
+        lag = cursor.fetchone()[0]
+    return None if lag is None else float(lag)
+
+
+_lags = {}
+_lags_lock = threading.Lock()
+
+
+def get_recent_lag(alias):
+    """`get_replica_lag`, measured at most every `LAG_CHECK_INTERVAL` seconds per worker."""
+    now = time.monotonic()
+    with _lags_lock:
+        measured = _lags.get(alias)
+    if measured is not None and now - measured[0] < LAG_CHECK_INTERVAL:
+        return measured[1]
+
+    try:
+        lag = get_replica_lag(alias)
+    except DatabaseError:
+        logger.exception('replica unavailable alias=%s', alias, extra={'alias': alias})
+        lag = float('inf')
+    else:
+        if lag is not None and lag > settings.DATABASE_REPLICA_MAX_LAG:
+            logger.warning('replica lagging alias=%s lag=%.1fs', alias, lag,
+                           extra={'alias': alias, 'lag': lag})
+    with _lags_lock:
+        _lags[alias] = (now, lag)
+    return lag
+
+
+def choose_replica():
+    """Return a random replica within `DATABASE_REPLICA_MAX_LAG`, or `None` when there's none."""
+    replicas = list(settings.DATABASE_REPLICAS)
+    random.shuffle(replicas)
+    for alias in replicas:
+        lag = get_recent_lag(alias)
+        if lag is None or lag <= settings.DATABASE_REPLICA_MAX_LAG:
+            return alias
+    return None
+
+
+def get_sticky_key(request):
+    """Identify the client of a request by its credentials, or its address when anonymous."""
+    client = (request.META.get('HTTP_AUTHORIZATION')
+              or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+              or request.META.get('REMOTE_ADDR', ''))
+    return f'{STICKY_KEY_PREFIX}:{hashlib.md5(client.encode()).hexdigest()}'
+
+
+class ReplicaMiddleware:
+    """
+    Send the reads of the safe requests to viewsets to a replica (see
+    `garage.db.routers.ReplicaRouter`), unless their client wrote in the last
+    `DATABASE_REPLICA_STICKY_SECONDS`: clients read their own writes.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state = RequestState()
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+
+        if state.wrote:
+            self.stick_to_primary(request)
+        if response.streaming:
+            response.streaming_content = self.stream(state, response.streaming_content)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (settings.DATABASE_REPLICAS and request.method in SAFE_METHODS
+                and getattr(view_func, 'actions', None) is not None
+                and not cache.get(get_sticky_key(request))):
+            _state.get().read_alias = choose_replica()
+
+    def stick_to_primary(self, request):
+        if settings.DATABASE_REPLICAS and settings.DATABASE_REPLICA_STICKY_SECONDS:
+            cache.set(get_sticky_key(request), True, settings.DATABASE_REPLICA_STICKY_SECONDS)
+
+    def stream(self, state, content):
+        """Route the reads of streaming responses (e.g. exports), made while they are sent."""
+        iterator = iter(content)
+        while True:
+            token = _state.set(state)
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                _state.reset(token)
+            yield chunk
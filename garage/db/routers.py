@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from garage.db.replicas import get_read_alias
+
+
+class ReplicaRouter:
+    """
+    Send the reads to the replica chosen for the request by
+    `garage.db.replicas.ReplicaMiddleware` and everything else to the primary,
+    `default`. Reads inside a transaction of the primary stay on it, and so do
+    those following a write (see `garage.db.replicas.record_writes`): Django
+    also asks for the write database of queries that don't write, e.g. the
+    read of `get_or_create`.
+
+    Replicas (`DATABASE_REPLICAS`) are never migrated: they copy the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = get_read_alias()
+        if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return alias
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -0,0 +1,234 @@
+import contextvars
+import datetime
+import hashlib
+import json
+import logging
+import queue
+import random
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.http import QueryDict
+
+logger = logging.getLogger('garage.db.slow')
+
+# Query string parameters of the requests logged with their value: the others are masked.
+LOGGED_QUERY_PARAMS = ('ordering', 'fields', 'expand', 'size')
+
+# Slow queries waiting for their plan: while it is full, the others are logged without one.
+EXPLAIN_QUEUE_SIZE = 100
+
+_literals = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|%s")
+_lists = re.compile(r'\((?:\?, )+\?\)')
+_spaces = re.compile(r'\s+')
+
+_source = contextvars.ContextVar('garage_slow_queries_source', default=None)
+_log_lock = threading.Lock()
+_explain_queue = queue.Queue(maxsize=EXPLAIN_QUEUE_SIZE)
+_explain_thread = None
+_explain_thread_lock = threading.Lock()
+
+
+def normalize_sql(sql):
+    """Replace the literals and placeholders by `?`, and the lists of them by `(...)`."""
+    sql = _literals.sub('?', sql)
+    sql = _lists.sub('(...)', sql)
+    return _spaces.sub(' ', sql).strip()
+
+
+def get_fingerprint(normalized_sql):
+    return hashlib.md5(normalized_sql.encode()).hexdigest()[:16]
+
+
+def get_param_shape(value):
+    """Describe a bound parameter without its value: its type, and how it's matched if LIKE."""
+    if isinstance(value, str) and len(value) > 1 and '%' in (value[0], value[-1]):
+        # e.g. `str(%...%)` for icontains, `str(...%)` for istartswith.
+        prefix = '%' if value.startswith('%') else ''
+        suffix = '%' if value.endswith('%') else ''
+        return f'str({prefix}...{suffix})'
+    if isinstance(value, (list, tuple)):
+        return f'{type(value).__name__}[{len(value)}]'
+    return type(value).__name__
+
+
+def get_param_shapes(params, many):
+    if many:
+        params = list(params)
+        return [f'{len(params)} rows', *get_param_shapes(params[0] if params else (), False)]
+    if isinstance(params, dict):
+        return {name: get_param_shape(value) for name, value in params.items()}
+    return [get_param_shape(value) for value in params or ()]
+
+
+def get_masked_query(request):
+    """The query string of a request, with the values of the parameters masked (`*`)."""
+    query = QueryDict(mutable=True)
+    for name, values in request.GET.lists():
+        query.setlist(name, values if name in LOGGED_QUERY_PARAMS else ['*'] * len(values))
+    return query.urlencode(safe='*,_-')
+
+
+def can_explain(connection, sql):
+    """Return whether a query can be run again for its plan: a SELECT outside transactions."""
+    return connection.vendor == 'postgresql' and not connection.in_atomic_block \
+        and sql.lstrip().upper().startswith('SELECT')
+
+
+def explain(connection, sql, params):
+    """
+    Return the `EXPLAIN (ANALYZE, BUFFERS)` plan of a SELECT on PostgreSQL, or
+    `None`. The query runs again, through the DB-API cursor so that it isn't
+    instrumented nor counted.
+    """
+    try:
+        connection.ensure_connection()
+        with connection.connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (ANALYZE, BUFFERS) {sql}', params)
+            return '\n'.join(row[0] for row in cursor.fetchall())
+    except connection.Database.Error:
+        logger.exception('EXPLAIN of a slow query failed')
+        return None
+
+
+def explain_later(alias, sql, params, record):
+    """
+    Queue a slow query for `explain_worker` to log with its plan, after the
+    request, on its own connection. Return `False` when the queue is full.
+    """
+    global _explain_thread
+    with _explain_thread_lock:
+        # Started on the first slow query, again in forked workers.
+        if _explain_thread is None or not _explain_thread.is_alive():
+            _explain_thread = threading.Thread(target=explain_worker, name='garage-explain',
+                                               daemon=True)
+            _explain_thread.start()
+    try:
+        _explain_queue.put_nowait((alias, sql, params, record))
+    except queue.Full:
+        return False
+    return True
+
+
+def explain_worker():
+    while True:
+        alias, sql, params, record = _explain_queue.get()
+        try:
+            record['plan'] = explain(connections[alias], sql, params)
+            emit_record(record)
+        except Exception:
+            logger.exception('Logging a slow query with its plan failed')
+        finally:
+            connections[alias].close_if_unusable_or_obsolete()
+            _explain_queue.task_done()
+
+
+def emit_record(record):
+    logger.warning('slow query view=%(view)s duration_ms=%(duration_ms)s '
+                   'fingerprint=%(fingerprint)s', record, extra={'slow_query': record})
+    if settings.SLOW_QUERY_LOG:
+        write_record(record)
+
+
+def write_record(record):
+    line = json.dumps(record, default=str) + '\n'
+    with _log_lock, open(settings.SLOW_QUERY_LOG, 'a', encoding='utf-8') as file:
+        file.write(line)
+
+
+def read_records(path=None):
+    """Yield the records of the slow query log, skipping the lines that can't be read."""
+    with open(path or settings.SLOW_QUERY_LOG, encoding='utf-8') as file:
+        for line in file:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def log_slow_query(execute, sql, params, many, context):
+    """
+    Execute wrapper recording the queries over `SLOW_QUERY_MS` to the
+    `garage.db.slow` logger and the `SLOW_QUERY_LOG` file, with the view and
+    request they come from, their fingerprint (the SQL without its literals)
+    and the shapes of their parameters. `SLOW_QUERY_EXPLAIN_RATE` of them get
+    their plan on PostgreSQL, run again by `explain_worker` off the request.
+    """
+    start = time.perf_counter()
+    result = execute(sql, params, many, context)
+    duration = (time.perf_counter() - start) * 1000
+    if not settings.SLOW_QUERY_MS or duration < settings.SLOW_QUERY_MS:
+        return result
+
+    normalized = normalize_sql(sql)
+    source = _source.get() or {}
+    connection = context['connection']
+    record = {
+        'at': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'duration_ms': round(duration, 3),
+        'database': connection.alias,
+        'view': source.get('view'),
+        'query': source.get('query'),
+        'fingerprint': get_fingerprint(normalized),
+        'sql': normalized,
+        'params': get_param_shapes(params, many),
+    }
+    if not many and random.random() < settings.SLOW_QUERY_EXPLAIN_RATE \
+            and can_explain(connection, sql) \
+            and explain_later(connection.alias, sql, params, record):
+        return result
+    emit_record(record)
+    return result
+
+
+def install(connection):
+    """Instrument a database connection with `log_slow_query`, once."""
+    if log_slow_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(log_slow_query)
+
+
+def get_view_name(request, view_func):
+    cls = getattr(view_func, 'cls', None)
+    actions = getattr(view_func, 'actions', None)
+    if cls is not None and actions:
+        return f'{cls.__name__}.{actions.get(request.method.lower(), request.method.lower())}'
+    match = request.resolver_match
+    return match.view_name if match else view_func.__qualname__
+
+
+class SlowQueryMiddleware:
+    """Attribute the slow queries (see `log_slow_query`) to the view and request running them."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        source = {'view': None, 'query': get_masked_query(request)}
+        token = _source.set(source)
+        try:
+            response = self.get_response(request)
+        finally:
+            _source.reset(token)
+
+        if response.streaming:
+            response.streaming_content = self.stream(source, response.streaming_content)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        _source.get()['view'] = get_view_name(request, view_func)
+
+    def stream(self, source, content):
+        """Attribute the queries of streaming responses (e.g. exports), made while they are sent."""
+        iterator = iter(content)
+        while True:
+            token = _source.set(source)
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                _source.reset(token)
+            yield chunk
@@ -0,0 +1,25 @@
+from garage.serializers import is_included_request
+
+
+class IncludedMixin:
+    """
+    Viewset mixin for `?expand=...&included=true` on lists: expanded objects are
+    rendered once in a top level `included` object, keyed by expand path, and
+    the rows only keep their ids.
+    """
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action == 'list' and is_included_request(self.request):
+            if not hasattr(self, 'included'):
+                self.included = {}
+            context['included'] = self.included
+        return context
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if getattr(self, 'included', None) is not None:
+            response.data['included'] = {
+                path: list(objects.values()) for path, objects in self.included.items()
+            }
+        return response
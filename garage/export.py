@@ -0,0 +1,50 @@
+from django.http import StreamingHttpResponse
+from rest_framework.decorators import action
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+
+from garage.querysets import iterate_in_chunks
+from garage.renderers import CSVRenderer, NDJSONRenderer, get_columns
+
+
+class ExportMixin:
+    """
+    Viewset mixin adding an `export/` endpoint that streams every row of the
+    list, with its filters, search and ordering, as NDJSON or CSV
+    (`?format=ndjson|csv` or the `Accept` header).
+
+    Rows are read `export_chunk_size` at a time and rendered as they are sent,
+    so memory doesn't grow with the number of rows. The CSV header has the
+    columns of the serializer, whatever the first row holds.
+    """
+    export_chunk_size = 2000
+
+    @extend_schema(
+        description='Export every row matching the filters, as NDJSON or CSV.',
+        parameters=[OpenApiParameter('format', str, enum=['ndjson', 'csv'])],
+        responses={(200, 'application/x-ndjson'): OpenApiTypes.STR,
+                   (200, 'text/csv'): OpenApiTypes.STR},
+    )
+    @action(detail=False, methods=['get'], pagination_class=None,
+            renderer_classes=[NDJSONRenderer, CSVRenderer])
+    def export(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        renderer = request.accepted_renderer
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f'{content_type}; charset={renderer.charset}'
+        rows = self.get_export_rows(queryset)
+        response = StreamingHttpResponse(
+            renderer.render_rows(rows, get_columns(self.get_serializer())),
+            content_type=content_type,
+        )
+        filename = f'{queryset.model._meta.verbose_name_plural}.{renderer.format}'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    def get_export_rows(self, queryset):
+        serializer = self.get_serializer()
+        return (
+            serializer.to_representation(instance)
+            for instance in iterate_in_chunks(queryset, self.export_chunk_size)
+        )
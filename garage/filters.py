@@ -1,12 +1,96 @@
+import operator
+from functools import reduce
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import connections
+from django.db.models import CharField, Q, TextField
+from django.db.models.functions import Greatest
 from rest_framework.filters import SearchFilter, OrderingFilter
 
 
 class SearchFilterBackend(SearchFilter):
-    """Custom filter that add search description to the schema"""
+    """
+    Search filter that adds the search description to the schema.
+
+    Text fields are matched with `icontains` (indexed with trigram GIN indexes
+    on PostgreSQL, see `garage.db.operations.AddTrigramIndex`) and other fields,
+    like years or foreign keys, with an exact match when the term is a valid value.
+    Unlike DRF's `icontains`, `201` no longer matches the year 2010, nor the
+    foreign keys whose id contains it: search related objects by name instead
+    (e.g. `brand__name`).
+
+    On PostgreSQL the results are ranked by trigram similarity unless an
+    ordering is requested.
+    """
+
     def get_schema_operation_parameters(self, view):
         self.search_description = f'Search in {", ".join(getattr(view, "search_fields", None))}'
         return super().get_schema_operation_parameters(view)
 
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        search_terms = self.get_search_terms(request)
+        if not search_fields or not search_terms:
+            return queryset
+
+        fields = [(search_field, self.get_model_field(queryset.model, search_field))
+                  for search_field in search_fields]
+        conditions = []
+        for search_term in search_terms:
+            queries = [self.get_search_query(search_field, model_field, search_term)
+                       for search_field, model_field in fields]
+            conditions.append(reduce(operator.or_, queries, Q(pk__in=[])))
+        queryset = queryset.filter(reduce(operator.and_, conditions))
+
+        if self.must_call_distinct(queryset, search_fields):
+            # Filtering against a many-to-many field requires us to call
+            # queryset.distinct() in order to avoid duplicate items in the
+            # resulting queryset.
+            queryset = queryset.distinct()
+
+        text_fields = [search_field for search_field, model_field in fields
+                       if self.is_text_field(model_field) and search_field[0] not in '^=@$']
+        if connections[queryset.db].vendor == 'postgresql' and text_fields:
+            queryset = self.rank_queryset(queryset, text_fields, search_terms)
+        return queryset
+
+    def get_model_field(self, model, search_field):
+        """Return the model field a search field targets, `None` if it isn't one."""
+        *relations, name = search_field.lstrip('^=@$').split('__')
+        try:
+            for relation in relations:
+                model = model._meta.get_field(relation).related_model
+            field = model._meta.get_field(name)
+        except (AttributeError, FieldDoesNotExist):
+            return None
+        if field.is_relation:
+            return field.target_field if field.many_to_one else None
+        return field
+
+    def is_text_field(self, model_field):
+        return model_field is None or isinstance(model_field, (CharField, TextField))
+
+    def get_search_query(self, search_field, model_field, search_term):
+        if self.is_text_field(model_field):
+            return Q(**{self.construct_search(search_field): search_term})
+
+        try:
+            value = model_field.to_python(search_term)
+        except ValidationError:
+            return Q(pk__in=[])
+        return Q(**{search_field.lstrip('^=@$'): value})
+
+    def rank_queryset(self, queryset, search_fields, search_terms):
+        from django.contrib.postgres.search import TrigramSimilarity
+
+        ranks = []
+        for search_term in search_terms:
+            similarities = [TrigramSimilarity(search_field, search_term)
+                            for search_field in search_fields]
+            ranks.append(Greatest(*similarities) if len(similarities) > 1 else similarities[0])
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        return queryset.order_by(reduce(operator.add, ranks).desc(nulls_last=True), *ordering)
+
 
 class OrderingFilterBackend(OrderingFilter):
     """Custom filter that add ordering description to the schema"""
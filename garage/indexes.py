@@ -0,0 +1,215 @@
+from collections import OrderedDict
+
+from django.contrib import admin
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.db.migrations import AddIndex
+from django.db.migrations.loader import MigrationLoader
+from django.http import HttpRequest, QueryDict
+from django.urls import URLResolver, get_resolver
+
+from garage.db.operations import AddTrigramIndex
+
+
+class Recommendation:
+    """An index recommended for a model, with the declarations asking for it."""
+
+    def __init__(self, model, fields, trigram=False):
+        self.model = model
+        self.fields = tuple(fields)
+        self.trigram = trigram
+        self.reasons = []
+
+    @property
+    def columns(self):
+        return tuple(field.lstrip('-') for field in self.fields)
+
+    def get_index(self):
+        index = models.Index(fields=list(self.fields), name='')
+        index.set_name_with_model(self.model)
+        return index
+
+    def get_operation(self):
+        if self.trigram:
+            return AddTrigramIndex(self.model._meta.model_name, self.fields[0])
+        return AddIndex(self.model._meta.model_name, self.get_index())
+
+    def __str__(self):
+        kind = 'trigram index' if self.trigram else 'index'
+        return f'{self.model._meta.label} {kind} ({", ".join(self.fields)})'
+
+
+def get_list_views(patterns=None):
+    """Return the viewsets with a `list` route, once each, in URL order."""
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    views = OrderedDict()
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            for view in get_list_views(pattern.url_patterns):
+                views.setdefault(view.cls, view)
+            continue
+        view = pattern.callback
+        if getattr(view, 'actions', {}).get('get') == 'list':
+            views.setdefault(view.cls, view)
+    return list(views.values())
+
+
+def get_view(callback, params=None):
+    """Instantiate the list action of a viewset for a GET request with `params`."""
+    request = HttpRequest()
+    request.method = 'GET'
+    request.GET = QueryDict(mutable=True)
+    request.GET.update(params or {})
+    view = callback.cls(**callback.initkwargs)
+    view.action_map = callback.actions
+    view.args, view.kwargs, view.format_kwarg = (), {}, None
+    view.request = view.initialize_request(request)
+    return view
+
+
+def resolve_field(model, path):
+    """Return the model and concrete field a lookup path ends on, or `(None, None)`."""
+    *relations, name = path.split('__')
+    try:
+        for relation in relations:
+            model = model._meta.get_field(relation).related_model
+        field = model._meta.get_field(name)
+    except (AttributeError, FieldDoesNotExist):
+        return None, None
+    if not getattr(field, 'concrete', False):
+        return None, None
+    return model, field
+
+
+def get_field_names(declaration):
+    """Field names of a `filterset_fields`/`list_filter`/`search_fields` style declaration."""
+    if isinstance(declaration, dict):
+        declaration = declaration.keys()
+    names = []
+    for item in declaration or ():
+        if isinstance(item, (list, tuple)):
+            item = item[0]
+        if isinstance(item, str) and item != '__all__':
+            names.append(item)
+    return names
+
+
+def get_declarations():
+    """
+    Return `(model, kind, fields, source)` for the filter, ordering and search
+    declarations of every list view and admin, plus the models' `Meta.ordering`.
+    """
+    declarations = []
+    for callback in get_list_views():
+        view_class = callback.cls
+        model = get_view(callback).get_queryset().model
+        for kind, attr in (('filter', 'filterset_fields'), ('ordering', 'ordering_fields'),
+                           ('search', 'search_fields')):
+            fields = get_field_names(getattr(view_class, attr, None))
+            declarations.append((model, kind, fields, view_class.__name__))
+
+    for model, model_admin in admin.site._registry.items():
+        source = type(model_admin).__name__
+        declarations.append((model, 'filter', get_field_names(model_admin.list_filter), source))
+        declarations.append((model, 'search', get_field_names(model_admin.search_fields), source))
+
+    for model in dict.fromkeys(model for model, *_ in declarations):
+        if model._meta.ordering:
+            declarations.append(
+                (model, 'default_ordering', list(model._meta.ordering), f'{model.__name__}.Meta')
+            )
+    return declarations
+
+
+def get_existing_indexes(model):
+    """Column lists of the indexes a model already has, including its migrations state."""
+    opts = model._meta
+    indexes = [(opts.pk.column,)]
+    indexes += [(field.column,) for field in opts.local_concrete_fields
+                if field.db_index or field.unique]
+    indexes += [tuple(opts.get_field(name).column for name in index.fields)
+                for index in opts.indexes]
+    indexes += [tuple(opts.get_field(name).column for name in fields)
+                for fields in (*opts.unique_together, *opts.index_together)]
+    return indexes
+
+
+def get_existing_trigram_indexes():
+    """`(app_label, model_name, field_name)` of the trigram indexes added by migrations."""
+    loader = MigrationLoader(None, ignore_no_migrations=True)
+    return {
+        (app_label, operation.model_name.lower(), operation.field_name)
+        for (app_label, _), migration in loader.disk_migrations.items()
+        for operation in migration.operations if isinstance(operation, AddTrigramIndex)
+    }
+
+
+def is_covered(columns, indexes):
+    return any(index[:len(columns)] == columns for index in indexes)
+
+
+def get_recommendations():
+    """
+    Recommend indexes for what the list views and the admin filter, order and
+    search on, leaving out what existing indexes (primary keys, foreign keys,
+    unique fields, `Meta.indexes`, trigram indexes) already cover.
+
+    Filters are combined with the model's default ordering in a composite
+    index, so a filtered page can be read in order without sorting.
+    """
+    recommendations = OrderedDict()
+
+    def recommend(model, fields, reason, trigram=False):
+        key = (model, tuple(fields), trigram)
+        recommendation = recommendations.setdefault(key, Recommendation(model, fields, trigram))
+        if reason not in recommendation.reasons:
+            recommendation.reasons.append(reason)
+
+    declarations = get_declarations()
+    default_orderings = {}
+    for model, kind, fields, source in declarations:
+        if kind == 'default_ordering':
+            ordering = [name for name in fields if isinstance(name, str)]
+            if ordering and all(resolve_field(model, name.lstrip('-'))[0] is model
+                                for name in ordering):
+                default_orderings[model] = ordering
+                recommend(model, ordering, f'{source} ordering')
+
+    for model, kind, fields, source in declarations:
+        for name in fields:
+            if kind == 'default_ordering':
+                continue
+            path = name.lstrip('^=@$-') if kind == 'search' else name
+            target, field = resolve_field(model, path)
+            if field is None or field.primary_key or field.is_relation:
+                continue
+            reason = f'{source} {kind} {name}'
+            if kind == 'search' and isinstance(field, (models.CharField, models.TextField)):
+                if name[0] not in '^=@$':
+                    recommend(target, [field.name], reason, trigram=True)
+            elif kind == 'filter':
+                ordering = [name for name in default_orderings.get(target, [])
+                            if name.lstrip('-') != field.name]
+                recommend(target, [field.name, *ordering], reason)
+            elif target is model or kind == 'search':
+                # Ordering by a related column can't use its index, filtering on it can.
+                recommend(target, [field.name], reason)
+
+    trigram_indexes = get_existing_trigram_indexes()
+    result = []
+    for (model, fields, trigram), recommendation in recommendations.items():
+        if trigram:
+            key = (model._meta.app_label, model._meta.model_name, fields[0])
+            if key not in trigram_indexes:
+                result.append(recommendation)
+            continue
+        columns = tuple(model._meta.get_field(name).column for name in recommendation.columns)
+        others = [tuple(model._meta.get_field(name).column for name in other.columns)
+                  for (other_model, _, other_trigram), other in recommendations.items()
+                  if other_model is model and not other_trigram and other is not recommendation]
+        longer = [other for other in others if len(other) > len(columns)]
+        if not is_covered(columns, get_existing_indexes(model)) \
+                and not is_covered(columns, longer):
+            result.append(recommendation)
+    return result
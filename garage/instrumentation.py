@@ -0,0 +1,78 @@
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('garage.queries')
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryCounter:
+    """Count the queries executed on every database connection and the time spent on them."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self._stack = None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+
+
+class QueryBudgetMixin:
+    """
+    Viewset mixin that counts the queries and database time of every action.
+
+    Actions listed in `query_budgets` (e.g. `{'list': 3}`) that run more queries
+    log a warning, or raise `QueryBudgetExceeded` when `QUERY_BUDGET_RAISE` is set
+    (as it is in the test runner).
+    """
+    query_budgets = {}
+
+    def dispatch(self, request, *args, **kwargs):
+        with QueryCounter() as self.query_counter:
+            response = super().dispatch(request, *args, **kwargs)
+        self.check_query_budget(self.query_counter)
+        return response
+
+    def check_query_budget(self, counter):
+        view = f'{self.__class__.__name__}.{self.action}'
+        budget = self.query_budgets.get(self.action)
+        stats = {
+            'view': view,
+            'queries': counter.count,
+            'budget': budget,
+            'db_time_ms': round(counter.duration * 1000, 2),
+        }
+        if budget is None or counter.count <= budget:
+            logger.debug('queries view=%(view)s queries=%(queries)s db_time_ms=%(db_time_ms)s',
+                         stats, extra=stats)
+            return
+
+        if settings.QUERY_BUDGET_RAISE:
+            raise QueryBudgetExceeded(
+                f'{view} ran {counter.count} queries, its budget is {budget}.'
+            )
+        logger.warning(
+            'query budget exceeded view=%(view)s queries=%(queries)s budget=%(budget)s '
+            'db_time_ms=%(db_time_ms)s', stats, extra=stats
+        )
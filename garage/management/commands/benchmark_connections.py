@@ -0,0 +1,92 @@
+import statistics
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from garage.db.backends.mixins import PooledConnectionMixin
+from garage.db.pool import close_pools, get_pool_stats
+
+
+def run_requests(alias, count, latencies):
+    """Time `count` requests running a query, as the request handlers open and close them."""
+    for _ in range(count):
+        start = time.perf_counter()
+        request_started.send(sender=None)
+        with connections[alias].cursor() as cursor:
+            cursor.execute('SELECT 1')
+        request_finished.send(sender=None)
+        latencies.append(time.perf_counter() - start)
+    # Give back what the thread kept open: the threads of the next mode are new.
+    connections[alias].close()
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the latency of requests running a query when they open a new connection, '
+        'reuse a persistent one (CONN_MAX_AGE) or borrow one from the pool (DATABASE_POOL_SIZE).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='Database alias.')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per mode.')
+        parser.add_argument('--concurrency', type=int, default=4, help='Threads serving them.')
+
+    def handle(self, **options):
+        alias = options['database']
+        settings_dict = connections.databases[alias]
+        modes = [
+            ('new connection', {'CONN_MAX_AGE': 0, 'POOL_SIZE': 0}),
+            ('persistent', {'CONN_MAX_AGE': 60, 'POOL_SIZE': 0}),
+        ]
+        if isinstance(connections[alias], PooledConnectionMixin):
+            modes.append(('pooled', {'CONN_MAX_AGE': 0, 'POOL_SIZE': options['concurrency']}))
+        else:
+            self.stdout.write(self.style.WARNING(
+                f'The {settings_dict["ENGINE"]} backend of "{alias}" has no pool: '
+                f'only PostgreSQL (garage.db.backends.postgresql) does.'
+            ))
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'{options["requests"]} requests on "{alias}" over {options["concurrency"]} threads:'
+        ))
+        original = {key: settings_dict.get(key) for key in ('CONN_MAX_AGE', 'POOL_SIZE')}
+        connections[alias].close()
+        try:
+            for name, mode_settings in modes:
+                # The wrappers of every thread share this dictionary.
+                settings_dict.update(mode_settings)
+                latencies = self.run(alias, options['requests'], options['concurrency'])
+                self.write_latencies(name, latencies)
+                if mode_settings['POOL_SIZE']:
+                    stats = get_pool_stats()[alias]
+                    self.stdout.write('    pool: ' + ', '.join(
+                        f'{key} {value}' for key, value in stats.items()
+                    ))
+                close_pools()
+        finally:
+            settings_dict.update(original)
+
+    def run(self, alias, count, concurrency):
+        latencies = []
+        threads = [
+            threading.Thread(target=run_requests, args=(
+                alias, count // concurrency + (index < count % concurrency), latencies,
+            ))
+            for index in range(concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return latencies
+
+    def write_latencies(self, name, latencies):
+        latencies = sorted(latency * 1000 for latency in latencies)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        self.stdout.write(
+            f'  {name:<15} p50 {statistics.median(latencies):>8.3f} ms  p95 {p95:>8.3f} ms  '
+            f'mean {statistics.mean(latencies):>8.3f} ms'
+        )
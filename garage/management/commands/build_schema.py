@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from garage.schema_views import write_schema
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate the OpenAPI schema and write it to SCHEMA_FILE, to be served by /schema/ '
+        'without generating it at runtime. Run it on every deploy.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--file', default=None,
+                            help='Write the schema to this file instead of SCHEMA_FILE.')
+
+    def handle(self, **options):
+        path = options['file'] or settings.SCHEMA_FILE
+        schema = write_schema(path)
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote the schema ({len(schema["paths"])} paths) to {path}.'
+        ))
@@ -0,0 +1,168 @@
+import os
+from collections import OrderedDict
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.migrations import Migration
+from django.db.migrations.autodetector import MigrationAutodetector
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.state import ProjectState
+from django.db.migrations.writer import MigrationWriter
+from rest_framework.exceptions import APIException
+
+from garage.db.operations import CreateTrigramExtension
+from garage.indexes import get_field_names, get_list_views, get_recommendations, get_view
+
+
+class Command(BaseCommand):
+    help = (
+        'Recommend indexes for the filters, orderings and searches declared by the list '
+        'views and the admin, show the EXPLAIN plan of every list endpoint with and without '
+        'them, and write a migration adding them.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('app_label', nargs='*',
+                            help='Only recommend indexes for these apps.')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS,
+                            help='Database to run the EXPLAIN plans on.')
+        parser.add_argument('--no-explain', action='store_false', dest='explain',
+                            help="Don't show the EXPLAIN plans.")
+        parser.add_argument('--write', action='store_true',
+                            help='Write the migrations instead of printing them.')
+        parser.add_argument('--name', default='recommended_indexes',
+                            help='Name of the migrations.')
+
+    def handle(self, **options):
+        app_labels = options['app_label']
+        recommendations = [
+            recommendation for recommendation in get_recommendations()
+            if not app_labels or recommendation.model._meta.app_label in app_labels
+        ]
+        if not recommendations:
+            self.stdout.write('No indexes to recommend.')
+            return
+
+        by_app = OrderedDict()
+        for recommendation in sorted(recommendations, key=lambda r: r.model._meta.label):
+            by_app.setdefault(recommendation.model._meta.app_label, []).append(recommendation)
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Recommended indexes:'))
+        for recommendation in (r for app in by_app.values() for r in app):
+            self.stdout.write(f'  {recommendation}')
+            for reason in recommendation.reasons:
+                self.stdout.write(f'    - {reason}')
+
+        if options['explain']:
+            self.explain(recommendations, connections[options['database']])
+
+        self.write_migrations(by_app, options['name'], options['write'])
+
+    def explain(self, recommendations, connection):
+        self.stdout.write(self.style.MIGRATE_HEADING('\nEXPLAIN plans (before / after):'))
+        cases = [(callback, params) for callback in get_list_views()
+                 for params in self.get_explain_params(callback)]
+        before = [self.get_plan(callback, params, connection) for callback, params in cases]
+
+        state = ProjectState.from_apps(apps)
+        with transaction.atomic(using=connection.alias):
+            schema_editor = connection.schema_editor()
+            if any(recommendation.trigram for recommendation in recommendations):
+                CreateTrigramExtension().database_forwards(None, schema_editor, state, state)
+            for recommendation in recommendations:
+                if recommendation.trigram:
+                    recommendation.get_operation().database_forwards(
+                        recommendation.model._meta.app_label, schema_editor, state, state
+                    )
+                else:
+                    schema_editor.execute(
+                        recommendation.get_index().create_sql(recommendation.model, schema_editor)
+                    )
+            after = [self.get_plan(callback, params, connection) for callback, params in cases]
+            transaction.set_rollback(True, using=connection.alias)
+
+        for (callback, params), plan_before, plan_after in zip(cases, before, after):
+            query = '&'.join(f'{key}={value}' for key, value in params.items())
+            self.stdout.write(self.style.SQL_TABLE(f'\n{callback.cls.__name__} ?{query}'))
+            if plan_before == plan_after:
+                self.stdout.write(f'  unchanged:\n{self.indent(plan_before)}')
+            else:
+                self.stdout.write(f'  before:\n{self.indent(plan_before)}')
+                self.stdout.write(f'  after:\n{self.indent(plan_after)}')
+
+    def get_explain_params(self, callback):
+        """Query parameters exercising the default list, every filter, ordering and search."""
+        view_class = callback.cls
+        model = get_view(callback).get_queryset().model
+        params = [{}]
+        for name in get_field_names(getattr(view_class, 'filterset_fields', None)):
+            value = model._default_manager.exclude(**{f'{name}__isnull': True}) \
+                .values_list(name, flat=True).first()
+            if value is not None:
+                params.append({name: str(value)})
+        for name in get_field_names(getattr(view_class, 'ordering_fields', None)):
+            params.append({'ordering': name})
+        if getattr(view_class, 'search_fields', None):
+            params.append({'search': 'a'})
+        return params
+
+    def get_plan(self, callback, params, connection):
+        view = get_view(callback, params)
+        try:
+            queryset = view.filter_queryset(view.get_queryset()).using(connection.alias)
+        except APIException as exc:
+            return f'invalid parameters: {exc}'
+        page_size = getattr(view.paginator, 'page_size', None) \
+            or settings.REST_FRAMEWORK.get('PAGE_SIZE') or 25
+        return queryset[:page_size].explain()
+
+    def indent(self, text):
+        return '\n'.join(f'    {line}' for line in text.splitlines())
+
+    def creates_trigram_extension(self, loader, leaf_nodes):
+        """Return whether a migration the new one depends on already creates the extension."""
+        return any(
+            isinstance(operation, CreateTrigramExtension)
+            for leaf_node in leaf_nodes for key in loader.graph.forwards_plan(leaf_node)
+            for operation in loader.graph.nodes[key].operations
+        )
+
+    def write_migrations(self, by_app, name, write):
+        loader = MigrationLoader(None, ignore_no_migrations=True)
+        for app_label, recommendations in by_app.items():
+            leaf_nodes = loader.graph.leaf_nodes(app_label)
+            number = max([MigrationAutodetector.parse_number(node[1]) or 0
+                          for node in leaf_nodes], default=0) + 1
+            migration = Migration(f'{number:04}_{name}', app_label)
+            migration.dependencies = leaf_nodes
+            if any(recommendation.trigram for recommendation in recommendations) \
+                    and not self.creates_trigram_extension(loader, leaf_nodes):
+                migration.operations.append(CreateTrigramExtension())
+            migration.operations += [recommendation.get_operation()
+                                     for recommendation in recommendations]
+
+            # Not the "Generated by Django" header: the operations aren't the autodetector's.
+            writer = MigrationWriter(migration, include_header=False)
+            if write:
+                with open(writer.path, 'w', encoding='utf-8') as fh:
+                    fh.write(writer.as_string())
+                self.stdout.write(self.style.SUCCESS(f'\nWrote {os.path.relpath(writer.path)}'))
+            else:
+                self.stdout.write(self.style.MIGRATE_HEADING(f'\n{writer.path}:'))
+                self.stdout.write(writer.as_string())
+
+            # AddIndex changes the models state, so the models must declare the indexes too.
+            indexes = OrderedDict()
+            for recommendation in recommendations:
+                if not recommendation.trigram:
+                    indexes.setdefault(recommendation.model.__name__, []).append(
+                        recommendation.get_index()
+                    )
+            for model_name, model_indexes in indexes.items():
+                self.stdout.write(f'Add to {app_label}.{model_name}.Meta.indexes:')
+                for index in model_indexes:
+                    self.stdout.write(
+                        f'    models.Index(fields={index.fields!r}, name={index.name!r}),'
+                    )
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError
+
+from garage.db import replicas
+
+
+class Command(BaseCommand):
+    help = 'Show how far behind the primary every read replica (DATABASE_REPLICA_URLS) is.'
+
+    def handle(self, **options):
+        if not settings.DATABASE_REPLICAS:
+            self.stdout.write('No replicas configured: every read goes to the primary.')
+            return
+
+        for alias in settings.DATABASE_REPLICAS:
+            try:
+                lag = replicas.get_replica_lag(alias)
+            except DatabaseError as error:
+                self.stdout.write(f'{alias}: {self.style.ERROR(f"unavailable ({error})")}')
+                continue
+
+            if lag is None:
+                status = 'lag unknown (not a PostgreSQL standby), read from'
+            elif lag > settings.DATABASE_REPLICA_MAX_LAG:
+                max_lag = settings.DATABASE_REPLICA_MAX_LAG
+                status = self.style.WARNING(f'{lag:.1f}s behind, over DATABASE_REPLICA_MAX_LAG '
+                                            f'({max_lag:g}s): not read from')
+            else:
+                status = self.style.SUCCESS(f'{lag:.1f}s behind, read from')
+            self.stdout.write(f'{alias}: {status}')
@@ -0,0 +1,94 @@
+import json
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from garage.db.slow_queries import read_records
+
+SQL_PREVIEW_LENGTH = 500
+
+
+class Fingerprint:
+    """Slow queries sharing a fingerprint, added up."""
+
+    def __init__(self, record):
+        self.fingerprint = record['fingerprint']
+        self.sql = record['sql']
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.views = Counter()
+        self.queries = Counter()
+        self.params = Counter()
+        self.plan = None
+
+    def add(self, record):
+        self.count += 1
+        self.total += record['duration_ms']
+        self.max = max(self.max, record['duration_ms'])
+        self.views[record['view'] or '-'] += 1
+        if record.get('query'):
+            self.queries[record['query']] += 1
+        self.params[json.dumps(record['params'])] += 1
+        self.plan = record.get('plan') or self.plan
+
+
+def format_counter(counter, limit=3):
+    return ', '.join(f'{value} ({count})' for value, count in counter.most_common(limit))
+
+
+class Command(BaseCommand):
+    help = (
+        'Summarize the slow query log (SLOW_QUERY_LOG): the query fingerprints taking the most '
+        'time in total, with the views and requests running them.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=10, help='Fingerprints shown.')
+        parser.add_argument('--file', help='Slow query log. Default: SLOW_QUERY_LOG.')
+        parser.add_argument('--view', help='Only the queries of this view, e.g. ServicesView.list.')
+        parser.add_argument('--plans', action='store_true',
+                            help='Show the last EXPLAIN plan captured for each fingerprint.')
+
+    def handle(self, **options):
+        path = options['file'] or settings.SLOW_QUERY_LOG
+        fingerprints = {}
+        try:
+            for record in read_records(path):
+                if options['view'] and record['view'] != options['view']:
+                    continue
+                fingerprint = fingerprints.setdefault(record['fingerprint'], Fingerprint(record))
+                fingerprint.add(record)
+        except FileNotFoundError:
+            pass
+        if not fingerprints:
+            self.stdout.write(f'No slow queries logged in {path}.')
+            return
+
+        ranked = sorted(fingerprints.values(), key=lambda fingerprint: -fingerprint.total)
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'Top {min(options["top"], len(ranked))} of {len(ranked)} fingerprints by total time '
+            f'({sum(fingerprint.count for fingerprint in ranked)} slow queries):'
+        ))
+        for rank, fingerprint in enumerate(ranked[:options['top']], start=1):
+            self.write_fingerprint(rank, fingerprint, options)
+
+    def write_fingerprint(self, rank, fingerprint, options):
+        self.stdout.write(
+            f'{rank:>3}. {self.style.SQL_KEYWORD(fingerprint.fingerprint)}  '
+            f'total {fingerprint.total:.1f} ms  {fingerprint.count} queries  '
+            f'mean {fingerprint.total / fingerprint.count:.1f} ms  max {fingerprint.max:.1f} ms'
+        )
+        self.stdout.write(f'     views: {format_counter(fingerprint.views)}')
+        if fingerprint.queries:
+            self.stdout.write(f'     requests: {format_counter(fingerprint.queries)}')
+        self.stdout.write(f'     params: {format_counter(fingerprint.params)}')
+        sql = fingerprint.sql
+        if options['verbosity'] < 2 and len(sql) > SQL_PREVIEW_LENGTH:
+            sql = sql[:SQL_PREVIEW_LENGTH] + '...'
+        self.stdout.write(f'     {sql}')
+        if options['plans'] and fingerprint.plan:
+            self.stdout.write('     plan:')
+            for line in fingerprint.plan.splitlines():
+                self.stdout.write(f'       {line}')
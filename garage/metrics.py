@@ -0,0 +1,310 @@
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from collections import defaultdict
+
+from django.conf import settings
+
+from garage.db.pool import get_pool_stats
+from garage.instrumentation import QueryCounter
+
+# Upper bounds of the histogram buckets, the last one being +Inf.
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (100, 1000, 10_000, 100_000, 1_000_000, 10_000_000)
+QUERIES_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+QUANTILES = (0.5, 0.95, 0.99)
+
+REQUEST_LABELS = ('view', 'action', 'status')
+HISTOGRAMS = {
+    'garage_request_duration_seconds': (DURATION_BUCKETS, 'Latency of the API requests.'),
+    'garage_response_size_bytes': (SIZE_BUCKETS, 'Size of the API responses.'),
+    'garage_request_queries': (QUERIES_BUCKETS, 'Queries run by the API requests.'),
+}
+
+_collectors = []
+
+
+def register_collector(collector):
+    """
+    Add the samples of `collector()` to the metrics: `(name, type, labels,
+    value)` tuples, `type` being `counter` or `gauge`. Collected on every
+    flush, in each process.
+    """
+    _collectors.append(collector)
+
+
+def get_cache_samples(cache_name, cache):
+    """Samples of the stats of a `garage.cache.TwoTierCache`, to pass to `register_collector`."""
+    labels = {'cache': cache_name}
+    for stat, value in cache.stats().items():
+        if stat == 'l1_entries':
+            yield 'garage_cache_l1_entries', 'gauge', labels, value
+        else:
+            yield f'garage_cache_{stat}_total', 'counter', labels, value
+
+
+def get_pool_samples():
+    """Samples of the stats of the database connection pools (see `garage.db.pool`)."""
+    for alias, stats in get_pool_stats().items():
+        labels = {'database': alias}
+        for stat in ('max_size', 'size', 'in_use', 'idle'):
+            yield f'garage_db_pool_{stat}', 'gauge', labels, stats[stat]
+        for stat in ('acquired', 'opened', 'discarded', 'waits', 'timeouts'):
+            yield f'garage_db_pool_{stat}_total', 'counter', labels, stats[stat]
+        yield 'garage_db_pool_wait_seconds_total', 'counter', labels, stats['wait_time_ms'] / 1000
+        yield 'garage_db_pool_max_wait_seconds', 'gauge', labels, stats['max_wait_ms'] / 1000
+
+
+class Registry:
+    """
+    Histograms of the requests of this process, as bucket counts (not
+    cumulative) and sums per label values. Observing a value increments one
+    bucket: the percentiles are only computed when the metrics are exported.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.pid = os.getpid()
+            self.histograms = {name: {} for name in HISTOGRAMS}
+            self.flushed_at = time.monotonic()
+            # Unique per process: a pid may be reused by a later worker.
+            self.file_name = f'{self.pid}-{uuid.uuid4().hex[:8]}.json'
+
+    def observe(self, name, labels, value):
+        buckets = HISTOGRAMS[name][0]
+        with self._lock:
+            series = self.histograms[name].get(labels)
+            if series is None:
+                series = self.histograms[name][labels] = [[0] * (len(buckets) + 1), 0]
+            series[0][bisect_left(buckets, value)] += 1
+            series[1] += value
+
+    def snapshot(self):
+        """Return the histograms and the samples of the collectors, JSON serializable."""
+        with self._lock:
+            histograms = {
+                name: [[list(labels), list(counts), total]
+                       for labels, (counts, total) in series.items()]
+                for name, series in self.histograms.items()
+            }
+        samples = [list(sample) for collector in _collectors for sample in collector()]
+        return {'pid': self.pid,
+                'buckets': {name: list(buckets) for name, (buckets, _) in HISTOGRAMS.items()},
+                'histograms': histograms, 'samples': samples}
+
+    def flush(self):
+        """Write the snapshot of this process to `METRICS_DIR`, replacing the previous one."""
+        self.flushed_at = time.monotonic()
+        os.makedirs(settings.METRICS_DIR, exist_ok=True)
+        path = os.path.join(settings.METRICS_DIR, self.file_name)
+        temporary = f'{path}.{threading.get_ident()}.tmp'
+        with open(temporary, 'w') as file:
+            json.dump(self.snapshot(), file)
+        os.replace(temporary, path)
+
+    def flush_if_due(self):
+        if settings.METRICS_DIR \
+                and time.monotonic() - self.flushed_at >= settings.METRICS_FLUSH_INTERVAL:
+            self.flush()
+
+
+registry = Registry()
+
+
+@atexit.register
+def _flush_at_exit():
+    if settings.configured and settings.METRICS_DIR and registry.pid == os.getpid():
+        registry.flush()
+
+
+def is_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # Running as another user.
+    return True
+
+
+def get_snapshots():
+    """
+    Return the snapshots of every process: those written to `METRICS_DIR` by
+    the workers, after flushing this one, or this process' only. Those of the
+    processes no longer running are marked `live: false`.
+    """
+    if not settings.METRICS_DIR:
+        return [registry.snapshot()]
+
+    registry.flush()
+    snapshots = []
+    for name in os.listdir(settings.METRICS_DIR):
+        if not name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(settings.METRICS_DIR, name)) as file:
+                snapshot = json.load(file)
+        except (OSError, ValueError):
+            continue
+        snapshot['live'] = snapshot.get('pid') is not None and is_running(snapshot['pid'])
+        snapshots.append(snapshot)
+    return snapshots
+
+
+def merge_snapshots(snapshots):
+    """
+    Add up the histograms and the samples of several processes (the maximum of
+    `max_*`). The gauges of the processes no longer running are left out: their
+    pools and caches are gone, unlike the requests they counted.
+    """
+    histograms = {name: {} for name in HISTOGRAMS}
+    samples = {}
+    for snapshot in snapshots:
+        for name, series in snapshot['histograms'].items():
+            # Written by a version of the code with other buckets.
+            if name not in HISTOGRAMS or snapshot['buckets'][name] != list(HISTOGRAMS[name][0]):
+                continue
+            for labels, counts, total in series:
+                merged = histograms[name].setdefault(tuple(labels), [[0] * len(counts), 0])
+                merged[0] = [a + b for a, b in zip(merged[0], counts)]
+                merged[1] += total
+        for name, kind, labels, value in snapshot['samples']:
+            if kind == 'gauge' and not snapshot.get('live', True):
+                continue
+            key = (name, kind, tuple(sorted(labels.items())))
+            if key not in samples:
+                samples[key] = value
+            elif '_max_' in name:
+                samples[key] = max(samples[key], value)
+            else:
+                samples[key] += value
+    return histograms, samples
+
+
+def get_quantile(quantile, buckets, counts):
+    """Estimate a quantile from bucket counts, interpolating inside its bucket."""
+    rank = quantile * sum(counts)
+    cumulative = 0
+    for index, count in enumerate(counts):
+        if count and cumulative + count >= rank:
+            if index == len(buckets):
+                return buckets[-1]
+            lower = buckets[index - 1] if index else 0
+            return lower + (buckets[index] - lower) * (rank - cumulative) / count
+        cumulative += count
+    return 0
+
+
+def format_labels(labels):
+    def escape(value):
+        return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{escape(value)}"' for name, value in labels) + '}'
+
+
+def format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_prometheus(histograms, samples):
+    """Render merged metrics in the Prometheus text exposition format (0.0.4)."""
+    lines = []
+    for name, series in histograms.items():
+        buckets, description = HISTOGRAMS[name]
+        lines += [f'# HELP {name} {description}', f'# TYPE {name} histogram']
+        for labels, (counts, total) in sorted(series.items()):
+            labels = list(zip(REQUEST_LABELS, labels))
+            cumulative = 0
+            for bound, count in zip([*buckets, '+Inf'], counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{format_labels([*labels, ("le", bound)])} '
+                             f'{cumulative}')
+            lines.append(f'{name}_sum{format_labels(labels)} {format_value(total)}')
+            lines.append(f'{name}_count{format_labels(labels)} {cumulative}')
+
+    name = 'garage_request_duration_quantile_seconds'
+    lines += [f'# HELP {name} Latency percentiles of the API requests, estimated from the '
+              f'buckets of garage_request_duration_seconds.', f'# TYPE {name} gauge']
+    for labels, (counts, _) in sorted(histograms['garage_request_duration_seconds'].items()):
+        for quantile in QUANTILES:
+            value = get_quantile(quantile, DURATION_BUCKETS, counts)
+            sample_labels = [*zip(REQUEST_LABELS, labels), ('quantile', quantile)]
+            lines.append(f'{name}{format_labels(sample_labels)} {format_value(float(value))}')
+
+    families = defaultdict(list)
+    for (name, kind, labels), value in sorted(samples.items()):
+        families[name, kind].append((labels, value))
+    for (name, kind), values in families.items():
+        lines.append(f'# TYPE {name} {kind}')
+        lines += [f'{name}{format_labels(labels)} {format_value(value)}'
+                  for labels, value in values]
+    return '\n'.join(lines) + '\n'
+
+
+def get_view_labels(view_func):
+    """Return the viewset and action of a view, or `None` when it isn't a viewset's."""
+    actions = getattr(view_func, 'actions', None)
+    view_class = getattr(view_func, 'cls', None)
+    if not actions or view_class is None:
+        return None
+    return view_class.__name__, actions
+
+
+class MetricsMiddleware:
+    """
+    Observe the latency, response size and queries of the requests to the
+    viewsets, labelled by viewset, action and status (see `registry`). With
+    `METRICS_DIR` set, every process writes its metrics there at most every
+    `METRICS_FLUSH_INTERVAL` seconds, for `/metrics/` to add them up.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if registry.pid != os.getpid():
+            # Forked after handling requests: start over.
+            registry.reset()
+        start = time.perf_counter()
+        with QueryCounter() as counter:
+            response = self.get_response(request)
+
+        view = getattr(request, '_metrics_view', None)
+        if view is None:
+            return response
+        view_name, actions = view
+        action = actions.get(request.method.lower(), request.method.lower())
+        labels = (view_name, action, str(response.status_code))
+        if response.streaming:
+            response.streaming_content = self.stream(response.streaming_content, labels, start,
+                                                     counter)
+        else:
+            self.observe(labels, start, len(response.content), counter.count)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._metrics_view = get_view_labels(view_func)
+
+    def stream(self, content, labels, start, counter):
+        """Observe streaming responses (e.g. exports) once sent, with their queries."""
+        size = 0
+        with counter:
+            for chunk in content:
+                size += len(chunk)
+                yield chunk
+        self.observe(labels, start, size, counter.count)
+
+    def observe(self, labels, start, size, queries):
+        registry.observe('garage_request_duration_seconds', labels, time.perf_counter() - start)
+        registry.observe('garage_response_size_bytes', labels, size)
+        registry.observe('garage_request_queries', labels, queries)
+        registry.flush_if_due()
@@ -0,0 +1,34 @@
+import json
+
+from drf_spectacular.utils import extend_schema
+from rest_framework.permissions import IsAdminUser
+from rest_framework.renderers import BaseRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from garage.metrics import get_snapshots, merge_snapshots, render_prometheus
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class PrometheusRenderer(BaseRenderer):
+    """Text exposition format of Prometheus: the metrics, or the errors as JSON."""
+    media_type = 'text/plain'
+    format = 'prometheus'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if not isinstance(data, str):
+            data = json.dumps(data)
+        return data.encode(self.charset)
+
+
+@extend_schema(exclude=True)
+class MetricsView(APIView):
+    """The metrics of every worker (see `garage.metrics`), for Prometheus. Staff only."""
+    permission_classes = [IsAdminUser]
+    renderer_classes = [PrometheusRenderer]
+
+    def get(self, request):
+        content = render_prometheus(*merge_snapshots(get_snapshots()))
+        return Response(content, content_type=PROMETHEUS_CONTENT_TYPE)
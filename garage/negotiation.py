@@ -0,0 +1,21 @@
+from rest_framework.negotiation import DefaultContentNegotiation
+
+
+def is_available(media_handler):
+    return getattr(media_handler, 'available', True)
+
+
+class ContentNegotiation(DefaultContentNegotiation):
+    """
+    Content negotiation ignoring the renderers and parsers whose optional
+    package isn't installed (e.g. MessagePack), so requests for them get a
+    `406`/`415` instead of failing.
+    """
+
+    def select_parser(self, request, parsers):
+        return super().select_parser(request, [parser for parser in parsers
+                                               if is_available(parser)])
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return super().select_renderer(request, [renderer for renderer in renderers
+                                                 if is_available(renderer)], format_suffix)
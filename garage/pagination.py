@@ -1,16 +1,442 @@
-from rest_framework.pagination import PageNumberPagination
+import datetime
+import decimal
+import hashlib
+import json
+import uuid
+from base64 import b64decode, b64encode
+from binascii import Error as BinasciiError
+from collections import OrderedDict
+from functools import partial
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, FieldDoesNotExist, ValidationError
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator as DjangoPaginator
+from django.db import connections
+from django.db.models import F, Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.pagination import Cursor, CursorPagination, PageNumberPagination
+from rest_framework.utils.urls import replace_query_param
+
 from .settings import REST_FRAMEWORK
+from .versions import get_versions
+
+
+def estimate_count(queryset):
+    """
+    Return the planner's row estimate of an unfiltered queryset.
+
+    Only PostgreSQL keeps a cheap estimate (`pg_class.reltuples`), so `None`
+    is returned for other databases, filtered querysets or unanalyzed tables.
+    """
+    connection = connections[queryset.db]
+    query = queryset.query
+    if connection.vendor != 'postgresql' or query.where or query.distinct or query.combinator:
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+            [connection.ops.quote_name(queryset.model._meta.db_table)]
+        )
+        row = cursor.fetchone()
+    if row is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+def get_queryset_models(queryset):
+    """Return the models whose tables a queryset reads, including filter joins."""
+    tables = {alias.table_name for alias in queryset.query.alias_map.values()}
+    models = {queryset.model}
+    models.update(model for model in apps.get_models() if model._meta.db_table in tables)
+    return models
+
+
+def cached_count(queryset, key_prefix=''):
+    """
+    Return the exact count of a queryset, reusing it while its tables do not change.
+
+    The cache key contains the SQL of the count and the change version of every
+    table involved, so any write on those tables invalidates it.
+    """
+    try:
+        sql, params = queryset.order_by().query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+
+    versions = sorted(
+        (model._meta.label_lower, version)
+        for model, version in get_versions(*get_queryset_models(queryset)).items()
+    )
+    digest = hashlib.md5(f'{key_prefix}|{sql}|{params}|{versions}'.encode()).hexdigest()
+    key = f'garage:count:{digest}'
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, settings.PAGINATION_COUNT_CACHE_TIMEOUT)
+    return count
+
+
+def count_queryset(queryset, key_prefix='', exact=False):
+    """
+    Count strategy of the lists: return the total of a queryset and whether
+    it is exact. Unfiltered querysets of big tables get the planner's
+    estimate, unless `exact`, and other ones their cached exact count.
+    """
+    if not exact:
+        estimate = estimate_count(queryset)
+        if estimate is not None and estimate >= settings.PAGINATION_COUNT_ESTIMATE_THRESHOLD:
+            return estimate, False
+    return cached_count(queryset, key_prefix), True
+
+
+class CountingPaginator(DjangoPaginator):
+    """
+    Django paginator that gets the total from a count strategy.
+
+    When the strategy returns an estimate, pages are fetched with one extra
+    row so that navigation never depends on the estimated total.
+    """
+
+    def __init__(self, object_list, per_page, count_strategy=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_strategy = count_strategy
+        self.count_exact = True
+
+    @cached_property
+    def count(self):
+        if self.count_strategy is None:
+            return super().count
+        count, self.count_exact = self.count_strategy(self.object_list)
+        return count
+
+    def page(self, number):
+        self.count  # Resolve the count strategy before choosing how to slice.
+        if self.count_exact:
+            return super().page(number)
+
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('That page number is not an integer')
+        if number < 1:
+            raise EmptyPage('That page number is less than 1')
+
+        bottom = (number - 1) * self.per_page
+        object_list = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not object_list and number > 1:
+            raise EmptyPage('That page contains no results')
+
+        if len(object_list) > self.per_page:
+            self.count = max(self.count, bottom + len(object_list))
+        else:
+            # The last page tells the exact total.
+            self.count = bottom + len(object_list)
+            self.count_exact = True
+        return self._get_page(object_list[:self.per_page], number, self)
+
+
+class CursorEncoder(json.JSONEncoder):
+    """Encode cursor positions without losing precision (e.g. datetime microseconds)."""
+    def default(self, o):
+        if isinstance(o, (datetime.date, datetime.time)):
+            return o.isoformat()
+        if isinstance(o, (decimal.Decimal, uuid.UUID)):
+            return str(o)
+        return super().default(o)
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination that seeks by the values of every ordering field.
+
+    The ordering already applied to the queryset (ordering filter, view
+    queryset or model `Meta.ordering`) is completed with the primary key as
+    tie-breaker, so pages never need a `COUNT(*)` nor an `OFFSET`.
+    """
+    page_size_query_param = 'size'
+    cursor_query_description = 'The pagination cursor value, returned in `next`/`previous`.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            reverse, current_position = False, None
+        else:
+            reverse, current_position = self.cursor.reverse, self.cursor.position
+            if len(current_position) != len(self.ordering):
+                raise NotFound(self.invalid_cursor_message)
+
+        ordering = [self._order_by_expression(queryset.model, field, reverse)
+                    for field in self.ordering]
+        queryset = queryset.order_by(*ordering)
+        self.row_fields = None
+        if queryset._fields is not None:
+            # `values_list()` rows (see `garage.compiled`) carry the ordering values as columns.
+            missing = [field.lstrip('-') for field in self.ordering
+                       if field.lstrip('-') not in queryset._fields]
+            queryset = queryset.values_list(*queryset._fields, *missing)
+            self.row_fields = list(queryset._fields)
+        if current_position is not None:
+            queryset = queryset.filter(
+                self._get_seek_condition(queryset.model, current_position, reverse)
+            )
+
+        # Always fetch an extra item in order to determine if there is a following page.
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_following = len(results) > len(self.page)
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = current_position is not None
+            self.has_previous = has_following
+        else:
+            self.has_next = has_following
+            self.has_previous = current_position is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Return the queryset ordering with the primary key appended as tie-breaker.
+        """
+        ordering = [field for field in queryset.query.order_by if isinstance(field, str)]
+        if not ordering or len(ordering) != len(queryset.query.order_by):
+            ordering = list(queryset.model._meta.ordering or [])
+        ordering = ['pk' if field.lstrip('-') == queryset.model._meta.pk.name
+                    else field for field in ordering]
+
+        if not any(field.lstrip('-') == 'pk' for field in ordering):
+            direction = '-' if ordering and ordering[0].startswith('-') else ''
+            ordering.append(f'{direction}pk')
+        return tuple(ordering)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if self.page:
+            position = self._get_position_from_instance(self.page[-1], self.ordering)
+        else:
+            position = self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.page:
+            position = self._get_position_from_instance(self.page[0], self.ordering)
+        else:
+            position = self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            tokens = json.loads(b64decode(encoded.encode('ascii'), validate=True))
+            reverse = bool(tokens.get('r', False))
+            position = tokens['p']
+            if not isinstance(position, list):
+                raise ValueError()
+        except (AttributeError, BinasciiError, KeyError, TypeError, UnicodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return Cursor(offset=0, reverse=reverse, position=position)
+
+    def encode_cursor(self, cursor):
+        tokens = {'p': cursor.position}
+        if cursor.reverse:
+            tokens['r'] = 1
+        encoded = b64encode(
+            json.dumps(tokens, cls=CursorEncoder, separators=(',', ':')).encode('ascii')
+        ).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def _get_position_from_instance(self, instance, ordering):
+        if self.row_fields is not None:
+            return [instance[self.row_fields.index(field.lstrip('-'))] for field in ordering]
+        return [self._get_value(instance, field.lstrip('-')) for field in ordering]
+
+    def _get_value(self, instance, path):
+        *relations, name = path.split('__')
+        for relation in relations:
+            instance = getattr(instance, relation)
+            if instance is None:
+                return None
+        return getattr(instance, self._resolve_field(type(instance), name).attname)
+
+    def _resolve_field(self, model, name):
+        if name == 'pk':
+            return model._meta.pk
+        return model._meta.get_field(name)
+
+    def _resolve_path(self, model, path):
+        """Return the final model field of a lookup path and whether it can be NULL."""
+        nullable = False
+        *relations, name = path.split('__')
+        try:
+            for relation in relations:
+                field = self._resolve_field(model, relation)
+                nullable = nullable or field.null
+                model = field.related_model
+            field = self._resolve_field(model, name)
+        except FieldDoesNotExist:
+            raise NotFound(self.invalid_cursor_message)
+        return field, nullable or field.null
+
+    def _order_by_expression(self, model, field, reverse):
+        """NULLs always sort after every value, so a seek condition can describe them."""
+        descending = field.startswith('-') != reverse
+        name = field.lstrip('-')
+        nulls = {'nulls_first': True} if descending else {'nulls_last': True}
+        if not self._resolve_path(model, name)[1]:
+            nulls = {}
+        return F(name).desc(**nulls) if descending else F(name).asc(**nulls)
+
+    def _get_seek_condition(self, model, position, reverse):
+        condition = Q(pk__in=[])
+        equal = Q()
+        for field, value in zip(self.ordering, position):
+            descending = field.startswith('-') != reverse
+            name = field.lstrip('-')
+            model_field, nullable = self._resolve_path(model, name)
+            if value is not None:
+                try:
+                    value = model_field.to_python(value)
+                except ValidationError:
+                    raise NotFound(self.invalid_cursor_message)
+
+            if value is None:
+                following = Q(**{f'{name}__isnull': False}) if descending else None
+                current = Q(**{f'{name}__isnull': True})
+            else:
+                following = Q(**{f'{name}__{"lt" if descending else "gt"}': value})
+                if nullable and not descending:
+                    following |= Q(**{f'{name}__isnull': True})
+                current = Q(**{name: value})
+
+            if following is not None:
+                condition |= equal & following
+            equal &= current
+        return condition
 
 
 class CustomPagination(PageNumberPagination):
     page_size_query_param = 'size'  # items per page
     page_size_query_description = f"Number of results to return per page.\
         Default: {REST_FRAMEWORK['PAGE_SIZE']}"
+    mode_query_param = 'pagination'
+    mode_query_description = 'Use `cursor` to paginate by keyset, without count nor offset.\
+        Default: page'
+    count_query_param = 'count'
+    count_query_description = 'Use `exact` to never receive an estimated `count`.'
+    keyset_pagination_class = KeysetPagination
+    keyset = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.is_keyset_request(request):
+            self.keyset = self.keyset_pagination_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+
+        self.django_paginator_class = partial(
+            CountingPaginator,
+            count_strategy=partial(self.get_count, request=request, view=view)
+        )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_count(self, queryset, request, view=None):
+        """
+        Return the total of results and whether it is exact.
+
+        Unfiltered lists of big tables use the planner's estimate, unless the
+        client asks for an exact count. Exact counts are cached per view and query.
+        """
+        key_prefix = f'{view.__class__.__module__}.{view.__class__.__name__}' if view else ''
+        exact = request.query_params.get(self.count_query_param) == 'exact'
+        return count_queryset(queryset, key_prefix, exact)
+
+    def is_keyset_request(self, request):
+        return (request.query_params.get(self.mode_query_param) == 'cursor'
+                or self.keyset_pagination_class.cursor_query_param in request.query_params)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return Response(OrderedDict([
+            ('count', self.page.paginator.count),
+            ('count_exact', self.page.paginator.count_exact),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data)
+        ]))
+
+    def get_html_context(self):
+        if self.keyset is not None:
+            return self.keyset.get_html_context()
+        return super().get_html_context()
+
+    def to_html(self):
+        if self.keyset is not None:
+            return self.keyset.to_html()
+        return super().to_html()
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count']['description'] = \
+            'Total number of results. Not returned when `pagination=cursor`.'
+        properties = list(response_schema['properties'].items())
+        properties.insert(1, ('count_exact', {
+            'type': 'boolean',
+            'description': 'False when `count` is an estimate of the planner.',
+        }))
+        response_schema['properties'] = dict(properties)
+        return response_schema
 
-    # def get_paginated_response_schema(self, schema):
-    #     response_schema = super(CustomPagination, self).get_paginated_response_schema(schema)
-    #     response_schema['properties']['extra'] = {
-    #         'type': 'object',
-    #         'nullable': True,
-    #     }
-    #     return response_schema
+    def get_schema_operation_parameters(self, view):
+        keyset = self.keyset_pagination_class()
+        return super().get_schema_operation_parameters(view) + [
+            {
+                'name': self.count_query_param,
+                'required': False,
+                'in': 'query',
+                'description': self.count_query_description,
+                'schema': {
+                    'type': 'string',
+                    'enum': ['exact'],
+                },
+            },
+            {
+                'name': self.mode_query_param,
+                'required': False,
+                'in': 'query',
+                'description': self.mode_query_description,
+                'schema': {
+                    'type': 'string',
+                    'enum': ['page', 'cursor'],
+                },
+            },
+            {
+                'name': keyset.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': keyset.cursor_query_description,
+                'schema': {
+                    'type': 'string',
+                },
+            },
+        ]
@@ -0,0 +1,188 @@
+import contextvars
+import cProfile
+import logging
+import os
+import random
+import time
+import uuid
+from collections import Counter, defaultdict
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+from django.utils.text import slugify
+
+logger = logging.getLogger('garage.profiling')
+
+# Request header asking for a cProfile dump of the request, honored for staff users.
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+
+PHASE_DESCRIPTIONS = {
+    'auth': 'Authentication',
+    'permissions': 'Permission checks',
+    'view': 'Serialization and view code',
+    'render': 'Rendering',
+}
+
+
+class Profile:
+    """
+    Time spent by the current request in each phase. A phase's time excludes
+    the phases nested in it: the queries (`db`) made while authenticating are
+    not counted as authentication.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.durations = defaultdict(float)
+        self.counts = Counter()
+        self.profiler = None
+        self._stack = []
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        self._stack.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.durations[name] += elapsed - self._stack.pop()
+            self.counts[name] += 1
+            if self._stack:
+                self._stack[-1] += elapsed
+
+    def __call__(self, execute, sql, params, many, context):
+        with self.phase('db'):
+            return execute(sql, params, many, context)
+
+    def start_profiler(self):
+        if self.profiler is None:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def dump_profiler(self, request):
+        """Write the cProfile stats of the request to `PROFILING_DIR`, return the file name."""
+        self.profiler.disable()
+        name = '{}-{}-{}-{}.prof'.format(
+            time.strftime('%Y%m%d-%H%M%S'), request.method,
+            slugify(request.path) or 'root', uuid.uuid4().hex[:8],
+        )
+        os.makedirs(settings.PROFILING_DIR, exist_ok=True)
+        self.profiler.dump_stats(os.path.join(settings.PROFILING_DIR, name))
+        logger.info('profile path=%s file=%s', request.path, name,
+                    extra={'path': request.path, 'file': name})
+        return name
+
+    def get_server_timing(self):
+        """Return the phases as the metrics of a `Server-Timing` header."""
+        metrics = []
+        for name, duration in self.durations.items():
+            if name == 'db':
+                description = f'{self.counts[name]} queries'
+            else:
+                description = PHASE_DESCRIPTIONS.get(name, name)
+            metrics.append(f'{name};dur={duration * 1000:.2f};desc="{description}"')
+        total = time.perf_counter() - self.started
+        metrics.append(f'total;dur={total * 1000:.2f};desc="Total"')
+        return ', '.join(metrics)
+
+
+_profile = contextvars.ContextVar('garage_profile', default=None)
+
+
+def get_profile():
+    """Return the `Profile` of the current request, if any."""
+    return _profile.get()
+
+
+@contextmanager
+def phase(name):
+    """Time the block as the phase `name` of the current request."""
+    profile = _profile.get()
+    if profile is None:
+        yield
+        return
+    with profile.phase(name):
+        yield
+
+
+class ProfilingMiddleware:
+    """
+    Break the requests into phases (see `ProfilingMixin` for those of the API
+    views, `db` for the queries) reported in a `Server-Timing` header when
+    `SERVER_TIMING` is set.
+
+    Requests sampled at `PROFILING_SAMPLE_RATE`, and those of staff users
+    sending an `X-Profile: 1` header, are also profiled with cProfile, their
+    stats written to `PROFILING_DIR`. Only staff users get the file name.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        profile = Profile()
+        if settings.PROFILING_SAMPLE_RATE and random.random() < settings.PROFILING_SAMPLE_RATE:
+            profile.start_profiler()
+
+        token = _profile.set(profile)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile))
+                response = self.get_response(request)
+        finally:
+            _profile.reset(token)
+            if profile.profiler is not None:
+                profile.profiler.disable()
+
+        metrics = []
+        if profile.profiler is not None:
+            name = profile.dump_profiler(request)
+            user = getattr(request, 'user', None)
+            if user is not None and user.is_staff:
+                metrics.append(f'profile;desc="{name}"')
+        if settings.SERVER_TIMING:
+            metrics.append(profile.get_server_timing())
+        if metrics:
+            response['Server-Timing'] = ', '.join(metrics)
+        return response
+
+    def process_template_response(self, request, response):
+        # Rendered right after this: until the post-render callbacks run.
+        profile = _profile.get()
+        if profile is not None:
+            stack = ExitStack()
+            stack.enter_context(profile.phase('render'))
+            response.add_post_render_callback(lambda response: stack.close())
+        return response
+
+
+class ProfilingMixin:
+    """
+    APIView mixin timing the phases of the requests of `ProfilingMiddleware`:
+    authentication, permission checks and the rest of the view, mostly
+    serialization, apart from the queries.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        with phase('view'):
+            return super().dispatch(request, *args, **kwargs)
+
+    def perform_authentication(self, request):
+        with phase('auth'):
+            super().perform_authentication(request)
+
+        profile = _profile.get()
+        if profile is not None and request.META.get(PROFILE_HEADER) == '1' \
+                and request.user.is_staff:
+            profile.start_profiler()
+
+    def check_permissions(self, request):
+        with phase('permissions'):
+            super().check_permissions(request)
+
+    def check_object_permissions(self, request, obj):
+        with phase('permissions'):
+            super().check_object_permissions(request, obj)
@@ -0,0 +1,159 @@
+from itertools import islice
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch, prefetch_related_objects
+from rest_framework.relations import ManyRelatedField, RelatedField
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+from garage.serializers import IncludedRelatedField
+
+
+def reads_fields(*names):
+    """
+    Declare the model fields a property or method reads, e.g. `first_name` and
+    `last_name` for a `full_name` property: serializers rendering it load those
+    columns only, instead of every column of the model.
+    """
+    def decorator(function):
+        function.reads_fields = names
+        return function
+    return decorator
+
+
+def get_attribute_fields(model, name):
+    """
+    Return the concrete fields an attribute of a model reads: its primary key
+    and those declared with `reads_fields`, or all of them.
+    """
+    attribute = getattr(model, name, None)
+    names = getattr(attribute.fget if isinstance(attribute, property) else attribute,
+                    'reads_fields', None)
+    if names is None:
+        return list(model._meta.concrete_fields)
+    return [field for field in model._meta.concrete_fields
+            if field.primary_key or field.name in names]
+
+
+class QueryPlan:
+    """Relations to join or prefetch and columns to load for a serializer."""
+
+    def __init__(self):
+        self.select_related = []
+        self.prefetch_related = []
+        self.only = []
+
+
+def get_query_plan(serializer, model, prefix='', plan=None):
+    """
+    Walk the fields of a serializer and describe the queries needed to render it.
+
+    Forward relations rendered by nested serializers are joined with
+    `select_related`, reverse and many-to-many relations are prefetched and
+    only the columns the serializer reads are loaded. When a field reads
+    something that isn't a model field (a property, a method, `source='*'`)
+    every column of that model is loaded, or those it declares (see `reads_fields`).
+    """
+    plan = plan or QueryPlan()
+    columns = {model._meta.pk.name}
+    complete = True
+
+    for field in serializer.fields.values():
+        if field.source == '*' or len(field.source_attrs) != 1:
+            complete = False
+            continue
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            columns.update(
+                model_field.name for model_field in get_attribute_fields(model, field.source)
+            )
+            continue
+
+        name = f'{prefix}{model_field.name}'
+        child = field.child if isinstance(field, ListSerializer) else field
+        if isinstance(child, IncludedRelatedField):
+            child = child.serializer
+        if not model_field.is_relation:
+            columns.add(model_field.name)
+        elif model_field.many_to_many or model_field.one_to_many:
+            plan.prefetch_related.append(_get_prefetch(name, model_field, child))
+        elif not model_field.concrete:
+            # Reverse one-to-one.
+            plan.select_related.append(name)
+            if isinstance(child, BaseSerializer):
+                get_query_plan(child, model_field.related_model, f'{name}__', plan)
+            else:
+                plan.only.append(f'{name}__{model_field.related_model._meta.pk.name}')
+        else:
+            columns.add(model_field.name)
+            if isinstance(child, BaseSerializer):
+                plan.select_related.append(name)
+                get_query_plan(child, model_field.related_model, f'{name}__', plan)
+            elif isinstance(child, RelatedField) and not child.use_pk_only_optimization():
+                plan.select_related.append(name)
+                plan.only.extend(
+                    f'{name}__{related_field.name}'
+                    for related_field in model_field.related_model._meta.concrete_fields
+                )
+
+    if not complete:
+        columns.update(field.name for field in model._meta.concrete_fields)
+    plan.only.extend(f'{prefix}{column}' for column in sorted(columns))
+    return plan
+
+
+def _get_prefetch(lookup, model_field, field):
+    related_model = model_field.related_model
+    # The foreign key is needed to match the prefetched rows to their parent.
+    columns = [model_field.field.name] if model_field.one_to_many else []
+    queryset = related_model._default_manager.all()
+    if isinstance(field, BaseSerializer):
+        queryset = optimize_queryset(queryset, field, columns)
+    elif isinstance(field, ManyRelatedField) and field.child_relation.use_pk_only_optimization():
+        queryset = queryset.only(related_model._meta.pk.name, *columns)
+    return Prefetch(lookup, queryset=queryset)
+
+
+def optimize_queryset(queryset, serializer, columns=()):
+    """Apply the query plan of a serializer (or of its child, for `many=True`) to a queryset."""
+    if isinstance(serializer, ListSerializer):
+        serializer = serializer.child
+    plan = get_query_plan(serializer, queryset.model)
+    if plan.select_related:
+        queryset = queryset.select_related(*plan.select_related)
+    if plan.prefetch_related:
+        queryset = queryset.prefetch_related(*plan.prefetch_related)
+    return queryset.only(*plan.only, *columns)
+
+
+def iterate_in_chunks(queryset, chunk_size=2000):
+    """
+    Iterate a queryset without caching its rows, fetching `chunk_size` at a time
+    (with a server-side cursor on PostgreSQL).
+
+    `QuerySet.iterator()` ignores `prefetch_related`, so the lookups are
+    prefetched for each chunk instead.
+    """
+    lookups = queryset._prefetch_related_lookups
+    if not lookups:
+        yield from queryset.iterator(chunk_size=chunk_size)
+        return
+
+    rows = queryset.prefetch_related(None).iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        prefetch_related_objects(chunk, *lookups)
+        yield from chunk
+
+
+class OptimizedQuerysetMixin:
+    """
+    Viewset mixin that derives `select_related`, `prefetch_related` and `only()`
+    from the serializer of the current action, so lists run a constant number
+    of queries whatever the page size.
+    """
+
+    def get_queryset(self):
+        return optimize_queryset(super().get_queryset(), self.get_serializer())
@@ -0,0 +1,259 @@
+import csv
+import datetime
+import decimal
+import json
+import uuid
+
+from rest_framework import renderers, serializers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+def _encode_datetime(value):
+    representation = value.isoformat()
+    if representation.endswith('+00:00'):
+        representation = representation[:-6] + 'Z'
+    return representation
+
+
+class FastJSONEncoder(JSONEncoder):
+    """
+    DRF's encoder looking up the encoding of the most common values by their
+    exact type before going through its `isinstance` checks.
+    """
+    encoders = {
+        datetime.datetime: _encode_datetime,
+        datetime.date: datetime.date.isoformat,
+        decimal.Decimal: float,
+        uuid.UUID: str,
+    }
+
+    def default(self, obj):
+        encode = self.encoders.get(type(obj))
+        if encode is not None:
+            return encode(obj)
+        return super().default(obj)
+
+
+_default = FastJSONEncoder().default
+
+_SCALAR_TYPES = frozenset((str, int, bool, type(None), datetime.datetime, datetime.date,
+                           uuid.UUID))
+
+
+def _has_floats(data):
+    """Return whether data holds floats, or decimals (encoded as floats)."""
+    if type(data) in _SCALAR_TYPES:
+        return False
+    if isinstance(data, dict):
+        return any(map(_has_floats, data.values()))
+    if isinstance(data, (list, tuple)):
+        return any(map(_has_floats, data))
+    return isinstance(data, (float, decimal.Decimal))
+
+
+def dumps(data, accelerated=True):
+    """
+    Encode data as compact UTF-8 JSON, the same bytes as DRF's `JSONRenderer`,
+    with orjson when it is installed (and `accelerated`) and the data holds no
+    floats: orjson writes other exponents (`1e16` for `1e+16`) and NaN as
+    `null`, where DRF raises. orjson also drops the seconds of UTC offsets,
+    which only historical local mean times have.
+    """
+    if accelerated and orjson is not None and not _has_floats(data):
+        try:
+            return orjson.dumps(
+                data, default=_default, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+            )
+        except orjson.JSONEncodeError:
+            pass  # E.g. integers over 64 bits.
+    return json.dumps(
+        data, cls=FastJSONEncoder, ensure_ascii=False, allow_nan=False, separators=(',', ':')
+    ).encode()
+
+
+class JSONRenderer(renderers.JSONRenderer):
+    """
+    `JSONRenderer` encoding compact responses with `dumps`. Indented responses
+    (`Accept: application/json; indent=4`, the browsable API) keep the stdlib encoder.
+    """
+    encoder_class = FastJSONEncoder
+    accelerated = True
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if data is None or indent is not None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = dumps(data, self.accelerated)
+        # Same as DRF: JSON must be a strict JavaScript subset.
+        if b'\xe2\x80' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class MessagePackRenderer(BaseRenderer):
+    """MessagePack, for clients moving many rows. Requires the `msgpack` package."""
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+    available = msgpack is not None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=_default, use_bin_type=True, datetime=False)
+
+
+class MessagePackParser(BaseParser):
+    """Parse MessagePack request bodies, e.g. for the bulk endpoints."""
+    media_type = 'application/msgpack'
+    available = msgpack is not None
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (TypeError, ValueError, msgpack.UnpackException) as exc:
+            raise ParseError(f'MessagePack parse error - {exc}')
+
+
+def flatten(data, prefix='', encode_lists=True):
+    """
+    Flatten nested objects into dotted keys, e.g. `{'vehicle.id': 1}`. Lists
+    are encoded as JSON unless `encode_lists` is false.
+    """
+    row = {}
+    for key, value in data.items():
+        if isinstance(value, dict):
+            row.update(flatten(value, f'{prefix}{key}.', encode_lists))
+        elif isinstance(value, list) and encode_lists:
+            row[f'{prefix}{key}'] = json.dumps(value, cls=JSONEncoder)
+        else:
+            row[f'{prefix}{key}'] = value
+    return row
+
+
+def get_columns(serializer, prefix=''):
+    """
+    Return the dotted columns of the rows of a serializer, as `flatten` names
+    them: the fields of nested serializers instead of theirs, even when the
+    nested object of a row is null.
+    """
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    columns = []
+    for field in serializer._readable_fields:
+        if isinstance(field, serializers.BaseSerializer) \
+                and not isinstance(field, serializers.ListSerializer):
+            columns.extend(get_columns(field, f'{prefix}{field.field_name}.'))
+        else:
+            columns.append(f'{prefix}{field.field_name}')
+    return columns
+
+
+class StreamingRenderer(BaseRenderer):
+    """
+    Renderer for exports: `render_rows` renders an iterable of rows lazily,
+    with the `columns` of their serializer (see `get_columns`) when given,
+    `render` renders anything else (e.g. an error) as a single row.
+    """
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        rows = data if isinstance(data, list) else [data]
+        return b''.join(self.render_rows(rows))
+
+    def render_rows(self, rows, columns=None):
+        raise NotImplementedError('Renderer class requires .render_rows() to be implemented')
+
+
+class NDJSONRenderer(StreamingRenderer):
+    """Newline delimited JSON, one object per line."""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+    def render_rows(self, rows, columns=None):
+        for row in rows:
+            yield dumps(row) + b'\n'
+
+
+class _Line:
+    """File-like object returning what `csv.writer` writes to it."""
+
+    def write(self, value):
+        return value
+
+
+class CSVRenderer(StreamingRenderer):
+    """
+    CSV with a header of the `columns`, or of the keys of the first row without
+    them; nested objects use dotted columns.
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+
+    def render_rows(self, rows, columns=None):
+        writer = None
+        for row in rows:
+            row = flatten(row)
+            if writer is None:
+                fieldnames = list(row) if columns is None else columns
+                writer = csv.DictWriter(_Line(), fieldnames=fieldnames, extrasaction='ignore')
+                yield writer.writeheader().encode(self.charset)
+            yield writer.writerow(row).encode(self.charset)
+
+
+def to_columns(rows, columns=None):
+    """
+    Transpose rendered rows into `{'columns': [...], 'data': {column: [values...]}}`,
+    with the `columns` of their serializer, or those found in the rows without them.
+    """
+    rows = [flatten(row, encode_lists=False) for row in rows]
+    if columns is None:
+        columns = list(dict.fromkeys(column for row in rows for column in row))
+    return {
+        'columns': columns,
+        'data': {column: [row.get(column) for row in rows] for column in columns},
+    }
+
+
+class ColumnarRenderer(BaseRenderer):
+    """
+    JSON with the values of list pages grouped by column, without repeating
+    the keys on every row. Views build the columns (see `garage.columnar`);
+    lists of rows they didn't build are transposed here, with the `columns` of
+    the renderer context.
+    """
+    media_type = 'application/vnd.garage.columnar+json'
+    format = 'columnar'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        columns = (renderer_context or {}).get('columns')
+        if isinstance(data, list):
+            data = to_columns(data, columns)
+        elif isinstance(data, dict) and isinstance(data.get('results'), list):
+            data = {**data, 'results': to_columns(data['results'], columns)}
+        return dumps(data)
+
+    def render_rows(self, chunks, columns=None):
+        """Render exports as one line of columns per chunk of rows."""
+        for chunk in chunks:
+            yield dumps(chunk if isinstance(chunk, dict) else to_columns(chunk, columns)) + b'\n'
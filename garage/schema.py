@@ -1,5 +1,13 @@
+import copy
+from functools import lru_cache
+from weakref import WeakKeyDictionary
+
 from rest_framework import serializers
 from drf_spectacular.openapi import AutoSchema
+from drf_spectacular.utils import OpenApiParameter, inline_serializer
+from uritemplate import variables
+
+from garage.serializers import EXPAND_QUERY_PARAM, INCLUDED_QUERY_PARAM, SparseFieldsetsMixin
 
 
 class ErrorsSerializer(serializers.Serializer):
@@ -29,7 +37,80 @@ class NotFoundErrorSerializer(GenericErrorSerializer):
     pass
 
 
+@lru_cache(maxsize=None)
+def get_bulk_response_serializer_class(serializer_class):
+    """Response of the `bulk/` endpoints, one component for both methods."""
+    return type(inline_serializer(f'Bulk{serializer_class.__name__}', fields={
+        'results': serializer_class(many=True),
+        'errors': ErrorsSerializer(many=True),
+    }))
+
+
 class AutoSchemaWithErrors(AutoSchema):
+    def get_override_parameters(self):
+        parameters = super().get_override_parameters()
+        if self.method == 'GET' and isinstance(self._get_serializer(), SparseFieldsetsMixin):
+            parameters += [
+                OpenApiParameter(
+                    SparseFieldsetsMixin.fields_query_param, str,
+                    description='Comma separated fields to return, '
+                                'with dotted paths for nested objects (e.g. `vehicle.id`).'
+                ),
+                OpenApiParameter(
+                    SparseFieldsetsMixin.omit_query_param, str,
+                    description='Comma separated fields to leave out, '
+                                'with dotted paths for nested objects.'
+                ),
+            ]
+
+        meta = getattr(getattr(self.view, 'serializer_class', None), 'Meta', None)
+        expandable_fields = getattr(meta, 'expandable_fields', None)
+        if self.method == 'GET' and expandable_fields:
+            parameters.append(OpenApiParameter(
+                EXPAND_QUERY_PARAM, str,
+                description='Comma separated relations to expand, related objects not listed '
+                            f'are returned as ids. Relations: {", ".join(expandable_fields)}, '
+                            'with dotted paths for nested ones (e.g. `vehicle.client`).'
+            ))
+            if getattr(self.view, 'action', None) == 'list':
+                parameters.append(OpenApiParameter(
+                    INCLUDED_QUERY_PARAM, bool,
+                    description='Return expanded objects once, in a top level `included` object.'
+                ))
+        return parameters
+
+    def _is_bulk(self):
+        return getattr(self.view, 'action', None) == 'bulk'
+
+    def get_request_serializer(self):
+        serializer = super().get_request_serializer()
+        if self._is_bulk() and serializer is not None:
+            return type(serializer)(many=True)
+        return serializer
+
+    def get_response_serializers(self):
+        serializer = super().get_response_serializers()
+        if self._is_bulk() and serializer is not None:
+            return get_bulk_response_serializer_class(type(serializer))()
+        return serializer
+
+    def _get_error_response_body(self, code):
+        """
+        Return the error response body of a status code, built once per schema
+        generation (component registry) and media types.
+        """
+        error_serializers = {
+            '400': ValidationErrorSerializer,
+            '401': UnauthenticatedErrorSerializer,
+            '403': ForbiddenErrorSerializer,
+            '404': NotFoundErrorSerializer,
+        }
+        bodies = _error_response_bodies.setdefault(self.registry, {})
+        key = (code, tuple(self.map_renderers('media_type')))
+        if key not in bodies:
+            bodies[key] = self._get_response_for_code(error_serializers[code], code)
+        return copy.deepcopy(bodies[key])
+
     def _get_response_bodies(self):
         response_bodies = super()._get_response_bodies()
         if len(list(filter(lambda _: _.startswith('4'), response_bodies.keys()))):
@@ -44,15 +125,12 @@ class AutoSchemaWithErrors(AutoSchema):
             add_error_codes.append('403')
 
         if not (self.method == 'GET' and self._is_list_view()):
-            if len(list(filter(lambda _: _['in'] == 'path', self._get_parameters()))):
+            if variables(self.path):
                 add_error_codes.append('404')
 
-        self.error_response_bodies = {
-            '400': self._get_response_for_code(ValidationErrorSerializer, '400'),
-            '401': self._get_response_for_code(UnauthenticatedErrorSerializer, '401'),
-            '403': self._get_response_for_code(ForbiddenErrorSerializer, '403'),
-            '404': self._get_response_for_code(NotFoundErrorSerializer, '404')
-        }
         for code in add_error_codes:
-            response_bodies[code] = self.error_response_bodies[code]
+            response_bodies[code] = self._get_error_response_body(code)
         return response_bodies
+
+
+_error_response_bodies = WeakKeyDictionary()
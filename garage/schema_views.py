@@ -0,0 +1,103 @@
+import gzip
+import hashlib
+import json
+import logging
+import threading
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.middleware.gzip import re_accepts_gzip
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import quote_etag
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.views import SpectacularAPIView
+
+logger = logging.getLogger(__name__)
+
+
+class SchemaDocument:
+    """A schema rendered by one renderer, with its gzipped content and ETag."""
+
+    def __init__(self, content):
+        self.content = content
+        self.gzipped = gzip.compress(content, mtime=0)
+        self.etag = quote_etag(hashlib.md5(content).hexdigest())
+
+
+_documents = {}
+_documents_lock = threading.Lock()
+
+
+def generate_schema():
+    """Generate the public schema of the API, as `/schema/` does."""
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    return generator.get_schema(request=None, public=True)
+
+
+def write_schema(path=None):
+    """Generate the schema and write it as JSON to `path` (default: `SCHEMA_FILE`)."""
+    schema = generate_schema()
+    with open(path or settings.SCHEMA_FILE, 'w', encoding='utf-8') as file:
+        json.dump(schema, file, ensure_ascii=False, indent=2)
+    return schema
+
+
+def prepare_schema():
+    """
+    Render the schema once for every renderer of the schema view, from
+    `SCHEMA_FILE` (see the `build_schema` command) or, when the file is
+    missing or `DEBUG` is on, by generating it. Called at startup.
+    """
+    with _documents_lock:
+        schema = None
+        if not settings.DEBUG:
+            try:
+                with open(settings.SCHEMA_FILE, encoding='utf-8') as file:
+                    schema = json.load(file)
+            except FileNotFoundError:
+                logger.warning('%s not found, generating the schema.', settings.SCHEMA_FILE)
+        if schema is None:
+            schema = generate_schema()
+
+        _documents.clear()
+        for renderer_class in PrecomputedSchemaView.renderer_classes:
+            renderer = renderer_class()
+            _documents[renderer_class] = SchemaDocument(
+                renderer.render(schema, renderer.media_type, {})
+            )
+
+
+def get_schema_document(renderer_class):
+    if not _documents:
+        prepare_schema()
+    return _documents[renderer_class]
+
+
+class PrecomputedSchemaView(SpectacularAPIView):
+    """
+    `SpectacularAPIView` serving the schema rendered at startup (see
+    `prepare_schema`), gzipped when accepted, and answering `If-None-Match`
+    with a `304`.
+    """
+
+    def _get_schema_response(self, request):
+        renderer = request.accepted_renderer
+        document = get_schema_document(type(renderer))
+        use_gzip = bool(re_accepts_gzip.search(request.META.get('HTTP_ACCEPT_ENCODING', '')))
+        etag = f'{document.etag[:-1]}-gzip"' if use_gzip else document.etag
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            content_type = renderer.media_type
+            if renderer.charset:
+                content_type = f'{content_type}; charset={renderer.charset}'
+            response = HttpResponse(document.gzipped if use_gzip else document.content,
+                                    content_type=content_type)
+            if use_gzip:
+                response['Content-Encoding'] = 'gzip'
+            version = self.api_version or request.version or self._get_version_parameter(request)
+            response['Content-Disposition'] = \
+                f'inline; filename="{self._get_filename(request, version)}"'
+        response['ETag'] = etag
+        patch_vary_headers(response, ('Accept', 'Accept-Encoding'))
+        return response
@@ -0,0 +1,156 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+EXPAND_QUERY_PARAM = 'expand'
+INCLUDED_QUERY_PARAM = 'included'
+
+
+def get_query_param_paths(request, param):
+    """Return the comma separated dotted paths of a query parameter, e.g. `vehicle.client`."""
+    value = request.query_params.get(param, '') if request else ''
+    return {path.strip() for path in value.split(',') if path.strip()}
+
+
+def get_field_path(serializer):
+    """Return the field names leading from the root serializer to this one."""
+    path = []
+    node = serializer
+    while node.parent is not None:
+        if not isinstance(node.parent, serializers.ListSerializer):
+            path.insert(0, node.field_name)
+        node = node.parent
+    return path
+
+
+def is_expand_request(request):
+    """Return whether a read request uses `?expand=`, which renders unexpanded relations as ids."""
+    return request is not None and request.method in SAFE_METHODS \
+        and EXPAND_QUERY_PARAM in request.query_params
+
+
+def is_included_request(request):
+    return is_expand_request(request) \
+        and request.query_params.get(INCLUDED_QUERY_PARAM) in ('1', 'true')
+
+
+class IncludedRelatedField(serializers.Field):
+    """
+    Render a relation as its primary key and its expanded representation,
+    once per object, in the `included` mapping of the serializer context.
+    """
+
+    def __init__(self, serializer, path, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+        self.serializer = serializer
+        self.path = path
+
+    def bind(self, field_name, parent):
+        super().bind(field_name, parent)
+        self.serializer.bind(field_name, parent)
+
+    def to_representation(self, value):
+        included = self.context['included'].setdefault(self.path, {})
+        if value.pk not in included:
+            included[value.pk] = self.serializer.to_representation(value)
+        return value.pk
+
+
+class PrefetchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Primary key field that resolves its object from `context['prefetched'][field_name]`
+    when the caller loaded the related objects of many items beforehand (see
+    `garage.bulk.BulkMixin`), and from the database otherwise.
+    """
+
+    def to_internal_value(self, data):
+        prefetched = self.context.get('prefetched', {}).get(self.field_name)
+        if prefetched is None or self.pk_field is not None:
+            return super().to_internal_value(data)
+
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            pk = self.get_queryset().model._meta.pk.to_python(data)
+        except (TypeError, ValueError, DjangoValidationError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            return prefetched[pk]
+        except (KeyError, TypeError):
+            self.fail('does_not_exist', pk_value=data)
+
+
+class SparseFieldsetsMixin:
+    """
+    Serializer mixin that renders only the fields requested with `?fields=`
+    and none of those listed in `?omit=`. Nested fields use dotted paths,
+    e.g. `?fields=id,start_at,vehicle.license_plate`.
+
+    Views deriving their queryset from the serializer (see
+    `garage.querysets.OptimizedQuerysetMixin`) load only those columns too.
+    """
+    fields_query_param = 'fields'
+    omit_query_param = 'omit'
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if request is None or request.method not in SAFE_METHODS:
+            return fields
+
+        prefix = ''.join(f'{name}.' for name in get_field_path(self))
+        requested = get_query_param_paths(request, self.fields_query_param)
+        requested = {path[len(prefix):] for path in requested if path.startswith(prefix)}
+        if requested:
+            names = {path.split('.')[0] for path in requested}
+            fields = {name: field for name, field in fields.items() if name in names}
+
+        omitted = get_query_param_paths(request, self.omit_query_param)
+        return {name: field for name, field in fields.items() if f'{prefix}{name}' not in omitted}
+
+    def build_nested_field(self, field_name, relation_info, nested_depth):
+        field_class, field_kwargs = super().build_nested_field(
+            field_name, relation_info, nested_depth
+        )
+        # Serializers auto-nested by `Meta.depth` support the same query parameters.
+        field_class = type(field_class.__name__, (SparseFieldsetsMixin, field_class), {})
+        return field_class, field_kwargs
+
+
+class ExpandableFieldsMixin:
+    """
+    Serializer mixin that renders the relations of `Meta.expandable_fields`
+    with the given serializer when they are listed in `?expand=`, with dotted
+    paths for nested ones (e.g. `?expand=vehicle,vehicle.client`).
+
+    When the serializer context has an `included` mapping, expanded objects
+    are rendered there once and the relation keeps rendering its id.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        expandable_fields = getattr(self.Meta, 'expandable_fields', {})
+        request = self.context.get('request')
+        if not expandable_fields or not is_expand_request(request):
+            return fields
+
+        prefix = ''.join(f'{name}.' for name in get_field_path(self))
+        expanded = get_query_param_paths(request, EXPAND_QUERY_PARAM)
+        for name, serializer_class in expandable_fields.items():
+            path = f'{prefix}{name}'
+            if name not in fields or not any(
+                    expand == path or expand.startswith(f'{path}.') for expand in expanded):
+                continue
+            serializer = serializer_class(read_only=True, allow_null=fields[name].allow_null)
+            if 'included' in self.context:
+                fields[name] = IncludedRelatedField(serializer, path)
+            else:
+                fields[name] = serializer
+        return fields
+
+
+class DynamicFieldsModelSerializer(SparseFieldsetsMixin, ExpandableFieldsMixin,
+                                   serializers.ModelSerializer):
+    serializer_related_field = PrefetchedPrimaryKeyRelatedField
@@ -1,5 +1,6 @@
 from pathlib import Path
 import environ
+from django.core.exceptions import ImproperlyConfigured
 import datetime
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -30,6 +31,7 @@ INSTALLED_APPS = [
 ]
 
 LOCAL_APPS = [
+    'garage',
     'users',
     'services',
 ]
@@ -45,7 +47,11 @@ THIRD_PARTY_APPS = [
 INSTALLED_APPS += LOCAL_APPS + THIRD_PARTY_APPS
 
 MIDDLEWARE = [
+    'garage.profiling.ProfilingMiddleware',
+    'garage.metrics.MetricsMiddleware',
+    'garage.db.slow_queries.SlowQueryMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'garage.db.replicas.ReplicaMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -54,15 +60,36 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Browsable API: `light` renders relations as id inputs with a typeahead instead
+# of a <select> loading every related object, `full` is DRF's, `off` disables it.
+BROWSABLE_API_RENDERERS = {
+    'full': ('rest_framework.renderers.BrowsableAPIRenderer',),
+    'light': ('garage.browsable.LightBrowsableAPIRenderer',),
+    'off': (),
+}
+BROWSABLE_API = env.str('BROWSABLE_API', default='light')
+if BROWSABLE_API not in BROWSABLE_API_RENDERERS:
+    raise ImproperlyConfigured(
+        f'BROWSABLE_API must be one of {", ".join(BROWSABLE_API_RENDERERS)}, not {BROWSABLE_API!r}.'
+    )
+
 REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': (
-        'rest_framework.renderers.JSONRenderer',
-        'rest_framework.renderers.BrowsableAPIRenderer',
+        'garage.renderers.JSONRenderer',
+        'garage.renderers.MessagePackRenderer',
+        *BROWSABLE_API_RENDERERS[BROWSABLE_API],
     ),
+    'DEFAULT_PARSER_CLASSES': (
+        'rest_framework.parsers.JSONParser',
+        'garage.renderers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    'DEFAULT_CONTENT_NEGOTIATION_CLASS': 'garage.negotiation.ContentNegotiation',
     'DEFAULT_SCHEMA_CLASS': 'garage.schema.AutoSchemaWithErrors',
     # 'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.JWTAuthentication',
     ),
     'DEFAULT_FILTER_BACKENDS': (
         'django_filters.rest_framework.DjangoFilterBackend',
@@ -72,6 +99,51 @@ REST_FRAMEWORK = {
     "EXCEPTION_HANDLER": "drf_standardized_errors.handler.exception_handler"
 }
 
+# Seconds an exact pagination count is reused while its tables are not written.
+PAGINATION_COUNT_CACHE_TIMEOUT = env.int('PAGINATION_COUNT_CACHE_TIMEOUT', default=30)
+# Unfiltered lists of tables with more rows than this use the planner's estimate.
+PAGINATION_COUNT_ESTIMATE_THRESHOLD = env.int('PAGINATION_COUNT_ESTIMATE_THRESHOLD', default=10000)
+
+# Entries of the in-process (L1) tier of the API cache (see garage.cache).
+LOCAL_CACHE_MAX_ENTRIES = env.int('LOCAL_CACHE_MAX_ENTRIES', default=256)
+# Seconds an entry of the API cache is kept in its shared (L2) tier.
+API_CACHE_TIMEOUT = env.int('API_CACHE_TIMEOUT', default=3600)
+
+# Authenticate from the token claims alone, without loading the user.
+JWT_STATELESS = env.bool('JWT_STATELESS', default=False)
+# Users resolved from tokens kept in each worker's memory, and seconds kept in the API cache.
+JWT_USER_CACHE_MAX_ENTRIES = env.int('JWT_USER_CACHE_MAX_ENTRIES', default=1024)
+JWT_USER_CACHE_TIMEOUT = env.int('JWT_USER_CACHE_TIMEOUT', default=300)
+# Seconds a user is kept in a worker's memory: how long a change to it may take to
+# reach the workers when the cache (CACHE_URL) isn't shared.
+JWT_USER_CACHE_LOCAL_TIMEOUT = env.int('JWT_USER_CACHE_LOCAL_TIMEOUT', default=10)
+
+# Raise instead of logging a warning when a view goes over its query budget.
+QUERY_BUDGET_RAISE = env.bool('QUERY_BUDGET_RAISE', default=False)
+
+# Report the phases of each request (auth, permissions, db, view...) in a Server-Timing header,
+# to every client: off unless DEBUG.
+SERVER_TIMING = env.bool('SERVER_TIMING', default=DEBUG)
+# Share of the requests profiled with cProfile, written to PROFILING_DIR (as are those
+# of staff users sending `X-Profile: 1`).
+PROFILING_SAMPLE_RATE = env.float('PROFILING_SAMPLE_RATE', default=0)
+PROFILING_DIR = env.str('PROFILING_DIR', default=str(BASE_DIR / 'profiles'))
+
+# Folder the worker processes write their metrics to, for /metrics/ to add them up.
+# Unset, /metrics/ shows those of the process serving it.
+METRICS_DIR = env.str('METRICS_DIR', default='')
+# Seconds between the writes of a worker's metrics to METRICS_DIR.
+METRICS_FLUSH_INTERVAL = env.float('METRICS_FLUSH_INTERVAL', default=5)
+
+# Queries taking longer (in milliseconds) are logged (garage.db.slow), 0 to log none.
+SLOW_QUERY_MS = env.float('SLOW_QUERY_MS', default=200)
+# JSON lines file the slow queries are appended to, for the slow_queries command.
+SLOW_QUERY_LOG = env.str('SLOW_QUERY_LOG', default=str(BASE_DIR / 'slow_queries.jsonl'))
+# Share of the slow queries whose EXPLAIN (ANALYZE, BUFFERS) plan is logged, on PostgreSQL.
+SLOW_QUERY_EXPLAIN_RATE = env.float('SLOW_QUERY_EXPLAIN_RATE', default=0.1)
+
+TEST_RUNNER = 'garage.testing.DiscoverRunner'
+
 
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': datetime.timedelta(weeks=9999),
@@ -94,6 +166,7 @@ SIMPLE_JWT = {
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
     'TOKEN_TYPE_CLAIM': 'token_type',
     'JTI_CLAIM': 'jti',
+    'TOKEN_OBTAIN_SERIALIZER': 'users.serializers.TokenObtainPairSerializer',
     'SLIDING_TOKEN_REFRESH_EXP_CLAIM': 'refresh_exp',
     'SLIDING_TOKEN_LIFETIME': datetime.timedelta(minutes=5),
     'SLIDING_TOKEN_REFRESH_LIFETIME': datetime.timedelta(days=1),
@@ -127,6 +200,45 @@ DATABASES = {
     'default': env.db()
 }
 
+# Read replicas of `default`: comma separated URLs, in the format of DATABASE_URL.
+DATABASE_REPLICAS = []
+for index, url in enumerate(env.list('DATABASE_REPLICA_URLS', default=[]), start=1):
+    DATABASES[f'replica{index}'] = {**env.db_url_config(url), 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS.append(f'replica{index}')
+DATABASE_ROUTERS = ['garage.db.routers.ReplicaRouter']
+# Seconds the reads of a client go to the primary after it writes.
+DATABASE_REPLICA_STICKY_SECONDS = env.int('DATABASE_REPLICA_STICKY_SECONDS', default=10)
+# Replicas further behind the primary (in seconds) are not read from.
+DATABASE_REPLICA_MAX_LAG = env.float('DATABASE_REPLICA_MAX_LAG', default=30)
+# Connections of the in-process pool of each PostgreSQL database, 0 for none. The
+# ASGI entry point (garage.asgi) pools by default: its request threads don't
+# outlive the requests, so their persistent connections would leak.
+DATABASE_POOL_SIZE = env.int('DATABASE_POOL_SIZE', default=0)
+# Seconds a request waits for a pooled connection before failing.
+DATABASE_POOL_TIMEOUT = env.float('DATABASE_POOL_TIMEOUT', default=10)
+for database in DATABASES.values():
+    if database['ENGINE'] == 'django.db.backends.postgresql':
+        database['ENGINE'] = 'garage.db.backends.postgresql'
+    database.update({
+        # Seconds a connection is kept open between requests, unless pooled.
+        'CONN_MAX_AGE': 0 if DATABASE_POOL_SIZE else env.int('CONN_MAX_AGE', default=60),
+        'CONN_HEALTH_CHECKS': True,
+        'POOL_SIZE': DATABASE_POOL_SIZE,
+        'POOL_TIMEOUT': DATABASE_POOL_TIMEOUT,
+    })
+
+# Cache
+# https://docs.djangoproject.com/en/4.0/topics/cache/
+# Use a shared backend (e.g. filecache:// or memcache://) when running several workers.
+
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://')
+}
+if 'API_CACHE_URL' in env:
+    CACHES['api'] = env.cache('API_CACHE_URL')
+# Shared (L2) tier of the API cache.
+API_CACHE_ALIAS = 'api' if 'api' in CACHES else 'default'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.0/ref/settings/#auth-password-validators
@@ -172,6 +284,9 @@ AUTH_USER_MODEL = 'users.User'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Swagger settings
+# Schema written by `manage.py build_schema` and served by /schema/ (see garage.schema).
+SCHEMA_FILE = env.str('SCHEMA_FILE', default=str(BASE_DIR / 'openapi.json'))
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'API Garage',
     'DESCRIPTION': 'A simple API for garage',
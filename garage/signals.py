@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from garage.db import replicas, slow_queries
+from garage.versions import bump_version
+
+
+def is_tracked(model):
+    return model._meta.app_label in settings.LOCAL_APPS
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def bump_model_version(sender, **kwargs):
+    if is_tracked(sender):
+        bump_version(sender)
+
+
+@receiver(m2m_changed)
+def bump_relation_version(sender, instance, action, **kwargs):
+    if action.startswith('post_') and is_tracked(type(instance)):
+        bump_version(type(instance), sender)
+
+
+@receiver(connection_created)
+def instrument_connection(sender, connection, **kwargs):
+    slow_queries.install(connection)
+    replicas.install(connection)
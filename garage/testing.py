@@ -0,0 +1,61 @@
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.runner import DiscoverRunner as BaseDiscoverRunner
+from django.test.utils import override_settings
+
+from garage.instrumentation import QueryCounter
+
+
+# Second database of the tests, to read from as a replica (see `garage.db.routers`).
+TEST_REPLICA_ALIAS = 'replica'
+
+
+class DiscoverRunner(BaseDiscoverRunner):
+    """
+    Test runner that fails any request going over the query budget of its view,
+    and logs no slow queries. The caches needn't be shared (`garage.W001`).
+
+    Reads go to the primary, unless a test routes them to `TEST_REPLICA_ALIAS`
+    with `DATABASE_REPLICAS`: that database is a copy of the primary that
+    isn't replicated, so a test sees which one a read went to.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._query_budget_settings = override_settings(QUERY_BUDGET_RAISE=True,
+                                                        DATABASE_REPLICAS=[],
+                                                        SLOW_QUERY_MS=0, SLOW_QUERY_LOG='',
+                                                        # A single process uses the caches.
+                                                        SILENCED_SYSTEM_CHECKS=['garage.W001'])
+        self._query_budget_settings.enable()
+        # Before the tests are collected: `databases = '__all__'` lists the aliases then.
+        self.add_replica_database()
+
+    def add_replica_database(self):
+        default = connections.databases[DEFAULT_DB_ALIAS]
+        test_name = None
+        if default['ENGINE'] != 'django.db.backends.sqlite3':
+            test_name = f'{default["TEST"]["NAME"] or "test_" + default["NAME"]}_replica'
+        connections.databases.setdefault(TEST_REPLICA_ALIAS, {
+            **default, 'TEST': {**default['TEST'], 'MIRROR': None, 'NAME': test_name},
+        })
+
+    def teardown_test_environment(self, **kwargs):
+        self._query_budget_settings.disable()
+        super().teardown_test_environment(**kwargs)
+
+
+class QueryBudgetTestMixin:
+    """Assertions on the query budgets declared by the viewsets."""
+
+    @contextmanager
+    def assertQueryBudget(self, view_class, action):
+        """Fail if the block runs more queries than `view_class.query_budgets[action]`."""
+        budget = view_class.query_budgets[action]
+        with QueryCounter() as counter:
+            yield counter
+        self.assertLessEqual(
+            counter.count, budget,
+            f'{view_class.__name__}.{action} ran {counter.count} queries, its budget is {budget}.'
+        )
@@ -1,10 +1,17 @@
 from django.contrib import admin
+from django.middleware.http import ConditionalGetMiddleware
 from django.urls import path, include
+from django.utils.decorators import decorator_from_middleware
+from django.views.decorators.gzip import gzip_page
 
-from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
+from drf_spectacular.views import SpectacularRedocView, SpectacularSwaggerView
 
+from garage.metrics_views import MetricsView
+from garage.schema_views import PrecomputedSchemaView
 from users.views.token import TokenObtainPairView, TokenRefreshView
 
+conditional_page = decorator_from_middleware(ConditionalGetMiddleware)
+
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -12,11 +19,15 @@ urlpatterns = [
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('v1/users/', include('users.urls')),
     path('v1/', include('services.urls')),
+    path('metrics/', MetricsView.as_view(), name='metrics'),
 ]
 
 # Swagger
 urlpatterns += [
-    path('schema/', SpectacularAPIView.as_view(), name='schema'),
-    path('schema/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
-    path("swagger/", SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
+    path('schema/', PrecomputedSchemaView.as_view(), name='schema'),
+    path('schema/redoc/', conditional_page(gzip_page(
+        SpectacularRedocView.as_view(url_name='schema'))), name='redoc'),
+    # No ETag: the page embeds a CSRF token that changes on every request.
+    path("swagger/", gzip_page(SpectacularSwaggerView.as_view(url_name='schema')),
+         name='swagger-ui'),
 ]
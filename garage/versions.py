@@ -0,0 +1,50 @@
+import time
+
+from django.core.cache import cache
+
+VERSION_KEY_PREFIX = 'garage:version'
+
+
+def get_model_tag(model):
+    """Return the tag whose version changes with every write on a model."""
+    return model._meta.label_lower
+
+
+def _version_key(tag):
+    return f'{VERSION_KEY_PREFIX}:{tag}'
+
+
+def get_tag_versions(*tags):
+    """
+    Return the current version of every tag, keyed by tag.
+
+    Versions are millisecond timestamps stored in the default cache, so
+    every worker sharing that cache sees the same values. A missing version
+    (first use or evicted key) is initialized to now, which never collides
+    with a value used before.
+    """
+    keys = {_version_key(tag): tag for tag in tags}
+    versions = cache.get_many(keys)
+    for key in keys.keys() - versions.keys():
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        versions[key] = cache.get(key)
+    return {tag: versions[key] for key, tag in keys.items()}
+
+
+def bump_tags(*tags):
+    """Mark the tags as changed, invalidating everything built from them."""
+    keys = [_version_key(tag) for tag in tags]
+    now = int(time.time() * 1000)
+    versions = cache.get_many(keys)
+    cache.set_many({key: max(now, versions.get(key, 0) + 1) for key in keys}, timeout=None)
+
+
+def get_versions(*models):
+    """Return the current change version of every model, keyed by model."""
+    versions = get_tag_versions(*(get_model_tag(model) for model in models))
+    return {model: versions[get_model_tag(model)] for model in models}
+
+
+def bump_version(*models):
+    """Mark the models as changed, invalidating everything built from them."""
+    bump_tags(*(get_model_tag(model) for model in models))
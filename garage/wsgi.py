@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'garage.settings')
 
 application = get_wsgi_application()
+
+# Render the OpenAPI schema before serving the first request.
+from garage.schema_views import prepare_schema  # noqa: E402
+
+prepare_schema()
@@ -1,9 +1,11 @@
 from django.contrib import admin
+from django.db.models import Prefetch
 
+from garage.admin import EstimatedCountAdminMixin
 from services.models import Type, Brand, Vehicle, Service, Client
 
 
-class ClientAdmin(admin.ModelAdmin):
+class ClientAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
     list_display = (
         'last_name',
         'first_name',
@@ -16,22 +18,33 @@ class ClientAdmin(admin.ModelAdmin):
         'first_name'
     )
     list_filter = ('is_active',)
+    autocomplete_fields = ('created_by',)
+
+    def get_queryset(self, request):
+        # Only the changelist shows the vehicles (not the forms nor the autocomplete).
+        queryset = super().get_queryset(request)
+        changelist = f'{self.opts.app_label}_{self.opts.model_name}_changelist'
+        if request.resolver_match and request.resolver_match.url_name == changelist:
+            queryset = queryset.prefetch_related(Prefetch(
+                'client_vehicles', queryset=Vehicle.objects.select_related('brand')
+            ))
+        return queryset
 
     def vehicles(self, obj):
         return ', '.join([str(v) for v in obj.client_vehicles.all()])
 
 
-class TypeAdmin(admin.ModelAdmin):
+class TypeAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
     list_display = ('name',)
     search_fields = ('name',)
 
 
-class BrandAdmin(admin.ModelAdmin):
+class BrandAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
     list_display = ('name',)
     search_fields = ('name',)
 
 
-class VehicleAdmin(admin.ModelAdmin):
+class VehicleAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
     list_display = (
         'client',
         'brand',
@@ -50,9 +63,16 @@ class VehicleAdmin(admin.ModelAdmin):
         'client__last_name',
         'client__first_name'
     )
+    autocomplete_fields = ('type', 'brand', 'client')
 
+    def get_queryset(self, request):
+        # Instead of `list_select_related`, which the changelist ignores once the
+        # queryset selects related objects: the brand is also part of the name of
+        # a vehicle, shown in the autocomplete results.
+        return super().get_queryset(request).select_related('client', 'brand')
 
-class ServiceAdmin(admin.ModelAdmin):
+
+class ServiceAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
     list_display = (
         'vehicle',
         'client',
@@ -62,6 +82,7 @@ class ServiceAdmin(admin.ModelAdmin):
         'finish_at',
         'is_paid',
     )
+    list_select_related = ('vehicle__brand', 'vehicle__client')
     search_fields = (
         'vehicle__brand__name',
         'vehicle__client__last_name',
@@ -71,10 +92,13 @@ class ServiceAdmin(admin.ModelAdmin):
     list_filter = (
         'is_paid',
     )
+    autocomplete_fields = ('vehicle',)
 
+    @admin.display(ordering='vehicle__client__last_name')
     def client(self, obj):
         return obj.vehicle.client
 
+    @admin.display(ordering='vehicle__license_plate')
     def license_plate(self, obj):
         return obj.vehicle.license_plate
 
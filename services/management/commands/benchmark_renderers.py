@@ -0,0 +1,101 @@
+import datetime
+import time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework import renderers
+
+from garage import renderers as garage_renderers
+from services.models import Brand, Client, Service, Type, Vehicle
+from services.serializers import ServiceResponseSerializer
+
+
+class StdlibJSONRenderer(garage_renderers.JSONRenderer):
+    accelerated = False
+
+
+def get_services(size):
+    """Return unsaved services with every relation of the list response."""
+    now = timezone.now()
+    user = get_user_model()(id=1, email='admin@garage.com', first_name='Ana', last_name='Núñez')
+    brand = Brand(id=1, name='Ford')
+    vehicle_type = Type(id=1, name='Car')
+    services = []
+    for index in range(1, size + 1):
+        client = Client(id=index, first_name='José', last_name=f'Pérez {index}',
+                        email=f'client{index}@garage.com', phone='+54 11 5555-5555',
+                        address='Av. Siempre Viva 742', city='Córdoba', state='Córdoba',
+                        created_at=now, created_by=user)
+        vehicle = Vehicle(id=index, type=vehicle_type, brand=brand, model='Focus', year=2015,
+                          color='Gris', license_plate=f'AB{index:04d}CD',
+                          kilometers=index * 100, client=client)
+        services.append(Service(
+            id=index, vehicle=vehicle, start_at=now - datetime.timedelta(days=index),
+            finish_at=now, symptoms='Ruido en el motor al arrancar en frío.',
+            repairs='Cambio de correa de distribución.', cost=Decimal(index) / 7,
+            is_paid=bool(index % 2), paid_date=now.date(), kilometers=index * 100,
+        ))
+    return services
+
+
+def get_native_rows(services):
+    """Rows as `values()` returns them: decimals and datetimes left to the encoder."""
+    return [{
+        'id': service.id,
+        'vehicle_id': service.vehicle.id,
+        'vehicle__license_plate': service.vehicle.license_plate,
+        'vehicle__client__last_name': service.vehicle.client.last_name,
+        'start_at': service.start_at,
+        'finish_at': service.finish_at,
+        'cost': service.cost,
+        'is_paid': service.is_paid,
+        'paid_date': service.paid_date,
+    } for service in services]
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the encoding throughput of the API renderers on large pages of services, '
+        'as serialized by the list endpoint and as raw rows.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, default=500, help='Services per page.')
+        parser.add_argument('--repeat', type=int, default=20, help='Pages rendered per renderer.')
+
+    def handle(self, **options):
+        services = get_services(options['size'])
+        results = ServiceResponseSerializer(services, many=True).data
+        payloads = {
+            'serialized': {'count': len(results), 'count_exact': True, 'next': None,
+                           'previous': None, 'results': results},
+            'native': get_native_rows(services),
+        }
+
+        candidates = [
+            ('drf json', renderers.JSONRenderer()),
+            ('json (stdlib)', StdlibJSONRenderer()),
+        ]
+        if garage_renderers.orjson is not None:
+            candidates.append(('json (orjson)', garage_renderers.JSONRenderer()))
+        if garage_renderers.MessagePackRenderer.available:
+            candidates.append(('msgpack', garage_renderers.MessagePackRenderer()))
+
+        for payload_name, payload in payloads.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f'{payload_name} page of {options["size"]} services:'
+            ))
+            baseline = None
+            for name, renderer in candidates:
+                content = renderer.render(payload, renderer.media_type, {})
+                start = time.perf_counter()
+                for _ in range(options['repeat']):
+                    renderer.render(payload, renderer.media_type, {})
+                elapsed = (time.perf_counter() - start) / options['repeat']
+                baseline = baseline or elapsed
+                self.stdout.write(
+                    f'  {name:<14} {len(content):>10,} bytes {elapsed * 1000:>9.2f} ms/page '
+                    f'{len(content) / elapsed / 2 ** 20:>8.1f} MB/s {baseline / elapsed:>6.1f}x'
+                )
@@ -0,0 +1,19 @@
+from django.db import migrations
+
+from garage.db.operations import AddTrigramIndex, CreateTrigramExtension
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0001_initial'),
+    ]
+
+    operations = [
+        CreateTrigramExtension(),
+        AddTrigramIndex('client', 'last_name'),
+        AddTrigramIndex('client', 'first_name'),
+        AddTrigramIndex('client', 'email'),
+        AddTrigramIndex('vehicle', 'model'),
+        AddTrigramIndex('vehicle', 'license_plate'),
+    ]
@@ -0,0 +1,56 @@
+from django.db import migrations, models
+import garage.db.operations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0002_search_trigram_indexes'),
+    ]
+
+    operations = [
+        garage.db.operations.AddTrigramIndex(
+            model_name='brand',
+            field_name='name',
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['last_name', 'first_name'], name='services_cl_last_na_ea79bc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['is_active', 'last_name', 'first_name'], name='services_cl_is_acti_e7f945_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(fields=['is_paid'], name='services_se_is_paid_efbd28_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(fields=['start_at'], name='services_se_start_a_7faaac_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(fields=['finish_at'], name='services_se_finish__c530f1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='type',
+            index=models.Index(fields=['name'], name='services_ty_name_ba8e1b_idx'),
+        ),
+        garage.db.operations.AddTrigramIndex(
+            model_name='type',
+            field_name='name',
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['model'], name='services_ve_model_62ef2b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['year'], name='services_ve_year_7dce54_idx'),
+        ),
+        garage.db.operations.AddTrigramIndex(
+            model_name='vehicle',
+            field_name='color',
+        ),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 
+from garage.querysets import reads_fields
+
 
 class Client(models.Model):
     is_active = models.BooleanField(default=True)
@@ -19,8 +21,14 @@ class Client(models.Model):
 
     class Meta:
         ordering = ['last_name', 'first_name']
+        indexes = [
+            models.Index(fields=['last_name', 'first_name'], name='services_cl_last_na_ea79bc_idx'),
+            models.Index(fields=['is_active', 'last_name', 'first_name'],
+                         name='services_cl_is_acti_e7f945_idx'),
+        ]
 
     @property
+    @reads_fields('first_name', 'last_name')
     def full_name(self):
         return f"{self.first_name} {self.last_name}"
 
@@ -31,6 +39,11 @@ class Client(models.Model):
 class Type(models.Model):
     name = models.CharField(max_length=100, help_text="Type of vehicle, e.g. Car, Truck, etc.")
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['name'], name='services_ty_name_ba8e1b_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -53,6 +66,12 @@ class Vehicle(models.Model):
     kilometers = models.IntegerField()
     client = models.ForeignKey(Client, related_name='client_vehicles', on_delete=models.CASCADE)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['model'], name='services_ve_model_62ef2b_idx'),
+            models.Index(fields=['year'], name='services_ve_year_7dce54_idx'),
+        ]
+
     def __str__(self):
         return f'{self.brand} {self.model} ({self.year})'
 
@@ -68,5 +87,12 @@ class Service(models.Model):
     paid_date = models.DateField(null=True, blank=True)
     kilometers = models.IntegerField()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['is_paid'], name='services_se_is_paid_efbd28_idx'),
+            models.Index(fields=['start_at'], name='services_se_start_a_7faaac_idx'),
+            models.Index(fields=['finish_at'], name='services_se_finish__c530f1_idx'),
+        ]
+
     def __str__(self):
         return f'{self.vehicle} {self.vehicle.client}'
@@ -2,16 +2,18 @@ from django.contrib.auth import get_user_model
 
 from rest_framework import serializers
 
+from garage.cache import api_cache
+from garage.serializers import DynamicFieldsModelSerializer
 from services.models import Brand, Service, Type, Vehicle, Client
 
 
-class ClientUserDetailsSerializer(serializers.ModelSerializer):
+class ClientUserDetailsSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = get_user_model()
         fields = ['id', 'full_name']
 
 
-class ClientsSerializer(serializers.ModelSerializer):
+class ClientsSerializer(DynamicFieldsModelSerializer):
     created_by = ClientUserDetailsSerializer()
 
     class Meta:
@@ -19,34 +21,40 @@ class ClientsSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class BrandSerializer(serializers.ModelSerializer):
+class BrandSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = Brand
         fields = '__all__'
 
     def validate_name(self, name):
-        brands = Brand.objects.filter(name__iexact=name)
-        if self.instance:
-            brands = brands.exclude(pk=self.instance.pk)
-        if brands.exists():
+        brands = api_cache.get_or_set('brand-names', lambda: {
+            brand_name.upper(): pk for pk, brand_name in Brand.objects.values_list('pk', 'name')
+        }, tags=[Brand])
+        pk = brands.get(name.upper())
+        if pk is not None and (self.instance is None or pk != self.instance.pk):
             raise serializers.ValidationError('brand with this name already exists.')
         return name
 
 
-class VehicleTypeSerializer(serializers.ModelSerializer):
+class VehicleTypeSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = Type
         fields = '__all__'
 
 
-class VehiclesSerializer(serializers.ModelSerializer):
+class VehiclesSerializer(DynamicFieldsModelSerializer):
 
     class Meta:
         model = Vehicle
         fields = '__all__'
+        expandable_fields = {
+            'client': ClientsSerializer,
+            'brand': BrandSerializer,
+            'type': VehicleTypeSerializer,
+        }
 
 
-class VehiclesResponseSerializer(serializers.ModelSerializer):
+class VehiclesResponseSerializer(DynamicFieldsModelSerializer):
     client = ClientsSerializer()
 
     class Meta:
@@ -55,14 +63,17 @@ class VehiclesResponseSerializer(serializers.ModelSerializer):
         depth = 1
 
 
-class ServiceSerializer(serializers.ModelSerializer):
+class ServiceSerializer(DynamicFieldsModelSerializer):
 
     class Meta:
         model = Service
         fields = '__all__'
+        expandable_fields = {
+            'vehicle': VehiclesSerializer,
+        }
 
 
-class ServiceResponseSerializer(serializers.ModelSerializer):
+class ServiceResponseSerializer(DynamicFieldsModelSerializer):
     vehicle = VehiclesResponseSerializer()
 
     class Meta:
@@ -1,8 +1,9 @@
 import factory
 
+from dateutil import tz
 from factory.django import DjangoModelFactory
 
-from services.models import Brand
+from services.models import Brand, Client, Service, Type, Vehicle
 
 
 class BrandFactory(DjangoModelFactory):
@@ -10,3 +11,42 @@ class BrandFactory(DjangoModelFactory):
         model = Brand
 
     name = factory.Faker('company')
+
+
+class VehicleTypeFactory(DjangoModelFactory):
+    class Meta:
+        model = Type
+
+    name = factory.Faker('word')
+
+
+class ClientFactory(DjangoModelFactory):
+    class Meta:
+        model = Client
+
+    first_name = factory.Faker('first_name')
+    last_name = factory.Faker('last_name')
+    email = factory.Faker('email')
+
+
+class VehicleFactory(DjangoModelFactory):
+    class Meta:
+        model = Vehicle
+
+    type = factory.SubFactory(VehicleTypeFactory)
+    brand = factory.SubFactory(BrandFactory)
+    model = factory.Faker('word')
+    year = factory.Faker('random_int', min=1980, max=2022)
+    color = factory.Faker('color_name')
+    license_plate = factory.Faker('bothify', text='???-####')
+    kilometers = factory.Faker('random_int', min=0, max=100000)
+    client = factory.SubFactory(ClientFactory)
+
+
+class ServiceFactory(DjangoModelFactory):
+    class Meta:
+        model = Service
+
+    vehicle = factory.SubFactory(VehicleFactory)
+    start_at = factory.Faker('date_time_this_year', tzinfo=tz.gettz('UTC'))
+    kilometers = factory.Faker('random_int', min=0, max=100000)
@@ -0,0 +1,91 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+
+from users.tests.factories import UserFactory
+from services.tests.factories import ServiceFactory
+
+
+class AdminQueriesTests(TestCase):
+    """Tests the admin pages run the same queries whatever the number of rows."""
+
+    pages = [
+        ('client', ('changelist', 'add', 'change')),
+        ('type', ('changelist', 'add', 'change')),
+        ('brand', ('changelist', 'add', 'change')),
+        ('vehicle', ('changelist', 'add', 'change')),
+        ('service', ('changelist', 'add', 'change')),
+    ]
+
+    def setUp(self):
+        cache.clear()
+        self.user = UserFactory(is_staff=True, is_superuser=True)
+        self.client.force_login(self.user)
+        self.service = ServiceFactory(vehicle__client__created_by=self.user)
+
+    def get_urls(self):
+        objects = {
+            'client': self.service.vehicle.client,
+            'type': self.service.vehicle.type,
+            'brand': self.service.vehicle.brand,
+            'vehicle': self.service.vehicle,
+            'service': self.service,
+        }
+        for model_name, views in self.pages:
+            for view in views:
+                args = (objects[model_name].pk,) if view == 'change' else ()
+                yield reverse(f'admin:services_{model_name}_{view}', args=args)
+        yield reverse('admin:autocomplete') + '?app_label=services&model_name=service' \
+                                              '&field_name=vehicle&term=a'
+
+    def get_queries(self, url):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, url)
+        return [query['sql'] for query in queries]
+
+    def test_queries_independent_of_rows(self):
+        urls = list(self.get_urls())
+        for url in urls:
+            self.get_queries(url)  # Fill the per process caches, e.g. of content types.
+        queries = {url: self.get_queries(url) for url in urls}
+
+        for _ in range(5):
+            ServiceFactory(vehicle__client=self.service.vehicle.client,
+                           vehicle__client__created_by=self.user)
+            ServiceFactory(vehicle__client__created_by=UserFactory())
+
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertEqual(len(self.get_queries(url)), len(queries[url]))
+
+    def test_forms_dont_load_relations(self):
+        for model_name in ('client', 'vehicle', 'service'):
+            url = reverse(f'admin:services_{model_name}_add')
+            content = self.client.get(url).content.decode()
+            self.assertNotIn('<option value="1"', content, model_name)
+            self.assertIn('admin-autocomplete', content, model_name)
+
+    @mock.patch('garage.pagination.estimate_count', return_value=100000)
+    def test_changelist_estimated_count(self, estimate_count):
+        queries = self.get_queries(reverse('admin:services_service_changelist'))
+
+        self.assertFalse([sql for sql in queries if 'COUNT(' in sql])
+        estimate_count.assert_called_once()
+
+    def test_changelist_filtered_count_cached(self):
+        url = reverse('admin:services_service_changelist') + '?is_paid__exact=0'
+        response = self.client.get(url)
+        self.assertEqual(response.context['cl'].result_count, 1)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertFalse([query for query in queries if 'COUNT(' in query['sql']])
+        self.assertEqual(response.context['cl'].result_count, 1)
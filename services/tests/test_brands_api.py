@@ -6,15 +6,17 @@ from rest_framework import status
 from rest_framework.test import APITestCase, APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from garage.testing import QueryBudgetTestMixin
 from users.tests.factories import UserFactory
 from services.tests.factories import BrandFactory
 from services.models import Brand
 from services.serializers import BrandSerializer
+from services.views.brands import BrandsView
 
 fake = Faker()
 
 
-class BrandsPrivateTests(APITestCase):
+class BrandsPrivateTests(QueryBudgetTestMixin, APITestCase):
     """Tests brands endpoint logged as normal user."""
 
     def setUp(self):
@@ -28,7 +30,8 @@ class BrandsPrivateTests(APITestCase):
 
     def test_list_brands(self):
         url = reverse('brand-list')
-        response = self.client.get(url)
+        with self.assertQueryBudget(BrandsView, 'list'):
+            response = self.client.get(url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data.get('count'), Brand.objects.count())
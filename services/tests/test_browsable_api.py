@@ -0,0 +1,61 @@
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.html import escape
+
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from garage.browsable import get_list_url
+from services.models import Vehicle
+from users.tests.factories import UserFactory
+from services.tests.factories import ServiceFactory, VehicleFactory
+
+
+class LightBrowsableApiTests(APITestCase):
+    """Tests the forms of the browsable API don't load the related objects."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = UserFactory()
+        self.service = ServiceFactory(vehicle__client__created_by=self.user)
+        self.client = APIClient()
+        refresh_token = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh_token.access_token}')
+
+    def get_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, HTTP_ACCEPT='text/html')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, [query['sql'] for query in queries]
+
+    def test_list_url(self):
+        self.assertEqual(get_list_url(Vehicle), reverse('vehicle-list'))
+        self.assertIsNone(get_list_url(Group))
+
+    def test_relations_not_loaded(self):
+        response, queries = self.get_queries(reverse('service-list'))
+        vehicles = [VehicleFactory(client__created_by=self.user) for _ in range(3)]
+        cache.clear()
+        response, more_queries = self.get_queries(reverse('service-list'))
+
+        self.assertEqual(len(queries), len(more_queries))
+        content = response.content.decode()
+        for vehicle in [self.service.vehicle, *vehicles]:
+            self.assertNotIn(escape(str(vehicle)), content)
+        # The vehicle input of the create form and of the filters form.
+        self.assertEqual(content.count(f'data-typeahead="{reverse("vehicle-list")}"'), 2)
+
+    def test_detail_form(self):
+        url = reverse('vehicle-detail', kwargs={'pk': self.service.vehicle_id})
+        response, _ = self.get_queries(url)
+
+        content = response.content.decode()
+        for name in ('client', 'type', 'brand'):
+            self.assertIn(f'data-typeahead="{reverse(f"{name}-list")}"', content)
+        # The update form is bound to the vehicle.
+        client_id = self.service.vehicle.client_id
+        self.assertRegex(content, rf'<input name="client" [^>]* value="{client_id}"')
@@ -0,0 +1,116 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from users.tests.factories import UserFactory
+from services.models import Service, Vehicle
+from services.tests.factories import (
+    BrandFactory, ClientFactory, ServiceFactory, VehicleFactory, VehicleTypeFactory
+)
+
+
+class BulkTests(APITestCase):
+    """Tests the bulk create and update endpoints."""
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.brands = BrandFactory.create_batch(2)
+        self.type = VehicleTypeFactory()
+        self.owner = ClientFactory(created_by=self.user)
+        self.client = APIClient()
+        refresh_token = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh_token.access_token}')
+
+    def get_vehicle_data(self, index, **kwargs):
+        return {
+            'type': self.type.id,
+            'brand': self.brands[index % 2].id,
+            'client': self.owner.id,
+            'model': f'Model {index}',
+            'year': 2020,
+            'color': 'Red',
+            'license_plate': f'AB{index:04}',
+            'kilometers': 1000,
+            **kwargs,
+        }
+
+    def test_bulk_create_vehicles(self):
+        data = [self.get_vehicle_data(index) for index in range(10)]
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(reverse('vehicle-bulk'), data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data['results']), 10)
+        self.assertEqual(response.data['errors'], [])
+        self.assertEqual(Vehicle.objects.filter(client=self.owner).count(), 10)
+        self.assertEqual(response.data['results'][1]['brand'], self.brands[1].id)
+        self.assertIsNotNone(response.data['results'][0]['id'])
+        for table in ('services_brand', 'services_type', 'services_client'):
+            selects = [query for query in context.captured_queries
+                       if query['sql'].startswith('SELECT') and f'FROM "{table}"' in query['sql']]
+            self.assertEqual(len(selects), 1, table)
+
+    def test_bulk_create_atomic_errors(self):
+        data = [
+            self.get_vehicle_data(0),
+            self.get_vehicle_data(1, brand=0),
+            self.get_vehicle_data(2, year='last'),
+        ]
+        response = self.client.post(reverse('vehicle-bulk'), data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            [(error['attr'], error['code']) for error in response.data['errors']],
+            [('1.brand', 'does_not_exist'), ('2.year', 'invalid')]
+        )
+        self.assertFalse(Vehicle.objects.exists())
+
+    def test_bulk_create_best_effort(self):
+        data = [self.get_vehicle_data(0), self.get_vehicle_data(1, client='x')]
+        response = self.client.post(f"{reverse('vehicle-bulk')}?atomic=false", data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['errors'][0]['attr'], '1.client')
+        self.assertEqual(response.data['errors'][0]['code'], 'incorrect_type')
+        self.assertEqual(Vehicle.objects.get().model, 'Model 0')
+
+    def test_bulk_update_services(self):
+        services = ServiceFactory.create_batch(3, is_paid=False)
+        vehicle = VehicleFactory()
+        data = [
+            {'id': services[0].id, 'is_paid': True},
+            {'id': services[1].id, 'vehicle': vehicle.id},
+        ]
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.patch(reverse('service-bulk'), data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        updates = [query for query in context.captured_queries
+                   if query['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        services = Service.objects.in_bulk([service.id for service in services])
+        self.assertTrue(services[data[0]['id']].is_paid)
+        self.assertEqual(services[data[1]['id']].vehicle, vehicle)
+        self.assertFalse(services[data[1]['id']].is_paid)
+
+    def test_bulk_update_unknown_id(self):
+        service = ServiceFactory()
+        data = [{'id': service.id, 'is_paid': True}, {'id': 0}, {'is_paid': True}]
+        response = self.client.patch(f"{reverse('service-bulk')}?atomic=false", data,
+                                     format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual([error['attr'] for error in response.data['errors']], ['1.id', '2.id'])
+        service.refresh_from_db()
+        self.assertTrue(service.is_paid)
+
+    def test_bulk_requires_list(self):
+        response = self.client.post(reverse('vehicle-bulk'), self.get_vehicle_data(0),
+                                    format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,97 @@
+import json
+from unittest import mock
+
+from django.core.cache import cache
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from garage.renderers import flatten
+from users.tests.factories import UserFactory
+from services.tests.factories import ServiceFactory
+from services.views.services import ServicesView
+
+
+class ColumnarApiTests(APITestCase):
+    """Tests the columnar format of the list and export endpoints."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = UserFactory()
+        for _ in range(3):
+            ServiceFactory(vehicle__client__created_by=self.user)
+        self.client = APIClient()
+        refresh_token = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh_token.access_token}')
+
+    def assertSameValues(self, columnar, rows):
+        rows = [flatten(row, encode_lists=False) for row in rows]
+        self.assertEqual(columnar['columns'], list(rows[0]))
+        self.assertEqual(columnar['data'], {
+            column: [row[column] for row in rows] for column in columnar['columns']
+        })
+
+    def test_list(self):
+        url = reverse('service-list')
+        response = self.client.get(url, {'format': 'columnar', 'size': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/vnd.garage.columnar+json')
+
+        data = json.loads(response.content)
+        self.assertEqual(data['count'], 3)
+        self.assertIn('format=columnar', data['next'])
+        self.assertIn('vehicle.client.created_by.full_name', data['results']['columns'])
+        self.assertSameValues(data['results'], self.client.get(url, {'size': 2}).json()['results'])
+
+    def test_list_keyset_pagination(self):
+        url = reverse('vehicle-list')
+        params = {'pagination': 'cursor', 'ordering': '-year'}
+        response = self.client.get(url, {**params, 'format': 'columnar'})
+
+        data = json.loads(response.content)
+        self.assertSameValues(data['results'], self.client.get(url, params).json()['results'])
+
+    def test_list_null_relation(self):
+        ServiceFactory(vehicle__client__created_by=None)
+
+        response = self.client.get(reverse('service-list'), {'format': 'columnar'})
+        data = json.loads(response.content)['results']['data']
+        self.assertEqual(data['vehicle.client.created_by.full_name'].count(None), 1)
+
+    def test_list_not_compiled(self):
+        url = reverse('service-list')
+        params = {'expand': 'vehicle', 'included': 'true'}
+        response = self.client.get(url, {**params, 'format': 'columnar'})
+
+        data = json.loads(response.content)
+        self.assertSameValues(data['results'], self.client.get(url, params).json()['results'])
+        self.assertIn('included', data)
+
+    def test_list_not_compiled_null_relation(self):
+        ServiceFactory(vehicle__client__created_by=None)
+        url = reverse('service-list')
+        params = {'format': 'columnar', 'ordering': '-id'}
+        compiled = json.loads(self.client.get(url, params).content)['results']
+        with mock.patch.object(ServicesView, 'compile_read_serializers', False):
+            response = self.client.get(url, params)
+
+        results = json.loads(response.content)['results']
+        self.assertEqual(results['columns'], compiled['columns'])
+        self.assertEqual(results['data']['vehicle.client.created_by.id'], [None, *[mock.ANY] * 3])
+        self.assertNotIn('vehicle.client.created_by', results['columns'])
+
+    def test_export(self):
+        with mock.patch.object(ServicesView, 'export_chunk_size', 2):
+            response = self.client.get(reverse('service-export'), {'format': 'columnar'})
+            content = b''.join(response.streaming_content)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        chunks = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual([len(chunk['data']['id']) for chunk in chunks], [2, 1])
+
+    def test_retrieve_not_columnar(self):
+        url = reverse('service-detail', kwargs={'pk': 1})
+        response = self.client.get(url, {'format': 'columnar'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,124 @@
+import datetime
+import gc
+import weakref
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from garage.compiled import CompiledReadMixin, compile_serializer
+from garage.serializers import IncludedRelatedField
+from users.tests.factories import UserFactory
+from services.models import Service
+from services.serializers import ServiceResponseSerializer, VehiclesSerializer
+from services.tests.factories import ClientFactory, ServiceFactory, VehicleFactory
+
+
+class CompiledSerializerTests(TestCase):
+    """Tests the serializers compiled to row functions."""
+
+    def test_compiled_rows_equal_serializer_data(self):
+        ServiceFactory(cost=Decimal('12.5'), paid_date=datetime.date(2022, 5, 1))
+        ServiceFactory(vehicle__client__created_by=UserFactory())
+        serializer = ServiceResponseSerializer()
+        compiled = compile_serializer(serializer)
+
+        self.assertIs(compile_serializer(ServiceResponseSerializer()), compiled)
+        self.assertIn('vehicle__client__created_by__first_name', compiled.paths)
+        rows = compiled.get_queryset(Service.objects.order_by('pk'))
+        self.assertEqual(
+            compiled.render_many(rows),
+            ServiceResponseSerializer(Service.objects.order_by('pk'), many=True).data
+        )
+
+    def test_attribute_columns(self):
+        compiled = compile_serializer(ServiceResponseSerializer())
+
+        self.assertIn('vehicle__client__created_by__last_name', compiled.paths)
+        self.assertNotIn('vehicle__client__created_by__password', compiled.paths)
+
+    def test_context_not_kept(self):
+        class Request:
+            method = 'GET'
+            query_params = {'fields': 'id,vehicle'}
+
+        request = Request()
+        compile_serializer(ServiceResponseSerializer(context={'request': request}))
+        request = weakref.ref(request)
+        gc.collect()
+
+        self.assertIsNone(request())
+
+    def test_not_compilable(self):
+        serializer = VehiclesSerializer()
+        serializer.fields['client'] = IncludedRelatedField(VehiclesSerializer(), 'client')
+
+        self.assertIsNone(compile_serializer(serializer))
+
+
+class CompiledReadApiTests(APITestCase):
+    """Tests the compiled list and retrieve responses are the same as the serializers'."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = UserFactory()
+        start_at = timezone.now().replace(microsecond=123456)
+        vehicle = VehicleFactory(client=ClientFactory(created_by=self.user, company=None))
+        for days in [0, 0, 1, 2]:
+            ServiceFactory(
+                vehicle=vehicle,
+                start_at=start_at - datetime.timedelta(days=days),
+                finish_at=None if days % 2 else start_at,
+                cost=Decimal(days) / 3 if days else None,
+                is_paid=bool(days),
+            )
+        ServiceFactory(vehicle__client__created_by=None)
+        self.service = Service.objects.first()
+        self.client = APIClient()
+        refresh_token = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh_token.access_token}')
+
+    def assertSameContent(self, url, params=None):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        with mock.patch.object(CompiledReadMixin, 'compile_read_serializers', False):
+            expected = self.client.get(url, params)
+        self.assertEqual(response.content, expected.content)
+        return response
+
+    def test_list(self):
+        for name in ['service', 'vehicle', 'client']:
+            with self.subTest(name=name):
+                self.assertSameContent(reverse(f'{name}-list'))
+
+    def test_list_sparse_and_expanded(self):
+        url = reverse('service-list')
+        self.assertSameContent(url, {'fields': 'id,cost,vehicle.client.created_by'})
+        self.assertSameContent(url, {'omit': 'vehicle.client', 'ordering': '-start_at'})
+        self.assertSameContent(url, {'expand': 'vehicle.brand'})
+        self.assertSameContent(url, {'expand': 'vehicle', 'included': 'true'})
+
+    def test_list_keyset_pagination(self):
+        url = reverse('service-list')
+        response = self.assertSameContent(
+            url, {'pagination': 'cursor', 'size': 2, 'ordering': 'finish_at'}
+        )
+        while response.data['next']:
+            response = self.assertSameContent(response.data['next'])
+
+    def test_retrieve(self):
+        url = reverse('service-detail', kwargs={'pk': self.service.pk})
+        self.assertSameContent(url)
+        # Only the row: the user of the token is cached.
+        with self.assertNumQueries(1):
+            self.client.get(url)
+
+        response = self.client.get(reverse('service-detail', kwargs={'pk': 0}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
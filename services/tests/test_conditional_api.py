@@ -0,0 +1,89 @@
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils.http import http_date
+
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from users.tests.factories import UserFactory
+from garage.versions import get_versions
+from services.models import Service
+from services.tests.factories import ServiceFactory
+
+
+class ConditionalGetTests(APITestCase):
+    """Tests the ETag and Last-Modified headers of the services endpoints."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = UserFactory()
+        self.service = ServiceFactory(vehicle__client__created_by=self.user, is_paid=False)
+        self.client = APIClient()
+        refresh_token = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh_token.access_token}')
+        self.url = f"{reverse('service-list')}?is_paid=false"
+
+    def test_list_not_modified(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('no-cache', response['Cache-Control'])
+
+        # Not even the user of the token, which is cached.
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertTrue(response['ETag'])
+
+    def test_list_modified_by_related_model(self):
+        etag = self.client.get(self.url)['ETag']
+
+        self.service.vehicle.client.last_name = 'Quixote'
+        self.service.vehicle.client.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_list_modified_by_bulk_update(self):
+        etag = self.client.get(self.url)['ETag']
+
+        data = [{'id': self.service.id, 'is_paid': True}]
+        self.client.patch(reverse('service-bulk'), data, format='json')
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [])
+
+    def test_etag_depends_on_query(self):
+        etag = self.client.get(self.url)['ETag']
+
+        response = self.client.get(reverse('service-list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_retrieve_if_modified_since(self):
+        url = reverse('service-detail', kwargs={'pk': self.service.pk})
+        with mock.patch('garage.conditional.time.time', return_value=time.time() + 1):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+            response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Service.objects.get(pk=self.service.pk).delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_no_last_modified_in_the_second_of_a_change(self):
+        url = reverse('service-detail', kwargs={'pk': self.service.pk})
+        changed_at = get_versions(Service)[Service] / 1000
+        with mock.patch('garage.conditional.time.time', return_value=changed_at):
+            response = self.client.get(url)
+            self.assertNotIn('Last-Modified', response)
+
+            # A later write in the same second would have the same Last-Modified.
+            response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=http_date(changed_at))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
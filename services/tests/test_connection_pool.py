@@ -0,0 +1,129 @@
+import os
+import sqlite3
+import tempfile
+import threading
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connections
+from django.db.backends.sqlite3 import base
+from django.test import SimpleTestCase
+
+from garage.db.backends.mixins import HealthCheckMixin, PooledConnectionMixin
+from garage.db.pool import ConnectionPool, PoolTimeout, close_pools, get_pool_stats
+
+
+def connect():
+    return sqlite3.connect(':memory:', check_same_thread=False)
+
+
+class DatabaseWrapper(HealthCheckMixin, PooledConnectionMixin, base.DatabaseWrapper):
+    pass
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    """Tests the connections are reused, bounded and checked."""
+
+    def test_reuse(self):
+        pool = ConnectionPool(max_size=2, timeout=1)
+        connection = pool.acquire(connect)
+        pool.release(connection)
+
+        self.assertIs(pool.acquire(connect), connection)
+        stats = pool.stats()
+        self.assertEqual((stats['opened'], stats['acquired'], stats['in_use']), (1, 2, 1))
+
+    def test_timeout(self):
+        pool = ConnectionPool(max_size=1, timeout=0.01)
+        pool.acquire(connect)
+
+        with self.assertRaises(PoolTimeout):
+            pool.acquire(connect)
+        self.assertEqual(pool.stats()['timeouts'], 1)
+
+    def test_wait_for_release(self):
+        pool = ConnectionPool(max_size=1, timeout=5)
+        connection = pool.acquire(connect)
+        timer = threading.Timer(0.05, pool.release, args=(connection,))
+        timer.start()
+        self.addCleanup(timer.join)
+
+        self.assertIs(pool.acquire(connect), connection)
+        stats = pool.stats()
+        self.assertEqual((stats['opened'], stats['waits']), (1, 1))
+        self.assertGreater(stats['max_wait_ms'], 0)
+
+    def test_failed_check(self):
+        pool = ConnectionPool(max_size=1, timeout=1, check=lambda connection: False)
+        connection = pool.acquire(connect)
+        pool.release(connection)
+
+        self.assertIsNot(pool.acquire(connect), connection)
+        stats = pool.stats()
+        self.assertEqual((stats['opened'], stats['discarded'], stats['size']), (2, 1, 1))
+
+
+class PooledBackendTests(SimpleTestCase):
+    """Tests the backend gives its connection back to the pool at the end of each request."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.addCleanup(close_pools)
+        self.settings_dict = {
+            **connections['default'].settings_dict,
+            'NAME': os.path.join(directory.name, 'pool.sqlite3'),
+            'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': True, 'POOL_SIZE': 2, 'POOL_TIMEOUT': 1,
+        }
+
+    def get_wrapper(self, **settings):
+        wrapper = DatabaseWrapper({**self.settings_dict, **settings}, alias='pooled')
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    def query(self, wrapper):
+        with wrapper.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        return wrapper.connection
+
+    def test_released_at_request_end(self):
+        wrapper = self.get_wrapper(CONN_MAX_AGE=60)
+        connection = self.query(wrapper)
+        wrapper.close_if_unusable_or_obsolete()
+
+        self.assertIsNone(wrapper.connection)
+        self.assertEqual(get_pool_stats()['pooled']['idle'], 1)
+        self.assertIs(self.query(self.get_wrapper()), connection)
+
+    def test_discard_changed_autocommit(self):
+        wrapper = self.get_wrapper()
+        connection = self.query(wrapper)
+        wrapper.set_autocommit(False)
+        wrapper.close_if_unusable_or_obsolete()
+
+        self.assertEqual(get_pool_stats()['pooled']['discarded'], 1)
+        self.assertIsNot(self.query(self.get_wrapper()), connection)
+
+    def test_health_check(self):
+        wrapper = self.get_wrapper(CONN_MAX_AGE=None, POOL_SIZE=0)
+        connection = self.query(wrapper)
+        wrapper.close_if_unusable_or_obsolete()
+        self.assertIs(self.query(wrapper), connection)
+
+        wrapper.close_if_unusable_or_obsolete()
+        with mock.patch.object(wrapper, 'is_usable', return_value=False):
+            self.assertIsNot(self.query(wrapper), connection)
+            # Checked once per request.
+            self.query(wrapper)
+            wrapper.is_usable.assert_called_once()
+
+
+class BenchmarkConnectionsTests(SimpleTestCase):
+    databases = {'default'}
+
+    def test_command(self):
+        out = StringIO()
+        call_command('benchmark_connections', requests=4, concurrency=2, stdout=out)
+        self.assertIn('new connection', out.getvalue())
+        self.assertIn('persistent', out.getvalue())
@@ -0,0 +1,79 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from users.tests.factories import UserFactory
+from services.tests.factories import ServiceFactory, VehicleFactory
+from services.serializers import ClientsSerializer
+
+
+class ExpandTests(APITestCase):
+    """Tests the expand and included query parameters."""
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.vehicle = VehicleFactory(client__created_by=self.user)
+        self.services = ServiceFactory.create_batch(3, vehicle=self.vehicle)
+        self.other_service = ServiceFactory()
+        self.client = APIClient()
+        refresh_token = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh_token.access_token}')
+
+    def get_with_queries(self, url, params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, context.captured_queries[-1]['sql']
+
+    def test_get_service_without_expand_is_nested(self):
+        url = reverse('service-detail', kwargs={'pk': self.services[0].pk})
+        response, _ = self.get_with_queries(url, {})
+
+        self.assertEqual(response.data['vehicle']['client']['id'], self.vehicle.client.id)
+
+    def test_get_service_with_empty_expand(self):
+        url = reverse('service-detail', kwargs={'pk': self.services[0].pk})
+        response, sql = self.get_with_queries(url, {'expand': ''})
+
+        self.assertEqual(response.data['vehicle'], self.vehicle.id)
+        self.assertNotIn('services_vehicle', sql)
+
+    def test_list_services_with_expand(self):
+        params = {'expand': 'vehicle.client', 'ordering': 'id'}
+        response, sql = self.get_with_queries(reverse('service-list'), params)
+
+        vehicle = response.data['results'][0]['vehicle']
+        self.assertEqual(vehicle['id'], self.vehicle.id)
+        self.assertEqual(vehicle['brand'], self.vehicle.brand.id)
+        self.assertEqual(vehicle['client'], ClientsSerializer(self.vehicle.client).data)
+        self.assertIn('services_client', sql)
+        self.assertNotIn('services_brand', sql)
+
+    def test_list_services_with_included(self):
+        params = {'expand': 'vehicle,vehicle.brand', 'included': 'true', 'ordering': 'id'}
+        response, _ = self.get_with_queries(reverse('service-list'), params)
+
+        results = response.data['results']
+        self.assertEqual([service['vehicle'] for service in results[:3]], [self.vehicle.id] * 3)
+        included = response.data['included']
+        self.assertEqual(
+            [vehicle['id'] for vehicle in included['vehicle']],
+            [self.vehicle.id, self.other_service.vehicle.id]
+        )
+        self.assertEqual(included['vehicle'][0]['brand'], self.vehicle.brand.id)
+        self.assertEqual(
+            [brand['name'] for brand in included['vehicle.brand']],
+            [self.vehicle.brand.name, self.other_service.vehicle.brand.name]
+        )
+
+    def test_create_service_ignores_expand(self):
+        url = f"{reverse('service-list')}?expand=vehicle"
+        data = {'vehicle': self.vehicle.id, 'start_at': '2022-01-01T10:00:00Z', 'kilometers': 10}
+        response = self.client.post(url, data)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['vehicle'], self.vehicle.id)
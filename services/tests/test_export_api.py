@@ -0,0 +1,114 @@
+import csv
+import io
+import json
+from unittest import mock
+
+from django.db import connection
+from django.db.models import QuerySet
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from users.tests.factories import UserFactory
+from services.models import Client, Service
+from services.tests.factories import ClientFactory, ServiceFactory, VehicleFactory
+from services.views.services import ServicesView
+
+
+class ExportTests(APITestCase):
+    """Tests the streamed NDJSON and CSV exports."""
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.vehicle = VehicleFactory(client__created_by=self.user)
+        self.services = ServiceFactory.create_batch(3, vehicle=self.vehicle, is_paid=True)
+        self.unpaid_service = ServiceFactory(vehicle=self.vehicle, is_paid=False)
+        self.client = APIClient()
+        refresh_token = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh_token.access_token}')
+
+    def export(self, url, params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_export_services_ndjson(self):
+        params = {'is_paid': True, 'ordering': '-id'}
+        content = self.export(reverse('service-export'), params)
+
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual([row['id'] for row in rows], [s.id for s in reversed(self.services)])
+        self.assertEqual(rows[0]['vehicle']['id'], self.vehicle.id)
+
+    def test_export_rows_equal_list_rows(self):
+        for name in ['service', 'vehicle']:
+            with self.subTest(name=name):
+                content = self.export(reverse(f'{name}-export'), {'ordering': 'id'})
+                response = self.client.get(reverse(f'{name}-list'), {'ordering': 'id'})
+
+                rows = [json.loads(line) for line in content.splitlines()]
+                self.assertEqual(rows, response.json()['results'])
+
+    def test_export_services_csv(self):
+        response = self.client.get(reverse('service-export'), {'format': 'csv', 'ordering': 'id'})
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="services.csv"')
+
+        content = b''.join(response.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[-1]['id'], str(self.unpaid_service.id))
+        self.assertEqual(rows[-1]['is_paid'], 'False')
+
+    def test_export_in_chunks(self):
+        queryset = Service.objects.prefetch_related('vehicle__client__created_by__clients')
+        with mock.patch.object(ServicesView, 'export_chunk_size', 2), \
+                mock.patch.object(ServicesView, 'queryset', queryset), \
+                mock.patch.object(QuerySet, 'iterator', autospec=True,
+                                  side_effect=QuerySet.iterator) as iterator, \
+                CaptureQueriesContext(connection) as queries:
+            content = self.export(reverse('service-export'), {})
+
+        self.assertEqual(len(content.splitlines()), 4)
+        iterator.assert_called_once_with(mock.ANY, chunk_size=2)
+        tables = [query['sql'].split(' FROM ')[1].split()[0].strip('"') for query in queries
+                  if query['sql'].startswith('SELECT')]
+        self.assertEqual(tables.count(Service._meta.db_table), 1)
+        # The prefetch runs for each chunk of 2 rows.
+        self.assertEqual(tables.count(Client._meta.db_table), 2)
+
+    def test_export_clients_csv_with_search(self):
+        ClientFactory(last_name='Quixote', created_by=self.user)
+        content = self.export(reverse('client-export'), {'format': 'csv', 'search': 'quixote'})
+
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['last_name'], 'Quixote')
+        self.assertEqual(rows[0]['created_by.full_name'], self.user.full_name)
+
+    def test_export_clients_csv_null_relation_first(self):
+        client = ClientFactory(last_name='Quixote', created_by=None)
+        ClientFactory(last_name='Quixote', created_by=self.user)
+        params = {'format': 'csv', 'search': 'quixote', 'ordering': 'id'}
+        content = self.export(reverse('client-export'), params)
+
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(rows[0]['id'], str(client.id))
+        self.assertEqual(rows[0]['created_by.id'], '')
+        self.assertEqual(rows[1]['created_by.id'], str(self.user.id))
+        self.assertEqual(rows[1]['created_by.full_name'], self.user.full_name)
+        self.assertNotIn('created_by', rows[0])
+
+    def test_export_vehicles_empty(self):
+        content = self.export(reverse('vehicle-export'), {'model': 'Unknown', 'format': 'csv'})
+
+        self.assertEqual(content, '')
+
+    def test_export_unknown_format(self):
+        response = self.client.get(reverse('service-export'), {'format': 'xml'})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
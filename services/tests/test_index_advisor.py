@@ -0,0 +1,43 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db.migrations.loader import MigrationLoader
+from django.test import TestCase
+
+from garage.management.commands.index_advisor import Command
+from services.tests.factories import ClientFactory
+
+
+class IndexAdvisorTests(TestCase):
+    """Tests the index_advisor command."""
+
+    def call_command(self, *args):
+        out = StringIO()
+        call_command('index_advisor', *args, no_color=True, stdout=out)
+        return out.getvalue()
+
+    def test_services_indexes_are_declared(self):
+        self.assertEqual(self.call_command('services'), 'No indexes to recommend.\n')
+
+    def test_recommend_users_indexes(self):
+        ClientFactory.create_batch(2)
+        output = self.call_command('users')
+
+        self.assertIn('users.User index (is_active, last_name, first_name)', output)
+        self.assertIn('- UserAdmin filter is_active', output)
+        self.assertIn('users.User trigram index (email)', output)
+        self.assertIn('UsersView ?\n  before:', output)
+        self.assertIn("index=models.Index(fields=['last_name', 'first_name'], name=", output)
+        self.assertIn('garage.db.operations.AddTrigramIndex(', output)
+        self.assertIn('Add to users.User.Meta.indexes:', output)
+        self.assertIn('garage.db.operations.CreateTrigramExtension(', output)
+        self.assertNotIn('Generated by Django', output)
+
+    def test_trigram_extension_created_once(self):
+        loader = MigrationLoader(None)
+        command = Command()
+
+        self.assertTrue(command.creates_trigram_extension(
+            loader, [('services', '0003_recommended_indexes')]))
+        users = loader.graph.leaf_nodes('users')
+        self.assertFalse(command.creates_trigram_extension(loader, users))
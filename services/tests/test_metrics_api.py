@@ -0,0 +1,119 @@
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from garage import metrics
+from users.tests.factories import UserFactory
+from services.tests.factories import ServiceFactory
+
+
+def get_samples(response):
+    """Map the samples of a Prometheus text response to their value."""
+    return {
+        line.rsplit(' ', 1)[0]: float(line.rsplit(' ', 1)[1])
+        for line in response.content.decode().splitlines() if not line.startswith('#')
+    }
+
+
+class MetricsTests(APITestCase):
+    """Tests the metrics of the viewset actions, from every process, exported for staff."""
+
+    labels = 'view="ServicesView",action="list",status="200"'
+
+    def setUp(self):
+        cache.clear()
+        metrics.registry.reset()
+        self.addCleanup(metrics.registry.reset)
+        self.user = UserFactory()
+        ServiceFactory.create_batch(2, vehicle__client__created_by=self.user)
+        self.client = self.get_client(self.user)
+        self.staff = self.get_client(UserFactory(is_staff=True))
+
+    def get_client(self, user):
+        client = APIClient()
+        refresh_token = RefreshToken.for_user(user)
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh_token.access_token}')
+        return client
+
+    def test_staff_only(self):
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        response = self.staff.get(reverse('metrics'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/plain; version=0.0.4; charset=utf-8')
+
+    def test_action_metrics(self):
+        for _ in range(3):
+            self.client.get(reverse('service-list'))
+        self.client.get(reverse('service-detail', kwargs={'pk': 0}))
+
+        samples = get_samples(self.staff.get(reverse('metrics')))
+        self.assertEqual(samples[f'garage_request_duration_seconds_count{{{self.labels}}}'], 3)
+        self.assertEqual(
+            samples[f'garage_request_duration_seconds_bucket{{{self.labels},le="+Inf"}}'], 3
+        )
+        self.assertGreater(samples[f'garage_response_size_bytes_sum{{{self.labels}}}'], 0)
+        self.assertGreater(samples[f'garage_request_queries_sum{{{self.labels}}}'], 0)
+        self.assertIn(f'garage_request_duration_quantile_seconds{{{self.labels},quantile="0.99"}}',
+                      samples)
+        retrieve = 'view="ServicesView",action="retrieve",status="404"'
+        self.assertEqual(samples[f'garage_request_duration_seconds_count{{{retrieve}}}'], 1)
+        self.assertIn('garage_cache_misses_total{cache="api"}', samples)
+
+    def test_processes_added_up(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        other = metrics.Registry()
+        other.observe('garage_request_duration_seconds', ('ServicesView', 'list', '200'), 0.2)
+        with open(os.path.join(directory.name, 'other.json'), 'w') as file:
+            json.dump(other.snapshot(), file)
+
+        with override_settings(METRICS_DIR=directory.name):
+            self.client.get(reverse('service-list'))
+            response = self.staff.get(reverse('metrics'))
+
+        samples = get_samples(response)
+        self.assertEqual(samples[f'garage_request_duration_seconds_count{{{self.labels}}}'], 2)
+        self.assertEqual(
+            samples[f'garage_request_duration_seconds_bucket{{{self.labels},le="0.1"}}'], 1
+        )
+        self.assertEqual(len([name for name in os.listdir(directory.name)
+                              if re.fullmatch(r'\d+-\w+\.json', name)]), 1)
+
+    def test_gauges_of_stopped_processes_left_out(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        stopped = subprocess.Popen([sys.executable, '-c', ''])
+        stopped.wait()
+        samples = [['garage_test_entries', 'gauge', {}, 3], ['garage_test_total', 'counter', {}, 2]]
+        for name, pid in (('stopped.json', stopped.pid), ('running.json', os.getpid())):
+            with open(os.path.join(directory.name, name), 'w') as file:
+                json.dump({**metrics.Registry().snapshot(), 'pid': pid, 'samples': samples}, file)
+
+        with override_settings(METRICS_DIR=directory.name):
+            samples = get_samples(self.staff.get(reverse('metrics')))
+
+        self.assertEqual(samples['garage_test_entries'], 3)
+        self.assertEqual(samples['garage_test_total'], 4)
+
+
+class QuantileTests(SimpleTestCase):
+
+    def test_interpolated_in_bucket(self):
+        buckets = (0.1, 0.5, 1)
+        self.assertAlmostEqual(metrics.get_quantile(0.5, buckets, [0, 4, 0, 0]), 0.3)
+        self.assertAlmostEqual(metrics.get_quantile(0.95, buckets, [9, 0, 1, 0]), 0.75)
+        self.assertEqual(metrics.get_quantile(0.99, buckets, [0, 0, 0, 2]), 1)
+        self.assertEqual(metrics.get_quantile(0.5, buckets, [0, 0, 0, 0]), 0)
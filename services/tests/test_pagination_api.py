@@ -0,0 +1,173 @@
+import datetime
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from users.tests.factories import UserFactory
+from services.tests.factories import ClientFactory, ServiceFactory, VehicleFactory
+from services.models import Client, Service
+
+
+class KeysetPaginationTests(APITestCase):
+    """Tests the cursor pagination mode of the list endpoints."""
+
+    def setUp(self):
+        self.user = UserFactory()
+        vehicle = VehicleFactory()
+        start_at = timezone.now().replace(microsecond=123456)
+        # Repeated values force the pagination to rely on the id tie-breaker.
+        for days in [0, 0, 1, 1, 1, 2, 3, 3]:
+            ServiceFactory(
+                vehicle=vehicle,
+                start_at=start_at - datetime.timedelta(days=days),
+                finish_at=None if days % 2 else start_at,
+            )
+        self.client = APIClient()
+        refresh_token = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh_token.access_token}')
+
+    def walk(self, url, params):
+        ids, pages = [], 0
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            ids += [service['id'] for service in response.data['results']]
+            pages += 1
+            if not response.data['next']:
+                return ids, pages, response
+            response = self.client.get(response.data['next'])
+
+    def test_list_services_with_cursor(self):
+        url = reverse('service-list')
+        ids, pages, _ = self.walk(url, {'pagination': 'cursor', 'size': 3})
+
+        self.assertEqual(pages, 3)
+        self.assertEqual(ids, list(Service.objects.order_by('pk').values_list('pk', flat=True)))
+
+    def test_list_services_with_cursor_and_ordering(self):
+        url = reverse('service-list')
+        for ordering in ['start_at', '-start_at', 'finish_at', '-finish_at', 'vehicle']:
+            ids, _, _ = self.walk(url, {'pagination': 'cursor', 'size': 3, 'ordering': ordering})
+
+            descending = ordering.startswith('-')
+            name = ordering.lstrip('-')
+            key = ordering
+            if Service._meta.get_field(name).null:
+                # NULLs sort after every value, first when descending.
+                key = F(name).desc(nulls_first=True) if descending else F(name).asc(nulls_last=True)
+            expected = Service.objects.order_by(key, '-pk' if descending else 'pk')
+            self.assertEqual(ids, list(expected.values_list('pk', flat=True)))
+
+    def test_list_services_with_cursor_previous_link(self):
+        url = reverse('service-list')
+        params = {'pagination': 'cursor', 'size': 3, 'ordering': '-start_at'}
+        first_page = self.client.get(url, params)
+        second_page = self.client.get(first_page.data['next'])
+        response = self.client.get(second_page.data['previous'])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], first_page.data['results'])
+        self.assertIsNone(response.data['previous'])
+
+    def test_list_services_with_cursor_runs_no_count(self):
+        url = reverse('service-list')
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, {'pagination': 'cursor'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        queries = ' '.join(query['sql'] for query in context.captured_queries)
+        self.assertNotIn('COUNT(', queries.upper())
+        self.assertNotIn('OFFSET', queries.upper())
+
+    def test_list_services_with_invalid_cursor_fail(self):
+        url = reverse('service-list')
+        response = self.client.get(url, {'cursor': 'invalid'})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data.get('errors')[0]['detail'], 'Invalid cursor')
+
+    def test_list_services_with_page_number(self):
+        url = reverse('service-list')
+        response = self.client.get(url, {'page': 2, 'size': 5})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], Service.objects.count())
+        self.assertEqual(len(response.data['results']), 3)
+
+
+class CountStrategyTests(APITestCase):
+    """Tests the count strategy of the page number pagination."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = UserFactory()
+        ClientFactory.create_batch(5, last_name='Zanzibar')
+        ClientFactory.create_batch(3, last_name='Quixote')
+        self.client = APIClient()
+        refresh_token = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh_token.access_token}')
+
+    def count_queries(self, params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse('client-list'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        counts = [q for q in context.captured_queries if 'COUNT(' in q['sql'].upper()]
+        return response, len(counts)
+
+    def test_list_clients_count_is_cached(self):
+        response, counts = self.count_queries({'search': 'Zanzibar'})
+        self.assertEqual(counts, 1)
+        self.assertEqual(response.data['count'], 5)
+        self.assertTrue(response.data['count_exact'])
+
+        response, counts = self.count_queries({'search': 'Zanzibar', 'page': 1, 'size': 2})
+        self.assertEqual(counts, 0)
+        self.assertEqual(response.data['count'], 5)
+
+        response, counts = self.count_queries({'search': 'Quixote'})
+        self.assertEqual(counts, 1)
+        self.assertEqual(response.data['count'], 3)
+
+    def test_list_clients_count_is_invalidated_on_write(self):
+        self.count_queries({'search': 'Zanzibar'})
+        ClientFactory(last_name='Zanzibar')
+        response, counts = self.count_queries({'search': 'Zanzibar'})
+
+        self.assertEqual(counts, 1)
+        self.assertEqual(response.data['count'], 6)
+
+        Client.objects.filter(last_name='Zanzibar').first().delete()
+        response, counts = self.count_queries({'search': 'Zanzibar'})
+
+        self.assertEqual(counts, 1)
+        self.assertEqual(response.data['count'], 5)
+
+    @mock.patch('garage.pagination.estimate_count', return_value=100000)
+    def test_list_clients_with_estimated_count(self, estimate_count):
+        response, counts = self.count_queries({'size': 5})
+
+        self.assertEqual(counts, 0)
+        self.assertEqual(response.data['count'], 100000)
+        self.assertFalse(response.data['count_exact'])
+        self.assertEqual(len(response.data['results']), 5)
+        self.assertIsNotNone(response.data['next'])
+
+        response, _ = self.count_queries({'size': 5, 'page': 2})
+        self.assertEqual(response.data['count'], Client.objects.count())
+        self.assertTrue(response.data['count_exact'])
+        self.assertIsNone(response.data['next'])
+
+        response, counts = self.count_queries({'size': 5, 'count': 'exact'})
+        self.assertEqual(counts, 1)
+        self.assertEqual(response.data['count'], Client.objects.count())
+        self.assertTrue(response.data['count_exact'])
@@ -0,0 +1,83 @@
+import os
+import pstats
+import re
+import tempfile
+
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from users.tests.factories import UserFactory
+from services.tests.factories import ServiceFactory
+
+
+def get_metrics(response):
+    """Map the metrics of the `Server-Timing` header to their parameters."""
+    metrics = {}
+    for metric in response['Server-Timing'].split(', '):
+        name, *params = metric.split(';')
+        metrics[name] = dict(param.split('=', 1) for param in params)
+    return metrics
+
+
+class ServerTimingTests(APITestCase):
+    """Tests the phases of the requests are reported, and profiled on demand."""
+
+    def setUp(self):
+        cache.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        settings = override_settings(PROFILING_DIR=self.directory, SERVER_TIMING=True)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        self.user = UserFactory()
+        ServiceFactory.create_batch(2, vehicle__client__created_by=self.user)
+        self.client = self.get_client(self.user)
+
+    def get_client(self, user):
+        client = APIClient()
+        refresh_token = RefreshToken.for_user(user)
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh_token.access_token}')
+        return client
+
+    def test_phases(self):
+        response = self.client.get(reverse('service-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        metrics = get_metrics(response)
+        self.assertLessEqual({'auth', 'permissions', 'db', 'view', 'render', 'total'},
+                             set(metrics))
+        self.assertRegex(metrics['db']['desc'], r'^"\d+ queries"$')
+        phases = sum(float(metrics[name]['dur']) for name in metrics if name != 'total')
+        self.assertLessEqual(phases, float(metrics['total']['dur']))
+        self.assertEqual(os.listdir(self.directory), [])
+
+    @override_settings(SERVER_TIMING=False)
+    def test_disabled(self):
+        response = self.client.get(reverse('service-list'))
+        self.assertNotIn('Server-Timing', response)
+
+    def test_profile_header_staff_only(self):
+        response = self.client.get(reverse('service-list'), HTTP_X_PROFILE='1')
+        self.assertNotIn('profile', get_metrics(response))
+        self.assertEqual(os.listdir(self.directory), [])
+
+        staff = self.get_client(UserFactory(is_staff=True))
+        response = staff.get(reverse('service-list'), HTTP_X_PROFILE='1')
+        name = re.fullmatch('"(.+)"', get_metrics(response)['profile']['desc']).group(1)
+        self.assertEqual(os.listdir(self.directory), [name])
+        stats = pstats.Stats(os.path.join(self.directory, name))
+        self.assertTrue(any(function == 'list' for _, _, function in stats.stats))
+
+    @override_settings(PROFILING_SAMPLE_RATE=1)
+    def test_sampled(self):
+        response = self.client.get(reverse('service-list'))
+        self.assertEqual(len(os.listdir(self.directory)), 1)
+        # The file name is for staff users only.
+        self.assertNotIn('profile', get_metrics(response))
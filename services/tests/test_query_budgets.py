@@ -0,0 +1,52 @@
+from unittest import mock
+
+from django.test import override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from garage.instrumentation import QueryBudgetExceeded
+from garage.testing import QueryBudgetTestMixin
+from users.tests.factories import UserFactory
+from services.tests.factories import ServiceFactory
+from services.views.services import ServicesView
+
+
+class QueryBudgetTests(QueryBudgetTestMixin, APITestCase):
+    """Tests the query budgets declared by the viewsets."""
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.service = ServiceFactory(vehicle__client__created_by=self.user)
+        self.client = APIClient()
+        refresh_token = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh_token.access_token}')
+
+    def test_services_within_budget(self):
+        ServiceFactory.create_batch(5)
+        with self.assertQueryBudget(ServicesView, 'list'):
+            response = self.client.get(reverse('service-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        url = reverse('service-detail', kwargs={'pk': self.service.pk})
+        with self.assertQueryBudget(ServicesView, 'retrieve'):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @mock.patch.object(ServicesView, 'query_budgets', {'list': 1})
+    def test_services_over_budget_fail_in_tests(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get(reverse('service-list'))
+
+    @override_settings(QUERY_BUDGET_RAISE=False)
+    @mock.patch.object(ServicesView, 'query_budgets', {'list': 1})
+    def test_services_over_budget_log_warning(self):
+        with self.assertLogs('garage.queries', 'WARNING') as logs:
+            response = self.client.get(reverse('service-list'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(logs.records[0].view, 'ServicesView.list')
+        self.assertEqual(logs.records[0].budget, 1)
+        self.assertGreater(logs.records[0].queries, 1)
@@ -0,0 +1,74 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from garage.querysets import get_query_plan, optimize_queryset
+from users.tests.factories import UserFactory
+from services.tests.factories import ServiceFactory
+from services.models import Client, Service
+from services.serializers import ClientsSerializer, ServiceResponseSerializer
+
+
+class QueryPlanTests(TestCase):
+    """Tests the query plan derived from the serializers."""
+
+    def test_service_response_plan(self):
+        plan = get_query_plan(ServiceResponseSerializer(), Service)
+
+        self.assertCountEqual(plan.select_related, [
+            'vehicle',
+            'vehicle__type',
+            'vehicle__brand',
+            'vehicle__client',
+            'vehicle__client__created_by',
+        ])
+        self.assertIn('vehicle__license_plate', plan.only)
+        self.assertIn('vehicle__client__created_by__first_name', plan.only)
+
+    def test_optimized_queryset_serializes_without_extra_queries(self):
+        user = UserFactory()
+        for _ in range(3):
+            ServiceFactory(vehicle__client__created_by=user)
+        queryset = optimize_queryset(Service.objects.all(), ServiceResponseSerializer())
+
+        with self.assertNumQueries(1):
+            data = ServiceResponseSerializer(queryset, many=True).data
+        self.assertEqual(data[0]['vehicle']['client']['created_by']['full_name'], user.full_name)
+
+        queryset = optimize_queryset(Client.objects.all(), ClientsSerializer())
+        with self.assertNumQueries(1):
+            ClientsSerializer(queryset, many=True).data
+
+
+class ListQueriesTests(APITestCase):
+    """Tests the list endpoints run a constant number of queries."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = UserFactory()
+        self.client = APIClient()
+        refresh_token = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh_token.access_token}')
+
+    def count_queries(self, url):
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context.captured_queries)
+
+    def test_list_queries_do_not_depend_on_page_size(self):
+        ServiceFactory(vehicle__client__created_by=self.user)
+        names = ['client', 'brand', 'type', 'vehicle', 'service']
+        urls = [reverse(f'{name}-list') for name in names]
+        queries = [self.count_queries(url) for url in urls]
+
+        for _ in range(5):
+            ServiceFactory(vehicle__client__created_by=UserFactory())
+        self.assertEqual([self.count_queries(url) for url in urls], queries)
@@ -0,0 +1,147 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from garage.cache import LRUCache, TwoTierCache, api_cache
+from garage.checks import check_shared_caches
+from garage.versions import bump_version
+from users.tests.factories import UserFactory
+from services.models import Brand
+from services.serializers import BrandSerializer
+from services.tests.factories import BrandFactory, VehicleTypeFactory
+
+
+class ReferenceDataCacheTests(APITestCase):
+    """Tests the cached brands and vehicle types endpoints."""
+
+    def setUp(self):
+        cache.clear()
+        api_cache.clear()
+        self.user = UserFactory()
+        self.brand = BrandFactory(name='Ford')
+        self.client = APIClient()
+        refresh_token = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh_token.access_token}')
+
+    def test_list_brands_from_cache(self):
+        url = reverse('brand-list')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # Not even the user of the token, which is cached.
+        with self.assertNumQueries(0):
+            cached_response = self.client.get(url)
+        self.assertEqual(cached_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(cached_response.content, response.content)
+        self.assertEqual(cached_response['Content-Type'], 'application/json')
+
+    def test_list_types_invalidated_on_save(self):
+        url = reverse('type-list')
+        self.client.get(url)
+        vehicle_type = VehicleTypeFactory(name='Truck')
+
+        response = self.client.get(url)
+        self.assertEqual(response.json()['results'], [{'id': vehicle_type.id, 'name': 'Truck'}])
+
+    def test_list_brands_invalidated_by_other_worker(self):
+        url = reverse('brand-list')
+        self.client.get(url)
+        Brand.objects.filter(pk=self.brand.pk).update(name='Fiat')
+        bump_version(Brand)
+
+        response = self.client.get(url)
+        self.assertEqual(response.json()['results'][0]['name'], 'Fiat')
+
+    def test_browsable_api_not_cached(self):
+        url = reverse('brand-list')
+        self.client.get(url, HTTP_ACCEPT='text/html')
+
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(url, HTTP_ACCEPT='text/html')
+        self.assertIn('FROM "services_brand"', context.captured_queries[-1]['sql'])
+
+    def test_validate_name_from_cache(self):
+        BrandSerializer(data={'name': 'Fiat'}).is_valid()
+
+        # Only the exact match of the unique constraint validator.
+        with self.assertNumQueries(1):
+            serializer = BrandSerializer(data={'name': 'FORD'})
+            self.assertFalse(serializer.is_valid())
+        self.assertEqual(serializer.errors['name'][0], 'brand with this name already exists.')
+        self.assertTrue(BrandSerializer(self.brand, data={'name': 'ford'}).is_valid())
+
+        BrandFactory(name='Fiat')
+        self.assertFalse(BrandSerializer(data={'name': 'fiat'}).is_valid())
+
+
+class TwoTierCacheTests(TestCase):
+    """Tests the two-tier API cache."""
+
+    def setUp(self):
+        cache.clear()
+        self.api_cache = TwoTierCache(max_entries=2)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        local = LRUCache(max_entries=2)
+        local.set('a', 1)
+        local.set('b', 2)
+        local.get('a')
+        self.assertEqual(local.set('c', 3), 1)
+
+        self.assertEqual(local.get('a'), 1)
+        self.assertIsNone(local.get('b'))
+        self.assertEqual(local.get('c'), 3)
+
+    def test_shared_tier_refills_local_tier(self):
+        self.api_cache.set('a', 1, tags=[Brand])
+        self.api_cache.set('b', 2)
+        self.api_cache.set('c', 3)
+
+        self.assertEqual(self.api_cache.get('a'), 1)
+        self.assertEqual(self.api_cache.get('c'), 3)
+        self.assertIsNone(self.api_cache.get('d'))
+        self.assertEqual(self.api_cache.stats(), {
+            'l1_hits': 1, 'l2_hits': 1, 'misses': 1, 'sets': 3, 'evictions': 2,
+            'invalidations': 0, 'l1_entries': 2,
+        })
+
+    def test_invalidate_tags(self):
+        self.api_cache.set('brands', 1, tags=[Brand])
+        self.api_cache.set('tagged', 2, tags=['colors'])
+        self.api_cache.invalidate('colors')
+
+        self.assertEqual(self.api_cache.get('brands'), 1)
+        self.assertIsNone(self.api_cache.get('tagged'))
+
+        BrandFactory()
+        self.assertIsNone(self.api_cache.get('brands'))
+        self.assertEqual(self.api_cache.get_or_set('brands', lambda: 3, tags=[Brand]), 3)
+        self.assertEqual(self.api_cache.get('brands'), 3)
+
+
+class SharedCachesCheckTests(SimpleTestCase):
+    """Tests the warning about caches local to each worker."""
+
+    locmem = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+    shared = {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+              'LOCATION': '/tmp/garage-cache-check'}
+
+    @override_settings(DEBUG=False, API_CACHE_ALIAS='api')
+    def test_local_caches(self):
+        with override_settings(CACHES={'default': self.locmem, 'api': self.shared}):
+            self.assertEqual([warning.obj for warning in check_shared_caches(None)], ['default'])
+        with override_settings(CACHES={'default': self.shared, 'api': self.locmem}):
+            self.assertEqual([warning.id for warning in check_shared_caches(None)],
+                             ['garage.W001'])
+        with override_settings(CACHES={'default': self.shared, 'api': self.shared}):
+            self.assertEqual(check_shared_caches(None), [])
+
+    @override_settings(DEBUG=True)
+    def test_debug(self):
+        self.assertEqual(check_shared_caches(None), [])
@@ -0,0 +1,97 @@
+import datetime
+import unittest
+from decimal import Decimal
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+from rest_framework import renderers, status
+from rest_framework.test import APITestCase, APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from garage import renderers as garage_renderers
+from users.tests.factories import UserFactory
+from services.tests.factories import ServiceFactory
+
+
+class JSONRendererTests(SimpleTestCase):
+    """Tests the JSON renderer encodes the same bytes as DRF's."""
+
+    data = {
+        'results': [{
+            'id': 1,
+            'cost': Decimal('10.50'),
+            'start_at': datetime.datetime(2022, 5, 1, 10, 0, 0, 123456,
+                                          tzinfo=datetime.timezone.utc),
+            'paid_date': datetime.date(2022, 5, 2),
+            'symptoms': 'Ruido en el motor al arrancar',
+            'is_paid': False,
+            'repairs': None,
+        }],
+        'included': {1: ['a', 'b']},
+        'floats': [0.1, 100.0, 1e16, 1e-5, 1e-7, Decimal('1E+16')],
+    }
+
+    def test_same_bytes_as_drf(self):
+        expected = renderers.JSONRenderer().render(self.data)
+
+        for accelerated in (True, False):
+            with self.subTest(accelerated=accelerated):
+                renderer = garage_renderers.JSONRenderer()
+                renderer.accelerated = accelerated
+                self.assertEqual(renderer.render(self.data), expected)
+
+    def test_non_finite_floats(self):
+        for accelerated in (True, False):
+            with self.subTest(accelerated=accelerated):
+                renderer = garage_renderers.JSONRenderer()
+                renderer.accelerated = accelerated
+                with self.assertRaisesMessage(ValueError, 'Out of range float values'):
+                    renderer.render({'results': [{'cost': float('nan')}]})
+
+    def test_indent(self):
+        media_type = 'application/json; indent=2'
+        self.assertEqual(
+            garage_renderers.JSONRenderer().render(self.data, media_type),
+            renderers.JSONRenderer().render(self.data, media_type),
+        )
+
+
+class RendererNegotiationTests(APITestCase):
+    """Tests the negotiation of the optional renderers."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = UserFactory()
+        ServiceFactory(vehicle__client__created_by=self.user)
+        self.client = APIClient()
+        refresh_token = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh_token.access_token}')
+
+    @unittest.skipUnless(garage_renderers.msgpack, 'msgpack is not installed')
+    def test_msgpack(self):
+        url = reverse('service-list')
+        response = self.client.get(url, HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+
+        data = garage_renderers.msgpack.unpackb(response.content)
+        self.assertEqual(data, self.client.get(url).json())
+
+    @unittest.skipIf(garage_renderers.msgpack, 'msgpack is installed')
+    def test_msgpack_not_installed(self):
+        url = reverse('service-list')
+        response = self.client.get(url, HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+
+        response = self.client.generic('PATCH', reverse('service-bulk'), b'\x90',
+                                       content_type='application/msgpack')
+        self.assertEqual(response.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command('benchmark_renderers', size=5, repeat=1, stdout=out)
+
+        self.assertIn('json (stdlib)', out.getvalue())
@@ -0,0 +1,106 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from garage.db import replicas
+from garage.testing import TEST_REPLICA_ALIAS
+from services.models import Client
+from users.tests.factories import UserFactory
+from services.tests.factories import ClientFactory
+
+
+class ReplicaRoutingTests(TransactionTestCase):
+    """Tests the reads of safe requests go to the replica, unless the client just wrote."""
+
+    databases = {'default', TEST_REPLICA_ALIAS}
+
+    def setUp(self):
+        # Enabled for the test only: the replica is flushed as any database after it.
+        settings = override_settings(DATABASE_REPLICAS=[TEST_REPLICA_ALIAS])
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.addCleanup(replicas._lags.clear)
+        cache.clear()
+
+        # The replica has the users, but not the last client written on the primary.
+        self.user = UserFactory()
+        self.user.save(using=TEST_REPLICA_ALIAS)
+        Client(first_name='Ana', last_name='Replica').save(using=TEST_REPLICA_ALIAS)
+        self.owner = ClientFactory(last_name='Primary', created_by=self.user)
+        self.client = self.get_client(self.user)
+
+    def get_client(self, user):
+        client = APIClient()
+        refresh_token = RefreshToken.for_user(user)
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh_token.access_token}')
+        return client
+
+    def get_last_names(self, client=None):
+        response = (client or self.client).get(reverse('client-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [owner['last_name'] for owner in response.json()['results']]
+
+    def test_list_from_replica(self):
+        self.assertEqual(self.get_last_names(), ['Replica'])
+
+    def test_unsafe_request_from_primary(self):
+        url = reverse('client-detail', kwargs={'pk': self.owner.pk})
+        response = self.client.patch(url, {'phone': '555-0100'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_read_your_writes(self):
+        response = self.client.post(reverse('brand-list'), {'name': 'Renault'})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.assertEqual(self.get_last_names(), ['Primary'])
+        other_user = UserFactory()
+        other_user.save(using=TEST_REPLICA_ALIAS)
+        self.assertEqual(self.get_last_names(self.get_client(other_user)), ['Replica'])
+
+        # The end of the window.
+        cache.delete(replicas.get_sticky_key(self.client.get(reverse('client-list')).wsgi_request))
+        self.assertEqual(self.get_last_names(), ['Replica'])
+
+    def test_writes_recorded_by_statement(self):
+        state = replicas.RequestState()
+        token = replicas._state.set(state)
+        self.addCleanup(replicas._state.reset, token)
+
+        # Asks the router for the write database, but only reads.
+        Client.objects.get_or_create(pk=self.owner.pk)
+        self.assertFalse(state.wrote)
+
+        Client.objects.filter(pk=self.owner.pk).update(phone='555-0100')
+        self.assertTrue(state.wrote)
+
+    @override_settings(DATABASE_REPLICA_MAX_LAG=30)
+    def test_lagging_replica(self):
+        with mock.patch.object(replicas, 'get_replica_lag', return_value=45.0), \
+                self.assertLogs('garage.db', 'WARNING') as logs:
+            self.assertEqual(self.get_last_names(), ['Primary'])
+        self.assertEqual(logs.records[0].lag, 45.0)
+
+        out = StringIO()
+        with mock.patch.object(replicas, 'get_replica_lag', return_value=45.0):
+            call_command('replica_status', stdout=out)
+        self.assertIn(f'{TEST_REPLICA_ALIAS}: 45.0s behind, over DATABASE_REPLICA_MAX_LAG',
+                      out.getvalue())
+
+    def test_export_streamed_from_replica(self):
+        response = self.client.get(reverse('client-export'), {'format': 'csv'})
+        content = b''.join(response.streaming_content).decode()
+        self.assertIn('Replica', content)
+        self.assertNotIn('Primary', content)
+
+    def test_replica_status(self):
+        out = StringIO()
+        call_command('replica_status', stdout=out)
+        self.assertIn(f'{TEST_REPLICA_ALIAS}: lag unknown', out.getvalue())
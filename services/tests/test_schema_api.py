@@ -0,0 +1,83 @@
+import gzip
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+
+from garage import schema_views
+from garage.schema import AutoSchemaWithErrors, GenericErrorSerializer
+
+
+class PrecomputedSchemaTests(TestCase):
+    """Tests the schema is served from the file written by `build_schema`."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'openapi.json')
+        call_command('build_schema', file=self.path, stdout=StringIO())
+        with open(self.path) as file:
+            self.schema = json.load(file)
+
+        settings = override_settings(SCHEMA_FILE=self.path, DEBUG=False)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.addCleanup(schema_views._documents.clear)
+        schema_views.prepare_schema()
+
+    def test_served_from_file(self):
+        self.schema['info']['title'] = 'Precomputed'
+        with open(self.path, 'w') as file:
+            json.dump(self.schema, file)
+        schema_views.prepare_schema()
+
+        with mock.patch.object(schema_views, 'generate_schema') as generate_schema:
+            response = self.client.get(reverse('schema'),
+                                       HTTP_ACCEPT='application/vnd.oai.openapi+json')
+        generate_schema.assert_not_called()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content), self.schema)
+
+    def test_gzip_and_etag(self):
+        url = reverse('schema')
+        response = self.client.get(url)
+        gzipped = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip, deflate')
+
+        self.assertEqual(gzipped['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(gzipped.content), response.content)
+        self.assertNotEqual(gzipped['ETag'], response['ETag'])
+        self.assertIn('Accept-Encoding', gzipped['Vary'])
+
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip',
+                                   HTTP_IF_NONE_MATCH=gzipped['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_redoc_etag(self):
+        response = self.client.get(reverse('redoc'))
+        response = self.client.get(reverse('redoc'), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_error_responses(self):
+        detail = self.schema['paths']['/v1/services/{id}/']
+        self.assertCountEqual(detail['get']['responses'], ['200', '401', '403', '404'])
+        self.assertCountEqual(detail['patch']['responses'], ['200', '400', '401', '403', '404'])
+        self.assertNotIn('404', self.schema['paths']['/v1/services/']['get']['responses'])
+
+    def test_error_responses_built_once(self):
+        with mock.patch.object(AutoSchemaWithErrors, '_get_response_for_code', autospec=True,
+                               side_effect=AutoSchemaWithErrors._get_response_for_code) as build:
+            schema = schema_views.generate_schema()
+
+        errors = [call for call in build.call_args_list
+                  if isinstance(call.args[1], type)
+                  and issubclass(call.args[1], GenericErrorSerializer)]
+        responses = [code for path in schema['paths'].values() for operation in path.values()
+                     for code in operation['responses'] if code.startswith('4')]
+        self.assertLess(len(errors), len(responses) / 4)
@@ -0,0 +1,74 @@
+from unittest import mock
+
+from django.apps import apps
+from django.db.migrations.state import ProjectState
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from garage.db.operations import AddTrigramIndex
+from users.tests.factories import UserFactory
+from services.tests.factories import VehicleFactory
+
+
+class SearchTests(APITestCase):
+    """Tests the search query parameter."""
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.vehicle = VehicleFactory(
+            year=2010, model='Quixote', license_plate='QX', client__last_name='Zanzibar',
+            brand__name='Hispano Suiza', type__name='Tractor',
+        )
+        self.other_vehicle = VehicleFactory(year=1201, model='Corolla', license_plate='CR')
+        self.client = APIClient()
+        refresh_token = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh_token.access_token}')
+
+    def search(self, url, search):
+        response = self.client.get(url, {'search': search})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [result['id'] for result in response.data['results']]
+
+    def test_search_text_fields(self):
+        self.assertEqual(self.search(reverse('vehicle-list'), 'quix'), [self.vehicle.id])
+        self.assertEqual(self.search(reverse('vehicle-list'), 'anzib'), [self.vehicle.id])
+        self.assertEqual(self.search(reverse('service-list'), 'anzib'), [])
+
+    def test_search_numbers_exactly(self):
+        self.assertEqual(self.search(reverse('vehicle-list'), '2010'), [self.vehicle.id])
+        # `icontains` on the year would have matched 1201 too.
+        self.assertEqual(self.search(reverse('vehicle-list'), '201'), [])
+
+    def test_search_related_names(self):
+        self.assertEqual(self.search(reverse('vehicle-list'), 'hispano'), [self.vehicle.id])
+        self.assertEqual(self.search(reverse('vehicle-list'), 'tract'), [self.vehicle.id])
+        # Not their ids.
+        self.assertEqual(self.search(reverse('vehicle-list'), str(self.vehicle.brand.id)), [])
+
+    def test_search_all_terms(self):
+        self.assertEqual(self.search(reverse('vehicle-list'), 'quixote 2010'), [self.vehicle.id])
+        self.assertEqual(self.search(reverse('vehicle-list'), 'quixote 1201'), [])
+
+
+class TrigramIndexOperationTests(APITestCase):
+    """Tests the trigram index migration operation."""
+
+    def test_postgresql_only(self):
+        state = ProjectState.from_apps(apps)
+        operation = AddTrigramIndex('client', 'last_name')
+        schema_editor = mock.Mock(quote_name=lambda name: f'"{name}"')
+
+        schema_editor.connection.vendor = 'sqlite'
+        operation.database_forwards('services', schema_editor, state, state)
+        schema_editor.execute.assert_not_called()
+
+        schema_editor.connection.vendor = 'postgresql'
+        schema_editor.connection.alias = 'default'
+        operation.database_forwards('services', schema_editor, state, state)
+        schema_editor.execute.assert_called_once_with(
+            'CREATE INDEX IF NOT EXISTS "services_client_last_name_trgm" ON "services_client" '
+            'USING gin (UPPER("last_name"::text) gin_trgm_ops)'
+        )
@@ -0,0 +1,121 @@
+import os
+import tempfile
+import threading
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from garage.db import slow_queries
+from garage.db.slow_queries import get_param_shapes, normalize_sql, read_records
+from users.tests.factories import UserFactory
+from services.tests.factories import ServiceFactory
+
+
+class SlowQueryLogTests(APITestCase):
+    """Tests the slow queries are logged with their view and fingerprint, and summarized."""
+
+    def setUp(self):
+        cache.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'slow_queries.jsonl')
+
+        self.user = UserFactory()
+        ServiceFactory.create_batch(2, vehicle__client__created_by=self.user)
+        self.client = APIClient()
+        refresh_token = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh_token.access_token}')
+
+        # Every query is slow, none explained.
+        settings = override_settings(SLOW_QUERY_MS=1e-9, SLOW_QUERY_LOG=self.path,
+                                     SLOW_QUERY_EXPLAIN_RATE=0)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def search_services(self, search):
+        with self.assertLogs('garage.db.slow', 'WARNING'):
+            response = self.client.get(reverse('service-list'), {
+                'search': search, 'ordering': 'vehicle__client__last_name',
+            })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_logged_with_view(self):
+        self.search_services('Ford')
+        records = [record for record in read_records(self.path)
+                   if record['view'] == 'ServicesView.list']
+        self.assertTrue(records)
+
+        searches = [record for record in records if 'str(%...%)' in record['params']]
+        self.assertTrue(searches)
+        self.assertEqual(searches[0]['query'], 'search=*&ordering=vehicle__client__last_name')
+        self.assertNotIn('Ford', searches[0]['sql'])
+        self.assertNotIn('plan', searches[0])
+
+    def get_search_fingerprints(self):
+        return [record['fingerprint'] for record in read_records(self.path)
+                if 'str(%...%)' in record['params']]
+
+    def test_same_fingerprint(self):
+        self.search_services('Ford')
+        fingerprints = self.get_search_fingerprints()
+        self.search_services('Fiat')
+        searches = self.get_search_fingerprints()
+        self.assertGreater(len(searches), len(fingerprints))
+        self.assertEqual(set(searches), set(fingerprints))
+
+    @override_settings(SLOW_QUERY_EXPLAIN_RATE=1)
+    def test_explained_off_the_request(self):
+        threads = set()
+
+        def explain(connection, sql, params):
+            threads.add(threading.current_thread())
+            return 'Seq Scan on services_service'
+
+        with mock.patch.object(slow_queries, 'can_explain', return_value=True), \
+                mock.patch.object(slow_queries, 'explain', side_effect=explain), \
+                self.assertLogs('garage.db.slow', 'WARNING'):
+            self.client.get(reverse('service-list'))
+            slow_queries._explain_queue.join()
+
+        self.assertEqual({thread.name for thread in threads}, {'garage-explain'})
+        plans = {record.get('plan') for record in read_records(self.path)}
+        self.assertEqual(plans, {'Seq Scan on services_service'})
+
+    @override_settings(SLOW_QUERY_MS=0)
+    def test_disabled(self):
+        self.client.get(reverse('service-list'))
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_command(self):
+        self.search_services('Ford')
+        out = StringIO()
+        call_command('slow_queries', view='ServicesView.list', top=1, stdout=out)
+        self.assertIn('views: ServicesView.list (1)', out.getvalue())
+        self.assertIn('Top 1 of', out.getvalue())
+
+        call_command('slow_queries', file=f'{self.path}.missing', stdout=out)
+        self.assertIn('No slow queries logged', out.getvalue())
+
+
+class FingerprintTests(SimpleTestCase):
+
+    def test_normalize_sql(self):
+        self.assertEqual(
+            normalize_sql('SELECT "a"."id" FROM "a"\n WHERE "a"."id" IN (%s, %s, %s) '
+                          "AND \"a\".\"name\" = 'O''Brien' LIMIT 21"),
+            'SELECT "a"."id" FROM "a" WHERE "a"."id" IN (...) AND "a"."name" = ? LIMIT ?'
+        )
+
+    def test_param_shapes(self):
+        self.assertEqual(get_param_shapes(['%ford%', 'ford%', 3, None], many=False),
+                         ['str(%...%)', 'str(...%)', 'int', 'NoneType'])
+        self.assertEqual(get_param_shapes([(1, 'a'), (2, 'b')], many=True),
+                         ['2 rows', 'int', 'str'])
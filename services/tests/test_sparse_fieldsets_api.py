@@ -0,0 +1,65 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from users.tests.factories import UserFactory
+from services.tests.factories import ServiceFactory
+
+
+class SparseFieldsetsTests(APITestCase):
+    """Tests the fields and omit query parameters."""
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.service = ServiceFactory(vehicle__client__created_by=self.user)
+        self.client = APIClient()
+        refresh_token = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh_token.access_token}')
+
+    def get_with_queries(self, url, params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, context.captured_queries[-1]['sql']
+
+    def test_list_services_with_fields(self):
+        params = {'fields': 'id,start_at,is_paid,vehicle.license_plate'}
+        response, sql = self.get_with_queries(reverse('service-list'), params)
+
+        self.assertEqual(response.data['results'][0], {
+            'id': self.service.id,
+            'start_at': response.data['results'][0]['start_at'],
+            'is_paid': False,
+            'vehicle': {'license_plate': self.service.vehicle.license_plate},
+        })
+        self.assertIn('"services_vehicle"."license_plate"', sql)
+        self.assertNotIn('services_client', sql)
+        self.assertNotIn('"services_service"."symptoms"', sql)
+
+    def test_get_service_with_omit(self):
+        url = reverse('service-detail', kwargs={'pk': self.service.pk})
+        response, sql = self.get_with_queries(url, {'omit': 'symptoms,repairs,vehicle.client'})
+
+        self.assertNotIn('symptoms', response.data)
+        self.assertNotIn('repairs', response.data)
+        self.assertNotIn('client', response.data['vehicle'])
+        self.assertIn('brand', response.data['vehicle'])
+        self.assertNotIn('services_client', sql)
+
+    def test_get_service_with_nested_fields(self):
+        url = reverse('service-detail', kwargs={'pk': self.service.pk})
+        response, _ = self.get_with_queries(url, {'fields': 'vehicle.client.created_by.full_name'})
+
+        self.assertEqual(response.data, {
+            'vehicle': {'client': {'created_by': {'full_name': self.user.full_name}}},
+        })
+
+    def test_list_users_with_fields(self):
+        response, sql = self.get_with_queries(reverse('user-list'), {'fields': 'id,email'})
+
+        self.assertEqual(response.data['results'], [{'id': self.user.id, 'email': self.user.email}])
+        self.assertNotIn('"users_user"."last_name"', sql.split('ORDER BY')[0])
@@ -4,8 +4,13 @@ from drf_spectacular.utils import extend_schema, extend_schema_view
 
 from services.models import Brand
 from services.serializers import BrandSerializer
+from garage.cache import CachedResponseMixin
+from garage.conditional import ConditionalGetMixin
 from garage.permissions import DeleteOnlyByAdmin
 from garage.filters import SearchFilterBackend, OrderingFilterBackend
+from garage.instrumentation import QueryBudgetMixin
+from garage.profiling import ProfilingMixin
+from garage.querysets import OptimizedQuerysetMixin
 
 
 @extend_schema_view(
@@ -30,13 +35,21 @@ from garage.filters import SearchFilterBackend, OrderingFilterBackend
     )
 )
 @extend_schema(tags=['Brands'])
-class BrandsView(ModelViewSet):
+class BrandsView(ProfilingMixin, QueryBudgetMixin, ConditionalGetMixin, CachedResponseMixin,
+                 OptimizedQuerysetMixin, ModelViewSet):
     queryset = Brand.objects.all().order_by('name')
     serializer_class = BrandSerializer
     permission_classes = [
         IsAuthenticated,
         DeleteOnlyByAdmin
     ]
+    query_budgets = {
+        'list': 3,
+        'retrieve': 2,
+        'create': 4,
+        'update': 5,
+        'partial_update': 5,
+    }
     filter_backends = [
         SearchFilterBackend,
         OrderingFilterBackend
@@ -4,8 +4,14 @@ from drf_spectacular.utils import extend_schema, extend_schema_view
 
 from services.serializers import ClientsSerializer
 from services.models import Client
+from garage.compiled import CompiledReadMixin
+from garage.conditional import ConditionalGetMixin
 from garage.permissions import DeleteOnlyByAdmin
 from garage.filters import OrderingFilterBackend, SearchFilterBackend
+from garage.export import ExportMixin
+from garage.instrumentation import QueryBudgetMixin
+from garage.profiling import ProfilingMixin
+from garage.querysets import OptimizedQuerysetMixin
 
 
 @extend_schema_view(
@@ -30,13 +36,21 @@ from garage.filters import OrderingFilterBackend, SearchFilterBackend
     ),
 )
 @extend_schema(tags=['Clients'])
-class ClientsView(ModelViewSet):
+class ClientsView(ProfilingMixin, QueryBudgetMixin, ConditionalGetMixin, ExportMixin,
+                  CompiledReadMixin, OptimizedQuerysetMixin, ModelViewSet):
     queryset = Client.objects.all()
     serializer_class = ClientsSerializer
     permission_classes = [
         IsAuthenticated,
         DeleteOnlyByAdmin
     ]
+    query_budgets = {
+        'list': 3,
+        'retrieve': 2,
+        'create': 2,
+        'update': 3,
+        'partial_update': 3,
+    }
     filter_backends = [
         SearchFilterBackend,
         OrderingFilterBackend
@@ -53,4 +67,4 @@ class ClientsView(ModelViewSet):
     ]
 
     def perform_create(self, serializer):
-        serializer.save(created_by=self.request.user)
+        serializer.save(created_by_id=self.request.user.id)
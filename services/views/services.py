@@ -5,8 +5,18 @@ from django_filters.rest_framework import DjangoFilterBackend
 
 from services.models import Service
 from services.serializers import ServiceSerializer, ServiceResponseSerializer
+from garage.columnar import ColumnarMixin
+from garage.compiled import CompiledReadMixin
+from garage.conditional import ConditionalGetMixin
 from garage.permissions import DeleteOnlyByAdmin
 from garage.filters import OrderingFilterBackend, SearchFilterBackend
+from garage.expansion import IncludedMixin
+from garage.bulk import BulkMixin
+from garage.export import ExportMixin
+from garage.instrumentation import QueryBudgetMixin
+from garage.profiling import ProfilingMixin
+from garage.querysets import OptimizedQuerysetMixin
+from garage.serializers import is_expand_request
 
 
 @extend_schema_view(
@@ -39,7 +49,9 @@ from garage.filters import OrderingFilterBackend, SearchFilterBackend
     ),
 )
 @extend_schema(tags=['Services'])
-class ServicesView(ModelViewSet):
+class ServicesView(ProfilingMixin, QueryBudgetMixin, ConditionalGetMixin, ColumnarMixin,
+                   BulkMixin, ExportMixin, IncludedMixin, CompiledReadMixin,
+                   OptimizedQuerysetMixin, ModelViewSet):
     """
     ViewSet for Service model.
     """
@@ -49,6 +61,13 @@ class ServicesView(ModelViewSet):
         IsAuthenticated,
         DeleteOnlyByAdmin
     ]
+    query_budgets = {
+        'list': 3,
+        'retrieve': 2,
+        'create': 3,
+        'update': 4,
+        'partial_update': 4,
+    }
     filter_backends = [
         DjangoFilterBackend,
         SearchFilterBackend,
@@ -71,17 +90,7 @@ class ServicesView(ModelViewSet):
         'vehicle__client__last_name',
     ]
 
-    def get_queryset(self):
-        queryset = Service.objects.all()\
-            .select_related(
-                'vehicle',
-                'vehicle__client',
-                'vehicle__type',
-                'vehicle__brand'
-        )
-        return queryset
-
     def get_serializer_class(self):
-        if self.action in ['list', 'retrieve']:
+        if self.action in ['list', 'retrieve', 'export'] and not is_expand_request(self.request):
             return ServiceResponseSerializer
         return self.serializer_class
@@ -4,8 +4,13 @@ from drf_spectacular.utils import extend_schema, extend_schema_view
 
 from services.models import Type
 from services.serializers import VehicleTypeSerializer
+from garage.cache import CachedResponseMixin
+from garage.conditional import ConditionalGetMixin
 from garage.permissions import DeleteOnlyByAdmin
 from garage.filters import OrderingFilterBackend, SearchFilterBackend
+from garage.instrumentation import QueryBudgetMixin
+from garage.profiling import ProfilingMixin
+from garage.querysets import OptimizedQuerysetMixin
 
 
 @extend_schema_view(
@@ -30,13 +35,21 @@ from garage.filters import OrderingFilterBackend, SearchFilterBackend
     ),
 )
 @extend_schema(tags=['Types'])
-class VehicleTypesView(ModelViewSet):
+class VehicleTypesView(ProfilingMixin, QueryBudgetMixin, ConditionalGetMixin,
+                       CachedResponseMixin, OptimizedQuerysetMixin, ModelViewSet):
     queryset = Type.objects.all()
     serializer_class = VehicleTypeSerializer
     permission_classes = [
         IsAuthenticated,
         DeleteOnlyByAdmin
     ]
+    query_budgets = {
+        'list': 3,
+        'retrieve': 2,
+        'create': 2,
+        'update': 3,
+        'partial_update': 3,
+    }
     filter_backends = [
         SearchFilterBackend,
         OrderingFilterBackend
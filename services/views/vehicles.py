@@ -5,8 +5,18 @@ from django_filters.rest_framework import DjangoFilterBackend
 
 from services.models import Vehicle
 from services.serializers import VehiclesSerializer, VehiclesResponseSerializer
+from garage.columnar import ColumnarMixin
+from garage.compiled import CompiledReadMixin
+from garage.conditional import ConditionalGetMixin
 from garage.permissions import DeleteOnlyByAdmin
 from garage.filters import OrderingFilterBackend, SearchFilterBackend
+from garage.expansion import IncludedMixin
+from garage.bulk import BulkMixin
+from garage.export import ExportMixin
+from garage.instrumentation import QueryBudgetMixin
+from garage.profiling import ProfilingMixin
+from garage.querysets import OptimizedQuerysetMixin
+from garage.serializers import is_expand_request
 
 
 @extend_schema_view(
@@ -39,15 +49,19 @@ from garage.filters import OrderingFilterBackend, SearchFilterBackend
     ),
 )
 @extend_schema(tags=['Vehicles'])
-class VehiclesView(ModelViewSet):
-    queryset = Vehicle.objects.all()\
-        .select_related(
-            'client',
-            'type',
-            'brand'
-        )  # noqa
+class VehiclesView(ProfilingMixin, QueryBudgetMixin, ConditionalGetMixin, ColumnarMixin,
+                   BulkMixin, ExportMixin, IncludedMixin, CompiledReadMixin,
+                   OptimizedQuerysetMixin, ModelViewSet):
+    queryset = Vehicle.objects.all()
     serializer_class = VehiclesSerializer
     permission_classes = [IsAuthenticated, DeleteOnlyByAdmin]
+    query_budgets = {
+        'list': 3,
+        'retrieve': 2,
+        'create': 5,
+        'update': 6,
+        'partial_update': 6,
+    }
     filter_backends = [
         DjangoFilterBackend,
         SearchFilterBackend,
@@ -59,8 +73,8 @@ class VehiclesView(ModelViewSet):
         'model'
     ]
     search_fields = [
-        'type',
-        'brand',
+        'type__name',
+        'brand__name',
         'model',
         'license_plate',
         'year',
@@ -76,6 +90,6 @@ class VehiclesView(ModelViewSet):
     ]
 
     def get_serializer_class(self):
-        if self.action in ['list', 'retrieve']:
+        if self.action in ['list', 'retrieve', 'export'] and not is_expand_request(self.request):
             return VehiclesResponseSerializer
         return self.serializer_class
@@ -1,6 +1,15 @@
+from functools import partial
+
 from django.apps import AppConfig
 
 
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
+
+    def ready(self):
+        from garage.metrics import get_cache_samples, register_collector
+        from users import schema, signals  # noqa: F401
+        from users.authentication import user_cache
+
+        register_collector(partial(get_cache_samples, 'users', user_cache))
@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt import authentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from garage.cache import TwoTierCache
+
+user_cache = TwoTierCache(max_entries=settings.JWT_USER_CACHE_MAX_ENTRIES,
+                          timeout=settings.JWT_USER_CACHE_TIMEOUT,
+                          local_timeout=settings.JWT_USER_CACHE_LOCAL_TIMEOUT)
+
+# Fields of the cached users: those the authentication and the permissions read. The
+# others (e.g. the password hash) are loaded from the database if ever accessed.
+CACHED_USER_FIELDS = ('id', 'email', 'first_name', 'last_name', 'is_active', 'is_staff',
+                      'is_superuser')
+
+
+def get_user_tag(user_id):
+    """Return the tag of the cached user, bumped when the user is saved or deleted."""
+    return f'users.user:{user_id}'
+
+
+class JWTAuthentication(authentication.JWTAuthentication):
+    """
+    JWT authentication that reads the user from a cache instead of the
+    database on every request. Entries are dropped, in every worker, when the
+    user is saved or deleted (e.g. deactivated, made staff or given a new
+    password), see `users.signals`, and expire from the memory of the workers
+    after `JWT_USER_CACHE_LOCAL_TIMEOUT` seconds in any case. Only
+    `CACHED_USER_FIELDS` are cached.
+
+    With `JWT_STATELESS`, the user is a `TokenUser` built from the signed
+    claims (`user_id`, `is_staff` and `is_superuser`) without any lookup: a
+    token stays valid until it expires, even if the user changes.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+        if settings.JWT_STATELESS:
+            return TokenUser(validated_token)
+
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        database, values = user_cache.get_or_set(
+            f'user:{user_id}', lambda: self.get_user_values(validated_token),
+            tags=[get_user_tag(user_id)],
+        )
+        # Every request gets its own instance of the cached user, e.g. for its permission caches.
+        model = get_user_model()
+        field_names = [field.attname for field in model._meta.concrete_fields
+                       if field.attname in values]
+        return model.from_db(database, field_names, [values[name] for name in field_names])
+
+    def get_user_values(self, validated_token):
+        user = super().get_user(validated_token)
+        return user._state.db, {field: getattr(user, field) for field in CACHED_USER_FIELDS}
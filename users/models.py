@@ -5,6 +5,8 @@ from django.contrib.auth.models import (
     PermissionsMixin
 )
 
+from garage.querysets import reads_fields
+
 
 class UserManager(BaseUserManager):
 
@@ -66,6 +68,7 @@ class User(AbstractBaseUser, PermissionsMixin):
         ordering = ['last_name', 'first_name']
 
     @property
+    @reads_fields('first_name', 'last_name')
     def full_name(self):
         return f"{self.first_name} {self.last_name}"
 
@@ -0,0 +1,12 @@
+from drf_spectacular.contrib.rest_framework_simplejwt import (
+    SimpleJWTScheme,
+    TokenObtainPairSerializerExtension,
+)
+
+
+class JWTScheme(SimpleJWTScheme):
+    target_class = 'users.authentication.JWTAuthentication'
+
+
+class TokenObtainPairClaimsSerializerExtension(TokenObtainPairSerializerExtension):
+    target_class = 'users.serializers.TokenObtainPairSerializer'
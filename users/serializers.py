@@ -1,8 +1,10 @@
 from django.contrib.auth import get_user_model
-from rest_framework import serializers
+from rest_framework_simplejwt import serializers as jwt_serializers
 
+from garage.serializers import DynamicFieldsModelSerializer
 
-class UsersSerializer(serializers.ModelSerializer):
+
+class UsersSerializer(DynamicFieldsModelSerializer):
 
     class Meta:
         model = get_user_model()
@@ -22,3 +24,14 @@ class UsersSerializer(serializers.ModelSerializer):
             user.save()
 
         return user
+
+
+class TokenObtainPairSerializer(jwt_serializers.TokenObtainPairSerializer):
+    """Token pair with the claims the permissions need in the stateless mode."""
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token['is_staff'] = user.is_staff
+        token['is_superuser'] = user.is_superuser
+        return token
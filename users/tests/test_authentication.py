@@ -0,0 +1,136 @@
+import time
+from unittest import mock
+
+from django.conf import settings
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from users.authentication import user_cache
+from users.serializers import TokenObtainPairSerializer
+from users.tests.factories import UserFactory
+
+
+class CachedUserAuthenticationTests(APITestCase):
+    """Tests the user of the token is loaded once, until it changes."""
+
+    def setUp(self):
+        cache.clear()
+        user_cache.clear()
+        self.user = UserFactory()
+        self.other_user = UserFactory()
+        self.client = APIClient()
+        refresh_token = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh_token.access_token}')
+        self.url = reverse('user-detail', kwargs={'pk': self.user.pk})
+
+    def count_user_loads(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(queries)
+
+    def test_user_cached(self):
+        self.assertEqual(self.count_user_loads(), 2)
+        self.assertEqual(self.count_user_loads(), 1)
+        self.assertEqual(user_cache.stats()['l1_hits'], 1)
+
+    def test_password_not_cached(self):
+        self.count_user_loads()
+        database, values = user_cache.get(f'user:{self.user.pk}')
+        self.assertNotIn('password', values)
+        self.assertNotIn(self.user.password, values.values())
+
+    def test_local_entries_expire(self):
+        self.count_user_loads()
+        # A write the versions in the cache of this worker don't see, e.g. from another worker.
+        user_cache.l2.clear()
+        with mock.patch('garage.cache.time.monotonic',
+                        return_value=time.monotonic() + settings.JWT_USER_CACHE_LOCAL_TIMEOUT):
+            self.assertEqual(self.count_user_loads(), 2)
+
+    def test_invalidated_on_save(self):
+        self.count_user_loads()
+        self.other_user.save()
+        self.assertEqual(self.count_user_loads(), 1)
+
+        self.user.set_password('new-password')
+        self.user.save()
+        self.assertEqual(self.count_user_loads(), 2)
+
+    def test_deactivated_user(self):
+        self.count_user_loads()
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_made_staff(self):
+        url = reverse('user-detail', kwargs={'pk': self.other_user.pk})
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+
+@override_settings(JWT_STATELESS=True)
+class StatelessAuthenticationTests(APITestCase):
+    """Tests the permissions decide from the claims of the token alone."""
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.other_user = UserFactory()
+        self.client = APIClient()
+
+    def authenticate(self, user):
+        refresh_token = TokenObtainPairSerializer.get_token(user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh_token.access_token}')
+
+    def test_token_claims(self):
+        response = self.client.post(reverse('token_obtain_pair'),
+                                    {'email': self.user.email, 'password': 'secret-password'})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.user.set_password('secret-password')
+        self.user.save()
+        response = self.client.post(reverse('token_obtain_pair'),
+                                    {'email': self.user.email, 'password': 'secret-password'})
+        token = AccessToken(response.data['access'])
+        self.assertEqual(token['user_id'], self.user.pk)
+        self.assertIs(token['is_staff'], False)
+        self.assertIs(token['is_superuser'], False)
+
+    def test_user_not_loaded(self):
+        self.authenticate(self.user)
+        url = reverse('user-detail', kwargs={'pk': self.user.pk})
+        # Only the user retrieved, not the user of the token.
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_manage_only_by_current_user(self):
+        self.authenticate(self.user)
+        url = reverse('user-detail', kwargs={'pk': self.other_user.pk})
+        response = self.client.patch(url, {'first_name': 'Ana'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_delete_only_by_admin(self):
+        url = reverse('user-detail', kwargs={'pk': self.other_user.pk})
+        self.authenticate(self.user)
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.authenticate(UserFactory(is_staff=True))
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
@@ -7,13 +7,15 @@ from rest_framework import status
 from rest_framework.test import APITestCase, APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from garage.testing import QueryBudgetTestMixin
 from users.tests.factories import UserFactory
 from users.serializers import UsersSerializer
+from users.views.users import UsersView
 
 fake = Faker()
 
 
-class UsersPrivateTests(APITestCase):
+class UsersPrivateTests(QueryBudgetTestMixin, APITestCase):
     """Tests user endpoint logged as normal user."""
 
     def setUp(self):
@@ -26,7 +28,8 @@ class UsersPrivateTests(APITestCase):
 
     def test_get_list_of_users(self):
         url = reverse('user-list')
-        response = self.client.get(url)
+        with self.assertQueryBudget(UsersView, 'list'):
+            response = self.client.get(url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data.get('count'), get_user_model().objects.count())
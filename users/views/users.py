@@ -5,7 +5,10 @@ from rest_framework.viewsets import ModelViewSet
 from drf_spectacular.utils import extend_schema, extend_schema_view
 
 from users.serializers import UsersSerializer
+from garage.instrumentation import QueryBudgetMixin
+from garage.profiling import ProfilingMixin
 from garage.permissions import DeleteOnlyByAdmin
+from garage.querysets import OptimizedQuerysetMixin
 from users.permissions import ManageOnlyByCurrentUser
 
 
@@ -34,7 +37,7 @@ permission_user_text = '\n\n__To use this endpoint, you must be admin or the cur
     ),
 )
 @extend_schema(tags=['Users'])
-class UsersView(ModelViewSet):
+class UsersView(ProfilingMixin, QueryBudgetMixin, OptimizedQuerysetMixin, ModelViewSet):
     queryset = get_user_model().objects.all()
     serializer_class = UsersSerializer
     permission_classes = [
@@ -42,3 +45,10 @@ class UsersView(ModelViewSet):
         IsAdminUser | ManageOnlyByCurrentUser,
         DeleteOnlyByAdmin
     ]
+    query_budgets = {
+        'list': 3,
+        'retrieve': 2,
+        'create': 3,
+        'update': 5,
+        'partial_update': 5,
+    }